@@ -1,20 +1,83 @@
 import platform
+import threading
+from contextlib import nullcontext
 from os.path import join, dirname
-from typing import Optional, Any, Dict
+from typing import TYPE_CHECKING, Optional, Any, Dict, List
 
 from ovos_bus_client import Message
 from ovos_bus_client.apis.gui import GUIInterface
 from ovos_bus_client.client import MessageBusClient
 from ovos_bus_client.util import get_mycroft_bus
-from ovos_config import Configuration
 from ovos_plugin_manager.templates.gui import GUIExtension
 from ovos_utils import network_utils
 from ovos_utils.log import LOG
-
-from ovos_gui_plugin_shell_companion.brightness import BrightnessManager
-from ovos_gui_plugin_shell_companion.color_manager import ColorManager
-from ovos_gui_plugin_shell_companion.helpers import ConfigUIManager
-from ovos_gui_plugin_shell_companion.wigets import WidgetManager
+from ovos_utils.xdg_utils import xdg_cache_home
+
+from ovos_gui_plugin_shell_companion.about import AboutPageProviders
+from ovos_gui_plugin_shell_companion.config_snapshot import ConfigSnapshot
+from ovos_gui_plugin_shell_companion.gui_interface import ShellGUIInterface
+from ovos_gui_plugin_shell_companion.instrumentation import HandlerMetrics, InstrumentedBus
+from ovos_gui_plugin_shell_companion.scheduler import SerialWorker, TimerQueue
+from ovos_gui_plugin_shell_companion.sessions import SessionRegistry, ShellSession
+from ovos_gui_plugin_shell_companion.subsystems import LazySubsystem, SubsystemConfig
+from ovos_gui_plugin_shell_companion.system_info import SystemInfoSampler
+from ovos_gui_plugin_shell_companion.tracing import NavigationTracer, TracingBus
+
+if TYPE_CHECKING:
+    # subsystem managers and settings page caches are only imported once used
+    from ovos_gui_plugin_shell_companion.brightness import BrightnessManager
+    from ovos_gui_plugin_shell_companion.color_manager import ColorManager
+    from ovos_gui_plugin_shell_companion.helpers import ConfigUIManager
+    from ovos_gui_plugin_shell_companion.homescreens import HomescreenCatalog
+    from ovos_gui_plugin_shell_companion.page_cache import SettingsPageCache
+    from ovos_gui_plugin_shell_companion.wallpapers import WallpaperManager
+    from ovos_gui_plugin_shell_companion.wigets import WidgetManager
+
+# bumped whenever the ovos.shell.companion.state.get.response layout changes
+STATE_VERSION = 1
+
+# messages that require each companion subsystem to be loaded
+SUBSYSTEM_EVENTS = {
+    "color": ["ovos.shell.gui.color.scheme.generate",
+              "ovos.theme.get"],
+    "widgets": ["ovos.notification.api.request.storage.model",
+                "ovos.notification.api.request.storage.delta",
+                "ovos.notification.api.storage.query",
+                "ovos.notification.api.set",
+                "ovos.notification.api.pop.clear",
+                "ovos.notification.api.pop.clear.delete",
+                "ovos.notification.api.storage.clear",
+                "ovos.notification.api.storage.clear.item",
+                "ovos.notification.api.set.controlled",
+                "ovos.notification.api.remove.controlled",
+                "ovos.widgets.display",
+                "ovos.widgets.remove",
+                "ovos.widgets.update",
+                "ovos.widgets.get",
+                "ovos.widgets.register"],
+    "brightness": ["phal.brightness.control.get",
+                   "phal.brightness.control.set",
+                   "phal.brightness.control.sync"],
+    "configuration": ["ovos.phal.configuration.provider.list.groups",
+                      "ovos.phal.configuration.provider.get",
+                      "ovos.phal.configuration.provider.set"],
+    "wallpapers": ["ovos.wallpaper.manager.register.provider",
+                   "ovos.wallpaper.manager.get.registered.providers",
+                   "ovos.wallpaper.manager.get.active.provider",
+                   "ovos.wallpaper.manager.set.active.provider",
+                   "ovos.wallpaper.manager.get.wallpaper",
+                   "ovos.wallpaper.manager.set.wallpaper",
+                   "ovos.wallpaper.manager.swap.wallpaper",
+                   "ovos.wallpaper.manager.get.provider.config",
+                   "ovos.wallpaper.manager.set.provider.config",
+                   "ovos.wallpaper.manager.get.auto.rotation",
+                   "ovos.wallpaper.manager.enable.auto.rotation",
+                   "ovos.wallpaper.manager.disable.auto.rotation"]
+}
+
+# answered by ovos-PHAL-plugin-wallpaper-manager where it is installed,
+# opt-in so two wallpaper managers never reply to the same request
+DISABLED_BY_DEFAULT = {"wallpapers"}
 
 
 class OVOSShellCompanionExtension(GUIExtension):
@@ -33,43 +96,230 @@ class OVOSShellCompanionExtension(GUIExtension):
         LOG.info("OVOS Shell: Initializing")
         bus = bus or get_mycroft_bus()
         config["homescreen_supported"] = True
+        # opt-in, settings page navigations are followed from GUI event to page shown
+        tracing_config = config.get("navigation_tracing", {})
+        self.tracer = NavigationTracer(enabled=tracing_config.get("enabled", False),
+                                       history=tracing_config.get("history", 100))
+        if self.tracer.enabled:
+            bus = TracingBus(bus, self.tracer)
+        # opt-in, every handler registered through the bus is timed and counted
+        self.metrics: Optional[HandlerMetrics] = None
+        if config.get("metrics", {}).get("enabled", False):
+            self.metrics = HandlerMetrics()
+            bus = InstrumentedBus(bus, self.metrics)
+        # mycroft.conf is merged once and shared by every manager, refreshed on configuration.updated
+        self.system_config = ConfigSnapshot(bus)
+        self.timers = TimerQueue("OVOSShellCompanion.timers")
+        # opt-in, every attached shell gets its own brightness, notifications and settings page
+        sessions_config = config.get("sessions", {})
+        self.sessions = SessionRegistry(enabled=sessions_config.get("enabled", False),
+                                        idle_timeout=sessions_config.get("idle_timeout", 900),
+                                        max_sessions=sessions_config.get("max_sessions", 16),
+                                        key_by_source=sessions_config.get("key_by_source", False),
+                                        timers=self.timers)
+        self.sessions.on_evict(self._on_session_evicted)
         res_dir = join(dirname(__file__), "gui")
-        gui = gui or GUIInterface("ovos_gui_plugin_shell_companion",
-                                  bus=bus, config=Configuration().get("gui", {}),
-                                  ui_directories={"qt5": join(res_dir, "qt5")})
+        gui = gui or ShellGUIInterface("ovos_gui_plugin_shell_companion",
+                                       bus=bus, config=self.system_config.get("gui", {}),
+                                       ui_directories={"qt5": join(res_dir, "qt5")})
         gui.ui_directories["qt5"] = join(res_dir, "qt5")
         LOG.info(f"Shell companion: qt5 resources directory: {res_dir}/qt5")
         super().__init__(config=config, bus=bus, gui=gui,
                          preload_gui=False, permanent=True)
-        self.about_page_data = []
+        self.about = AboutPageProviders(self.timers, on_change=self._on_about_page_changed)
+
+        self.subsystems = self._build_subsystems()
+
+        # built the first time a settings page needs them
+        self._lazy_lock = threading.Lock()
+        self._homescreen_catalog: Optional["HomescreenCatalog"] = None
+        self._page_cache: Optional["SettingsPageCache"] = None
+        self._register_page_cache_events()
         self.build_initial_about_page_data()
 
-        self.color_manager = ColorManager(self.bus)
-        self.widgets = WidgetManager(self.bus)
-        self.bright = BrightnessManager(self.bus, self.config)
-        self.cui = ConfigUIManager(self.bus)
+        about_config = self.config.get("about_page", {})
+        self.system_sampler: Optional[SystemInfoSampler] = None
+        if about_config.get("live_metrics", False):
+            self.system_sampler = SystemInfoSampler(self.bus, self.timers,
+                                                    self._update_live_system_info,
+                                                    interval=about_config.get("live_interval", 2),
+                                                    max_duration=about_config.get("live_max_duration", 600))
+            self.bus.on("gui.page_gained_focus", self.handle_page_gained_focus)
+
+    def _build_subsystems(self) -> Dict[str, LazySubsystem]:
+        """ companion subsystems are only instantiated once a message needs them """
+        subsystems_config = self.config.get("subsystems", {})
+        lazy = self.config.get("lazy_subsystems", True)
+        # every subsystem handles its messages in order from its own thread,
+        # so slow handlers never hold up the bus or unrelated subsystems
+        workers_config = self.config.get("workers", {})
+        use_workers = workers_config.get("enabled", True)
+        # auto dim / night mode / wallpaper rotation need to be scheduled on launch
+        brightness_eager = self.config.get("auto_dim", False) or self.config.get("auto_nightmode", False)
+        eager = {"brightness": brightness_eager,
+                 "wallpapers": self.config.get("wallpapers", {}).get("auto_rotation", False)}
+
+        # manager modules are imported when the subsystem is loaded, not on startup,
+        # configuration changes reach them in their worker, in order with their messages
+        def color(bus):
+            from ovos_gui_plugin_shell_companion.color_manager import ColorManager
+            return ColorManager(bus)
+
+        def widgets(bus):
+            from ovos_gui_plugin_shell_companion.wigets import WidgetManager
+            return WidgetManager(bus, self.config, self.sessions)
+
+        def brightness(bus):
+            from ovos_gui_plugin_shell_companion.brightness import BrightnessManager
+            return BrightnessManager(bus, self.config, SubsystemConfig(self.system_config, bus.worker),
+                                     self.sessions)
+
+        def configuration(bus):
+            from ovos_gui_plugin_shell_companion.helpers import ConfigUIManager
+            return ConfigUIManager(bus, SubsystemConfig(self.system_config, bus.worker))
+
+        def wallpapers(bus):
+            from ovos_gui_plugin_shell_companion.wallpapers import WallpaperManager
+            return WallpaperManager(bus, self.config, self.timers)
+
+        def worker_factory(name):
+            return lambda: SerialWorker(f"OVOSShellCompanion.{name}",
+                                        max_depth=workers_config.get("max_depth", 100),
+                                        block_timeout=workers_config.get("block_timeout"))
+
+        factories = {"color": color, "widgets": widgets, "brightness": brightness,
+                     "configuration": configuration, "wallpapers": wallpapers}
+        subsystems = {}
+        for name, factory in factories.items():
+            # the worker thread is only started together with its subsystem
+            subsystems[name] = LazySubsystem(name, self.bus, factory,
+                                             events=SUBSYSTEM_EVENTS[name],
+                                             enabled=subsystems_config.get(name, name not in DISABLED_BY_DEFAULT),
+                                             lazy=lazy and not eager.get(name, False),
+                                             worker_factory=worker_factory(name) if use_workers else None,
+                                             metrics=self.metrics)
+        return subsystems
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """ block until every subsystem handled the messages queued so far, returns False on timeout """
+        return all([subsystem.wait_idle(timeout) for subsystem in self.subsystems.values()])
+
+    @property
+    def color_manager(self) -> Optional["ColorManager"]:
+        return self.subsystems["color"].get()
+
+    @property
+    def widgets(self) -> Optional["WidgetManager"]:
+        return self.subsystems["widgets"].get()
+
+    @property
+    def bright(self) -> Optional["BrightnessManager"]:
+        return self.subsystems["brightness"].get()
+
+    @property
+    def cui(self) -> Optional["ConfigUIManager"]:
+        return self.subsystems["configuration"].get()
+
+    @property
+    def wallpapers(self) -> Optional["WallpaperManager"]:
+        return self.subsystems["wallpapers"].get()
+
+    @property
+    def homescreen_catalog(self) -> "HomescreenCatalog":
+        """ registered homescreens with preview thumbnails, rebuilt when homescreens (de)register """
+        if self._homescreen_catalog is None:
+            with self._lazy_lock:
+                if self._homescreen_catalog is None:
+                    self._homescreen_catalog = self._build_homescreen_catalog()
+        return self._homescreen_catalog
+
+    def _build_homescreen_catalog(self) -> "HomescreenCatalog":
+        from ovos_gui_plugin_shell_companion.homescreens import HomescreenCatalog
+        from ovos_gui_plugin_shell_companion.thumbnails import ThumbnailCache
+        previews_config = self.config.get("homescreen_previews", {})
+        thumbnails = ThumbnailCache(join(xdg_cache_home(), "OVOS", "ShellCompanion", "thumbnails"),
+                                    size=previews_config.get("thumbnail_size", 256),
+                                    batch_size=previews_config.get("thumbnail_batch", 16),
+                                    on_update=self._on_homescreen_previews_update)
+        return HomescreenCatalog(lambda: self.homescreen_manager.homescreens if self.homescreen_manager else [],
+                                 thumbnails)
+
+    def _on_homescreen_previews_update(self):
+        # previews were referencing the original images until now
+        self._invalidate_homescreens()
+
+    def _invalidate_homescreens(self):
+        if self._homescreen_catalog is not None:
+            self._homescreen_catalog.invalidate()
+        self._invalidate_pages("homescreen_settings")
+
+    @property
+    def page_cache(self) -> "SettingsPageCache":
+        """ settings page data is prepared while idle, instead of when the page is opened """
+        if self._page_cache is None:
+            with self._lazy_lock:
+                if self._page_cache is None:
+                    self._page_cache = self._build_page_cache()
+        return self._page_cache
+
+    def _build_page_cache(self) -> "SettingsPageCache":
+        from ovos_gui_plugin_shell_companion.page_cache import SettingsPageCache
+        cache_config = self.config.get("settings_cache", {})
+        cache = SettingsPageCache(self.timers,
+                                  idle_seconds=cache_config.get("idle_seconds", 30),
+                                  default_max_age=cache_config.get("max_age", 60),
+                                  max_ages=cache_config.get("page_max_age"))
+        cache.register("about_page", self.get_about_page_data)
+        cache.register("homescreen_settings", self.get_homescreen_settings_data)
+        cache.register("display_settings", self.get_display_settings_data)
+        return cache
+
+    def _register_page_cache_events(self):
+        """ keep the caches in sync with their sources, a no-op until they are built """
+        # user activity postpones prefetching
+        for event in ("gui.page_interaction", "recognizer_loop:record_begin"):
+            self.bus.on(event, lambda message: self._page_cache and self._page_cache.touch())
+        # invalidate cached data when the sources change
+        self.bus.on("homescreen.manager.add", lambda message: self._invalidate_homescreens())
+        self.bus.on("homescreen.manager.remove", lambda message: self._invalidate_homescreens())
+        self.system_config.subscribe("gui", lambda config: self._invalidate_pages("homescreen_settings",
+                                                                                  "display_settings"))
+
+    def _invalidate_pages(self, *pages: str):
+        if self._page_cache is not None:
+            self._page_cache.invalidate(*pages)
 
     def register_bus_events(self):
         # TODO - solve this namespace mess and unify things as much as possible
         self.bus.on("mycroft.gui.screen.close", self.handle_remove_namespace)
-        self.bus.on("system.display.homescreen", self.handle_system_display_homescreen)
+        self.bus.on("system.display.homescreen", self.sessions.bound(self.handle_system_display_homescreen))
 
         self.bus.on("mycroft.device.settings", self.handle_device_settings)
-        self.bus.on("ovos.phal.configuration.provider.get.response", self.display_advanced_config_for_group)
-        self.bus.on("ovos.phal.configuration.provider.list.groups.response", self.display_advanced_config_groups)
+        self.bus.on("ovos.phal.configuration.provider.get.response",
+                    self.sessions.bound(self.display_advanced_config_for_group))
+        self.bus.on("ovos.phal.configuration.provider.list.groups.response",
+                    self.sessions.bound(self.display_advanced_config_groups))
         self.bus.on("smartspeaker.extension.extend.about", self.extend_about_page_data_from_event)
-
-        self.gui.register_handler("mycroft.device.settings", self.handle_device_settings)
-        self.gui.register_handler("mycroft.device.settings.homescreen", self.handle_device_homescreen_settings)
-        self.gui.register_handler("mycroft.device.settings.ssh", self.handle_device_ssh_settings)
-        self.gui.register_handler("mycroft.device.settings.developer", self.handle_device_developer_settings)
-        self.gui.register_handler("mycroft.device.show.idle", self.handle_show_homescreen)
-        self.gui.register_handler("mycroft.device.settings.customize", self.handle_device_customize_settings)
-        self.gui.register_handler("mycroft.device.settings.create.theme", self.handle_device_create_theme)
-        self.gui.register_handler("mycroft.device.settings.about.page", self.handle_device_about_page)
-        self.gui.register_handler("mycroft.device.settings.display", self.handle_device_display_settings)
-        self.gui.register_handler("mycroft.device.settings.factory", self.handle_device_display_factory)
-        self.gui.register_handler("mycroft.device.settings.wallpapers", self.handle_device_wallpaper_settings)
+        self.bus.on("ovos.shell.companion.state.get", self.handle_get_state)
+        self.bus.on("ovos.shell.companion.metrics", self.handle_get_metrics)
+
+        self.bus.on("ovos.shell.companion.navigation.stats", self.handle_get_navigation_stats)
+        # configuration pages are only shown once the configuration provider answers
+        self.bus.on("ovos.phal.configuration.provider.get", self.handle_configuration_request)
+        self.bus.on("ovos.phal.configuration.provider.list.groups", self.handle_configuration_request)
+
+        self.register_settings_handler("mycroft.device.settings", self.handle_device_settings)
+        self.register_settings_handler("mycroft.device.settings.homescreen", self.handle_device_homescreen_settings)
+        self.register_settings_handler("mycroft.device.settings.ssh", self.handle_device_ssh_settings)
+        self.register_settings_handler("mycroft.device.settings.developer", self.handle_device_developer_settings)
+        self.gui.register_handler("mycroft.device.show.idle", self.sessions.bound(self.handle_show_homescreen))
+        self.gui.register_handler("mycroft.device.set.idle", self.handle_set_homescreen)
+        self.register_settings_handler("mycroft.device.settings.customize", self.handle_device_customize_settings)
+        self.register_settings_handler("mycroft.device.settings.create.theme", self.handle_device_create_theme)
+        self.register_settings_handler("mycroft.device.settings.about.page", self.handle_device_about_page)
+        self.register_settings_handler("mycroft.device.settings.display", self.handle_device_display_settings)
+        self.register_settings_handler("mycroft.device.settings.factory", self.handle_device_display_factory)
+        self.register_settings_handler("mycroft.device.settings.wallpapers", self.handle_device_wallpaper_settings)
 
         # Display settings
         self.gui.register_handler("speaker.extension.display.set.auto.dim",
@@ -77,6 +327,82 @@ class OVOSShellCompanionExtension(GUIExtension):
         self.gui.register_handler("speaker.extension.display.set.auto.nightmode",
                                   self.handle_display_auto_nightmode_config_set)
 
+    def register_settings_handler(self, event: str, handler):
+        """ register a GUI event handler that navigates to a settings page """
+        handler = self.sessions.bound(handler)
+        if self.tracer.enabled:
+            handler = self.tracer.traced(event, handler)
+        self.gui.register_handler(event, handler)
+
+    def get_state(self, session: Optional[ShellSession] = None) -> Dict[str, Any]:
+        """ snapshot of everything ovos-shell needs to restore its state
+
+        Args:
+            session: shell requesting the snapshot, the default one if not given
+        """
+        homescreen = {"active": None, "available": []}
+        if self.homescreen_manager:
+            homescreen = {"active": self.homescreen_manager.get_active_homescreen(),
+                          "available": self.homescreen_manager.homescreens}
+        color_manager, bright, widgets, cui = self.color_manager, self.bright, self.widgets, self.cui
+        return {"version": STATE_VERSION,
+                "theme": color_manager.get_theme() if color_manager else None,
+                "display": bright.get_state(session) if bright else None,
+                "notifications": widgets.get_notifications(session) if widgets else None,
+                "widgets": widgets.get_widgets() if widgets else None,
+                "homescreen": homescreen,
+                "configuration_groups": cui.get_group_names() if cui else []}
+
+    def handle_get_state(self, message):
+        """ answer ovos-shell (re)connecting with a single state snapshot
+        instead of one request per companion subsystem """
+        self.bus.emit(message.response(self.get_state(self.sessions.get(message))))
+
+    def handle_get_metrics(self, message):
+        """ report per handler call counts, latencies, errors and emitted messages,
+        and queue depth / backpressure of every subsystem worker """
+        data = {"enabled": self.metrics is not None,
+                "workers": {name: subsystem.worker.stats()
+                            for name, subsystem in self.subsystems.items() if subsystem.worker}}
+        if self.metrics:
+            data.update(self.metrics.snapshot())
+        if message.data.get("reset"):
+            if self.metrics:
+                self.metrics.reset()
+            for subsystem in self.subsystems.values():
+                if subsystem.worker:
+                    subsystem.worker.reset_stats()
+        self.bus.emit(message.response(data))
+
+    def handle_get_navigation_stats(self, message):
+        """ report p50/p95 navigation latency per settings page """
+        report = self.tracer.report()
+        if message.data.get("reset"):
+            self.tracer.reset()
+        self.bus.emit(message.response({"enabled": self.tracer.enabled, "pages": report}))
+
+    def handle_configuration_request(self, message):
+        """ a configuration settings page was requested, its navigation continues in the response handler """
+        if self.tracer.enabled:
+            self.tracer.begin(message.msg_type, message)
+            self.tracer.wait((message.msg_type, message.data.get("group")))
+
+    def gui_batch(self):
+        """ collect GUI session data changes and page requests, flushed as a single update on exit """
+        if isinstance(self.gui, ShellGUIInterface):
+            return self.gui.batch()
+        return nullcontext(self.gui)
+
+    def show_settings_page(self, state: str, data: Optional[Dict[str, Any]] = None):
+        """ display a settings page, together with its session data, as a single GUI update """
+        self._set_session_page(state)
+        with self.gui_batch():
+            for key, value in (data or {}).items():
+                self.gui[key] = value
+            self.gui["state"] = state
+            self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.tracer.end(state)
+
     def handle_remove_namespace(self, message):
         LOG.debug("Clearing namespace (mycroft.gui.screen.close)")
         get_skill_namespace = message.data.get("skill_id", "")
@@ -85,129 +411,180 @@ class OVOSShellCompanionExtension(GUIExtension):
                                   {"__from": get_skill_namespace}))
 
     def handle_system_display_homescreen(self, message):
+        self._set_session_page(None)
         self.homescreen_manager.show_homescreen()
 
     def handle_device_settings(self, message):
         """ Display device settings page. """
-        self.gui["state"] = "settings/settingspage"
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.show_settings_page("settings/settingspage")
 
     def handle_device_homescreen_settings(self, message):
         """
         display homescreen settings page
         """
-        screens = self.homescreen_manager.homescreens
-        self.gui["idleScreenList"] = {"screenBlob": screens}
-        self.gui["selectedScreen"] = self.homescreen_manager.get_active_homescreen()
-        self.gui["state"] = "settings/homescreen_settings"
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.page_cache.touch()
+        self.show_settings_page("settings/homescreen_settings",
+                                self.page_cache.get("homescreen_settings"))
+
+    def get_homescreen_settings_data(self) -> Dict[str, Any]:
+        if not self.homescreen_manager:
+            return {"idleScreenList": {"screenBlob": []}, "selectedScreen": None}
+        # compact entries, previews are referenced by path
+        screens = list(self.homescreen_catalog.entries())
+        return {"idleScreenList": {"screenBlob": screens},
+                "selectedScreen": self.homescreen_manager.get_active_homescreen()}
 
     def handle_device_ssh_settings(self, message):
         """
         display ssh settings page
         """
-        self.gui["state"] = "settings/ssh_settings"
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.show_settings_page("settings/ssh_settings")
 
     def handle_set_homescreen(self, message):
         """
         Set the homescreen to the selected screen
         """
-        homescreen_id = message.data.get("homescreen_id", "")
-        if homescreen_id:
+        # the homescreen settings page sends the id as "selected"
+        homescreen_id = message.data.get("selected") or message.data.get("homescreen_id", "")
+        if homescreen_id and self.homescreen_manager:
             self.homescreen_manager.set_active_homescreen(homescreen_id)
+            # the cached page would still show the previous selection
+            self._invalidate_homescreens()
 
     def handle_show_homescreen(self, message):
+        self._set_session_page(None)
         self.homescreen_manager.show_homescreen()
 
     def handle_device_developer_settings(self, message):
         self.gui['state'] = 'settings/developer_settings'
 
     def handle_device_customize_settings(self, message):
-        self.gui['state'] = 'settings/customize_settings'
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.show_settings_page("settings/customize_settings")
 
     def handle_device_create_theme(self, message):
-        self.gui['state'] = 'settings/customize_theme'
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.show_settings_page("settings/customize_theme")
 
     def handle_device_display_factory(self, message):
-        self.gui['state'] = 'settings/factory_settings'
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.show_settings_page("settings/factory_settings")
 
     def handle_device_display_settings(self, message):
         LOG.debug(f"Display settings: {self.config}")
-        self.gui['state'] = 'settings/display_settings'
+        self.page_cache.touch()
+        self.show_settings_page("settings/display_settings",
+                                self.page_cache.get("display_settings"))
+
+    def get_display_settings_data(self) -> Dict[str, Any]:
         # wallpaper_rotation data is determined via Messagebus in Qt directly
-        self.gui['display_auto_dim'] = self.config.get("auto_dim", False)
-        self.gui['display_auto_nightmode'] = self.config.get("auto_nightmode", False)
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        return {"display_auto_dim": self.config.get("auto_dim", False),
+                "display_auto_nightmode": self.config.get("auto_nightmode", False)}
 
     def handle_device_wallpaper_settings(self, message):
-        self.gui['state'] = 'settings/wallpaper_settings'
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.show_settings_page("settings/wallpaper_settings")
 
     def handle_device_about_page(self, message):
-        # TODO: Move `system_information` generation to util method
-        uname_info = platform.uname()
-        system_information = {"display_list": self.about_page_data}
-        self.gui['state'] = 'settings/about_page'
-        self.gui['system_info'] = system_information
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.page_cache.touch()
+        self.show_settings_page("settings/about_page",
+                                self.page_cache.get("about_page"))
+        if self.system_sampler:
+            self.system_sampler.start()
+
+    def get_about_page_data(self) -> Dict[str, Any]:
+        return {"system_info": {"display_list": self.about.display_list()}}
+
+    @property
+    def about_page_data(self) -> List[dict]:
+        return self.about.display_list()
+
+    def stop_live_system_info(self):
+        if self.system_sampler:
+            self.system_sampler.stop()
+
+    def _set_session_page(self, state: Optional[str], session: Optional[ShellSession] = None):
+        """ record the settings page a shell shows, None once it left the settings pages """
+        session = session or self.sessions.current
+        session.get("settings_page", dict)["state"] = state
+        self._stop_unseen_system_info()
+
+    def _stop_unseen_system_info(self):
+        # live metrics are sampled while at least one shell shows the about page
+        if not any((s.peek("settings_page") or {}).get("state") == "settings/about_page"
+                   for s in self.sessions.sessions()):
+            self.stop_live_system_info()
+
+    def _on_session_evicted(self, session: ShellSession):
+        self._stop_unseen_system_info()
+
+    def handle_page_gained_focus(self, message):
+        # another namespace took over the screen, the about page is no longer visible
+        if message.data.get("skill_id") != self.gui.skill_id:
+            self._set_session_page(None, self.sessions.get(message))
+
+    def _update_live_system_info(self, entries: List[dict]):
+        if self.gui.get("state") != "settings/about_page":
+            self.stop_live_system_info()
+            return
+        self.gui["system_info"] = {"display_list": self.about.display_list() + entries}
+
+    def _on_about_page_changed(self):
+        self._invalidate_pages("about_page")
 
     def handle_display_auto_dim_config_set(self, message):
         auto_dim = message.data.get("auto_dim", False)
-        if auto_dim:
+        if not self.bright:
+            LOG.warning("Brightness subsystem disabled, ignoring auto dim change")
+        elif auto_dim:
             self.bright.start_auto_dim()
         else:
             self.bright.stop_auto_dim()
+        self._invalidate_pages("display_settings")
 
     def handle_display_auto_nightmode_config_set(self, message):
         auto_nightmode = message.data.get("auto_nightmode", False)
-        if auto_nightmode:
+        if not self.bright:
+            LOG.warning("Brightness subsystem disabled, ignoring auto night mode change")
+        elif auto_nightmode:
             self.bright.start_auto_night_mode()
         else:
             self.bright.stop_auto_night_mode()
+        self._invalidate_pages("display_settings")
 
     def display_advanced_config_for_group(self, message=None):
         group_meta = message.data.get("settingsMetaData")
         group_name = message.data.get("groupName")
-        self.gui["groupName"] = group_name
-        self.gui["groupConfigurationData"] = group_meta
-        self.gui['state'] = 'settings/configuration_generator_display'
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.tracer.resume(("ovos.phal.configuration.provider.get", group_name), message)
+        self.show_settings_page("settings/configuration_generator_display",
+                                {"groupName": group_name,
+                                 "groupConfigurationData": group_meta})
 
     def display_advanced_config_groups(self, message=None):
         groups_list = message.data.get("groups")
-        self.gui["groupList"] = groups_list
-        self.gui['state'] = 'settings/configuration_groups_display'
-        self.gui.show_page("AdditionalSettings", override_idle=True)
+        self.tracer.resume(("ovos.phal.configuration.provider.list.groups", None), message)
+        self.show_settings_page("settings/configuration_groups_display",
+                                {"groupList": groups_list})
 
     def build_initial_about_page_data(self):
-        uname_info = platform.uname()
+        """ register the default about page entries, values are computed off the startup path """
+        about_config = self.config.get("about_page", {})
+        self.about.register("Kernel Version", lambda: platform.uname()[2])
+        self.about.register("Core Version", self._get_core_version)
+        self.about.register("Python Version", platform.python_version)
+        # network probing may block, refresh it periodically in case the address changes
+        self.about.register("Local Address", network_utils.get_ip,
+                            ttl=about_config.get("address_ttl", 60))
+
+    @staticmethod
+    def _get_core_version() -> str:
         try:
             from ovos_core.version import OVOS_VERSION_STR as version
         except ImportError:
             version = "unknown"
-        self.about_page_data.append({"display_key": "Kernel Version", "display_value": uname_info[2]})
-        self.about_page_data.append({"display_key": "Core Version", "display_value": version})
-        self.about_page_data.append({"display_key": "Python Version", "display_value": platform.python_version()})
-        self.about_page_data.append({"display_key": "Local Address", "display_value": network_utils.get_ip()})
+        return version
 
     def check_about_page_data_contains_key(self, key):
-        for item in self.about_page_data:
-            if item["display_key"] == key:
-                return True
-        return False
+        return key in self.about
 
     def add_about_page_data(self, key, value):
-        if not self.check_about_page_data_contains_key(key):
-            self.about_page_data.append({"display_key": key, "display_value": value})
-        else:
-            for item in self.about_page_data:
-                if item["display_key"] == key:
-                    item["display_value"] = value
-                    break
+        self.about.set(key, value)
 
     def extend_about_page_data_from_event(self, message=None):
         extended_list = message.data.get("display_list")
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.scheduler import SerialWorker, TimerQueue
+
+
+class AboutPageProviders:
+    """ entries displayed in the about settings page
+
+    entries are kept in display order, keyed by their display key. Values
+    either come from a registered provider, computed in the background and
+    refreshed every ttl seconds, or are contributed externally via
+    "smartspeaker.extension.extend.about". An externally set value wins,
+    the provider of that key is no longer refreshed
+
+    providers may block (eg. network probing), they run in a worker thread,
+    the timer queue only schedules the refreshes
+    """
+
+    def __init__(self, timers: TimerQueue,
+                 on_change: Optional[Callable[[], None]] = None,
+                 worker: Optional[SerialWorker] = None):
+        """
+        Args:
+            timers: timer queue scheduling provider refreshes
+            on_change: called whenever a displayed value changes
+            worker: runs the providers, one is created if needed
+        """
+        self.timers = timers
+        self.on_change = on_change
+        self._worker = worker
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Any] = OrderedDict()
+        self._providers: Dict[str, Tuple[Callable[[], Any], float]] = {}
+        self._external = set()  # display keys set externally, never overwritten by a provider
+
+    def register(self, display_key: str, provider: Callable[[], Any],
+                 ttl: float = 0, placeholder: Any = ""):
+        """
+        Register a provider, it is first called asynchronously
+
+        Args:
+            display_key: label displayed in the about page
+            provider: returns the value to display
+            ttl: seconds before the value is refreshed, 0 to compute it only once
+            placeholder: value displayed until the provider answers
+        """
+        with self._lock:
+            self._providers[display_key] = (provider, ttl)
+            self._entries.setdefault(display_key, placeholder)
+        self._get_worker().submit(self._refresh, display_key)
+
+    def set(self, display_key: str, value: Any):
+        """ display an externally provided value, replacing any provider of that key """
+        self._set(display_key, value, external=True)
+
+    def _set(self, display_key: str, value: Any, external: bool = False):
+        with self._lock:
+            if external:
+                self._external.add(display_key)
+            elif display_key in self._external:
+                return
+            changed = self._entries.get(display_key) != value or display_key not in self._entries
+            self._entries[display_key] = value
+        if changed and self.on_change:
+            self.on_change()
+
+    def __contains__(self, display_key: str) -> bool:
+        return display_key in self._entries
+
+    def display_list(self) -> List[dict]:
+        with self._lock:
+            return [{"display_key": key, "display_value": value}
+                    for key, value in self._entries.items()]
+
+    def _get_worker(self) -> SerialWorker:
+        if self._worker is None:
+            self._worker = SerialWorker("AboutPageProviders.worker", max_depth=0)
+        return self._worker
+
+    def _schedule_refresh(self, display_key: str):
+        self._get_worker().submit(self._refresh, display_key)
+
+    def _refresh(self, display_key: str):
+        if display_key in self._external:
+            return
+        provider, ttl = self._providers[display_key]
+        try:
+            self._set(display_key, provider())
+        except Exception as e:
+            LOG.error(f"Failed to refresh about page entry '{display_key}': {e}")
+        if ttl:
+            self.timers.schedule(ttl, self._schedule_refresh, display_key)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """ block until the provider calls queued so far finished, returns False on timeout """
+        return self._worker.wait_idle(timeout) if self._worker else True
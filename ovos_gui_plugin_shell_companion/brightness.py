@@ -3,15 +3,27 @@ import threading
 from datetime import timedelta
 from typing import Optional, Tuple
 
-from astral import LocationInfo
-from astral.sun import sun
 from ovos_bus_client import Message
-from ovos_config import Configuration
 from ovos_utils.events import EventSchedulerInterface
 from ovos_utils.log import LOG
 from ovos_utils.time import now_local
 
+from ovos_gui_plugin_shell_companion.config_snapshot import ConfigSnapshot, PLUGIN_CONFIG_PATH
 from ovos_gui_plugin_shell_companion.helpers import update_config
+from ovos_gui_plugin_shell_companion.sessions import SessionRegistry, ShellSession
+
+# plugin config keys applied live when changed in mycroft.conf
+BRIGHTNESS_KEYS = ("sunrise_time", "sunset_time", "default_brightness", "night_default_brightness",
+                   "low_brightness", "auto_dim_seconds", "auto_dim", "auto_nightmode")
+
+
+class ShellBrightness:
+    """ brightness of a single shell """
+    __slots__ = ("level", "default")
+
+    def __init__(self, level: int):
+        self.level = level
+        self.default: Optional[int] = None  # set by the shell slider, follows the day/night default otherwise
 
 
 class BrightnessManager:
@@ -22,24 +34,33 @@ class BrightnessManager:
         - to update slider externally: "phal.brightness.control.auto.dim.update"/"phal.brightness.control.get.response", {"brightness": fixedValue}
     """
 
-    def __init__(self, bus, config: dict):
+    def __init__(self, bus, config: dict, system_config: Optional[ConfigSnapshot] = None,
+                 sessions: Optional[SessionRegistry] = None):
         """
         Initialize the BrightnessManager.
 
         Args:
             bus: Message bus for inter-process communication.
             config: Configuration dictionary for brightness settings.
+            system_config: shared mycroft.conf snapshot, for location and live config changes.
+            sessions: attached shells, each one has its own brightness and auto-dim timer.
         """
         self._lock = threading.RLock()
         self.bus = bus
         self.config = config
+        self.sessions = sessions or SessionRegistry()
+        self.sessions.on_evict(self._on_session_evicted)
+        self.system_config = system_config or ConfigSnapshot(bus)
+        # next (sunrise, sunset), valid until one of them passes
+        self._suntimes: Optional[Tuple[datetime.datetime, datetime.datetime]] = None
+        self.system_config.subscribe("location", self._on_location_change)
+        self.system_config.subscribe(PLUGIN_CONFIG_PATH, self._on_plugin_config_change)
         self.event_scheduler = EventSchedulerInterface()
         self.event_scheduler.set_id("ovos-shell")
         self.event_scheduler.set_bus(self.bus)
 
         self.fake_brightness = not self.config.get("external_plugin", False)  # allow delegating to external PHAL plugin
         self.default_brightness = self.config.get("default_brightness", 100)
-        self._brightness_level: int = self.default_brightness
         self.sunrise_time, self.sunset_time = None, None
 
         self.bus.on("phal.brightness.control.get", self.handle_get_brightness)
@@ -70,32 +91,74 @@ class BrightnessManager:
     ##############################################
     # brightness manager
     # TODO - allow dynamic brightness based on camera, reacting live to brightness,
-    def set_brightness(self, level: int):
+    def _shell(self, session: Optional[ShellSession] = None) -> ShellBrightness:
+        session = session or self.sessions.default
+        return session.get("brightness", lambda: ShellBrightness(self.default_brightness))
+
+    def _shells(self):
+        """ (session, brightness) of every shell with brightness state, always including the default one """
+        shells = [(self.sessions.default, self._shell())]
+        for session in self.sessions.sessions():
+            if not session.is_default and session.peek("brightness") is not None:
+                shells.append((session, session.peek("brightness")))
+        return shells
+
+    def _default_level(self, shell: ShellBrightness) -> int:
+        return shell.default if shell.default is not None else self.default_brightness
+
+    @property
+    def _brightness_level(self) -> int:
+        """ brightness of the default shell """
+        return self._shell().level
+
+    @_brightness_level.setter
+    def _brightness_level(self, level: int):
+        self._shell().level = level
+
+    def set_brightness(self, level: int, session: Optional[ShellSession] = None):
         """
         Set the brightness level.
 
         Args:
             level: Brightness level to set.
+            session: shell to update, the default one if not given.
         """
+        session = session or self.sessions.default
         with self._lock:  # use a lock so this doesnt fire multiple times
             level = int(level)
-            if level == self._brightness_level:
+            shell = self._shell(session)
+            if level == shell.level:
                 return  # avoid log spam
             LOG.info(f"Brightness level set to {level}")
-            self._brightness_level = level
-
-            if self.fake_brightness:
-                LOG.debug("delegating brightness change to ovos-shell fake brightness")
-                # ovos-shell will apply fake brightness
-                self.bus.emit(Message("phal.brightness.control.auto.dim.update",
-                                      {"brightness": level}))
-            else:  # will NOT update ovos-shell slider
-                LOG.debug("delegating brightness change to external plugin")
-                self.bus.emit(Message("phal.brightness.control.set",
-                                      {"brightness": level}))
-                # sync GUI slider by reporting new value
-                self.bus.emit(Message("phal.brightness.control.get.response",
-                                      {"brightness": level}))
+            shell.level = level
+            self._emit_brightness(level, session.context)
+
+    def _set_all_brightness(self, level: int):
+        """ set the brightness of every shell, announced with a single broadcast """
+        with self._lock:
+            level = int(level)
+            shells = self._shells()
+            changed = [session for session, shell in shells if shell.level != level]
+            if not changed:
+                return
+            LOG.info(f"Brightness level set to {level}")
+            for _, shell in shells:
+                shell.level = level
+            self._emit_brightness(level, shells[0][0].context if len(shells) == 1 else {})
+
+    def _emit_brightness(self, level: int, context: dict):
+        if self.fake_brightness:
+            LOG.debug("delegating brightness change to ovos-shell fake brightness")
+            # ovos-shell will apply fake brightness
+            self.bus.emit(Message("phal.brightness.control.auto.dim.update",
+                                  {"brightness": level}, dict(context)))
+        else:  # will NOT update ovos-shell slider
+            LOG.debug("delegating brightness change to external plugin")
+            self.bus.emit(Message("phal.brightness.control.set",
+                                  {"brightness": level}, dict(context)))
+            # sync GUI slider by reporting new value
+            self.bus.emit(Message("phal.brightness.control.get.response",
+                                  {"brightness": level}, dict(context)))
 
     def handle_get_brightness(self, message: Message):
         """
@@ -107,7 +170,8 @@ class BrightnessManager:
         if not self.fake_brightness:
             # let external PHAL plugin handle it
             return
-        self.bus.emit(message.response(data={"brightness": self._brightness_level}))
+        shell = self._shell(self.sessions.get(message))
+        self.bus.emit(message.response(data={"brightness": shell.level}))
 
     def handle_sync_brightness(self, message: Message):
         """
@@ -118,11 +182,33 @@ class BrightnessManager:
         """
         level = message.data.get("brightness", 100)
         LOG.debug(f"brightness level update: {level}")
-        self._brightness_level = int(level)
-        if message.data.get("make_default") and level != self.default_brightness:
-            self.default_brightness = level
+        session = self.sessions.get(message)
+        shell = self._shell(session)
+        shell.level = int(level)
+        if message.data.get("make_default") and level != self._default_level(shell):
+            if session.is_default:
+                self.default_brightness = level
+            else:
+                shell.default = level
             LOG.info(f"new brightness default level: {level}")
 
+    def get_state(self, session: Optional[ShellSession] = None) -> dict:
+        """
+        Get the current brightness and display settings.
+
+        Args:
+            session: shell to report, the default one if not given.
+
+        Returns:
+            dict: brightness level and auto-dim/night mode configuration.
+        """
+        shell = self._shell(session)
+        return {"brightness": shell.level,
+                "default_brightness": self._default_level(shell),
+                "auto_dim": self.config.get("auto_dim", False),
+                "auto_nightmode": self.config.get("auto_nightmode", False),
+                "external_plugin": not self.fake_brightness}
+
     @property
     def auto_dim_enabled(self) -> bool:
         """
@@ -144,13 +230,25 @@ class BrightnessManager:
             self.config["auto_dim"] = True
             update_config("auto_dim", True)
 
+        # every shell dims after its own inactivity period
+        for session, _ in self._shells():
+            self._schedule_next_dim(session)
+
+    def _schedule_next_dim(self, session: ShellSession):
         # cancel any previous autodim event
-        self._cancel_next_dim()
+        self._cancel_next_dim(session)
         # dim screen in 60 seconds
         seconds = self.config.get("auto_dim_seconds", 60)
         self.event_scheduler.schedule_event(self.handle_dim_screen,
                                             when=now_local() + timedelta(seconds=seconds),
-                                            name="ovos-shell.autodim")
+                                            data={"session_id": session.session_id},
+                                            name=self._dim_event_name(session))
+
+    @staticmethod
+    def _dim_event_name(session: ShellSession) -> str:
+        if session.is_default:
+            return "ovos-shell.autodim"
+        return f"ovos-shell.autodim.{session.session_id}"
 
     def handle_dim_screen(self, message: Optional[Message] = None):
         """
@@ -159,25 +257,37 @@ class BrightnessManager:
         Args:
             message: Optional message received from the bus.
         """
+        session = self.sessions.default
+        if message is not None and message.data.get("session_id"):
+            session = self.sessions.lookup(message.data["session_id"])
+            if session is None:
+                return  # shell went away
         if self.auto_dim_enabled:
             lowb = self.config.get("low_brightness", 20)
-            if self._brightness_level != lowb:
+            if self._shell(session).level != lowb:
                 LOG.debug("Auto-dim: Lowering brightness")
-                self.set_brightness(lowb)
+                self.set_brightness(lowb, session)
             if self.auto_night_mode_enabled and self.is_night:
                 # show night clock in homescreen
                 LOG.debug("triggering night face clock")
                 # TODO - allow other actions, new bus event to trigger night mode
                 # dont hardcode homescreen night clock face
-                self.bus.emit(Message("phal.brightness.control.auto.night.mode.enabled"))
+                self.bus.emit(Message("phal.brightness.control.auto.night.mode.enabled",
+                                      context=dict(session.context)))
 
-    def _restore(self):
+    def _restore(self, session: Optional[ShellSession] = None):
         """
         Restore the brightness level if auto-dim had reduced it.
+
+        Args:
+            session: shell to restore, every shell if not given.
         """
-        if self._brightness_level < self.default_brightness:
-            LOG.debug("Auto-dim: Restoring brightness")
-            self.set_brightness(self.default_brightness)
+        shells = [(session, self._shell(session))] if session else self._shells()
+        for session, shell in shells:
+            default = self._default_level(shell)
+            if shell.level < default:
+                LOG.debug("Auto-dim: Restoring brightness")
+                self.set_brightness(default, session)
 
     def stop_auto_dim(self):
         """
@@ -190,13 +300,12 @@ class BrightnessManager:
             self.config["auto_dim"] = False
             update_config("auto_dim", False)
 
-    def _cancel_next_dim(self):
-        # cancel the next unfired dim event
-        try:
-            time_left = self.event_scheduler.get_scheduled_event_status("ovos-shell.autodim")
-            self.event_scheduler.cancel_scheduled_event("ovos-shell.autodim")
-        except:
-            pass  # throws exception if event not registered
+    def _cancel_next_dim(self, session: Optional[ShellSession] = None):
+        # cancel the next unfired dim event, a no-op if none is scheduled
+        # NOTE: do not query the event status first, it blocks until the response times out
+        sessions = [session] if session else [s for s, _ in self._shells()]
+        for session in sessions:
+            self.event_scheduler.cancel_scheduled_event(self._dim_event_name(session))
 
     def handle_undim_screen(self, message: Optional[Message] = None):
         """
@@ -206,13 +315,14 @@ class BrightnessManager:
             message: Optional message received from the bus.
         """
         if self.auto_dim_enabled:
-            self._restore()
-            self._cancel_next_dim()
+            session = self.sessions.get(message)
+            self._restore(session)
             # schedule next auto-dim
-            seconds = self.config.get("auto_dim_seconds", 60)
-            self.event_scheduler.schedule_event(self.handle_dim_screen,
-                                                when=now_local() + timedelta(seconds=seconds),
-                                                name="ovos-shell.autodim")
+            self._schedule_next_dim(session)
+
+    def _on_session_evicted(self, session: ShellSession):
+        if session.peek("brightness") is not None:
+            self.event_scheduler.cancel_scheduled_event(self._dim_event_name(session))
 
     ##################################
     # AUTO NIGHT MODE HANDLING
@@ -293,7 +403,9 @@ class BrightnessManager:
         if self.auto_night_mode_enabled:
             LOG.debug("It is nighttime")
             self.default_brightness = self.config.get("night_default_brightness", 70)
-            self.set_brightness(self.default_brightness)
+            for _, shell in self._shells():
+                shell.default = None  # every shell follows the night default
+            self._set_all_brightness(self.default_brightness)
             # show night clock in homescreen
             self.bus.emit(Message("phal.brightness.control.auto.night.mode.enabled"))
             # equivalent to
@@ -314,14 +426,55 @@ class BrightnessManager:
             self.config["auto_nightmode"] = False
             update_config("auto_nightmode", False)
 
+    def _on_location_change(self, location: Optional[dict]):
+        with self._lock:
+            self._suntimes = None
+            if self.auto_night_mode_enabled:
+                self._reschedule_night_mode()
+
+    def _on_plugin_config_change(self, plugin_config: Optional[dict]):
+        plugin_config = plugin_config or {}
+        with self._lock:
+            changed = {k for k in BRIGHTNESS_KEYS
+                       if k in plugin_config and plugin_config[k] != self.config.get(k)}
+            if not changed:
+                return
+            LOG.info(f"brightness config changed: {sorted(changed)}")
+            for k in changed:
+                self.config[k] = plugin_config[k]
+            if "sunrise_time" in changed or "sunset_time" in changed:
+                self._suntimes = None
+            if "auto_nightmode" in changed:
+                if self.auto_night_mode_enabled:
+                    self.start_auto_night_mode()
+                else:
+                    self.stop_auto_night_mode()
+            elif self.auto_night_mode_enabled and self._suntimes is None:
+                self._reschedule_night_mode()
+            if "auto_dim" in changed:
+                if self.config["auto_dim"]:
+                    self.start_auto_dim()
+                else:
+                    self.stop_auto_dim()
+            if "default_brightness" in changed and not (self.auto_night_mode_enabled and self.is_night):
+                self.default_brightness = self.config["default_brightness"]
+
+    def _reschedule_night_mode(self):
+        self.event_scheduler.cancel_scheduled_event("ovos-shell.sunrise")
+        self.event_scheduler.cancel_scheduled_event("ovos-shell.sunset")
+        self.start_auto_night_mode()
+
     def get_suntimes(self) -> Tuple[datetime.datetime, datetime.datetime]:
+        reference = now_local()  # now_local() is tz aware
+        suntimes = self._suntimes
+        if suntimes is not None and reference < min(suntimes):
+            return suntimes
+
         sunrise = self.config.get("sunrise_time", "auto")
         sunset = self.config.get("sunset_time", "auto")
         sunset_time = None
         sunrise_time = None
 
-        reference = now_local()  # now_local() is tz aware
-
         # check if sunrise has been explicitly configured by user
         if ":" in sunrise:
             hours, mins = sunrise.split(":")
@@ -350,7 +503,11 @@ class BrightnessManager:
         if sunrise_time is None or sunset_time is None:
             LOG.debug("Determining sunset/sunrise times")
             try:
-                location = Configuration()["location"]
+                # imported here, astral is only needed when auto night mode is in use
+                from astral import LocationInfo
+                from astral.sun import sun
+
+                location = self.system_config.get("location")
                 lat = location["coordinate"]["latitude"]
                 lon = location["coordinate"]["longitude"]
                 tz = location["timezone"]["code"]
@@ -385,4 +542,6 @@ class BrightnessManager:
             LOG.info(f"Sunrise time: {sunrise_time}")
         if self.sunset_time is None or self.sunset_time != sunset_time:
             LOG.info(f"Sunset time: {sunset_time}")
+        if sunrise_time is not None and sunset_time is not None:
+            self._suntimes = (sunrise_time, sunset_time)
         return sunrise_time, sunset_time
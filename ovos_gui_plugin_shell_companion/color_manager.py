@@ -1,6 +1,7 @@
 import os
 import re
 from os.path import join, dirname
+from typing import Optional
 
 from ovos_bus_client import Message
 from ovos_utils.log import LOG
@@ -46,7 +47,8 @@ class ColorManager:
                               {"theme_name": theme_name,
                                "theme_path": self.theme_path}))
 
-    def provide_theme(self, message):
+    def get_theme(self) -> Optional[dict]:
+        """ read the active color scheme, None if it can not be loaded """
         file_name = "OvosTheme"
         xdg_system_path = "/etc/xdg"
         try:
@@ -63,12 +65,15 @@ class ColorManager:
             primaryColor = re.search(r"primaryColor=(.*)", theme).group(1)
             secondaryColor = re.search(r"secondaryColor=(.*)", theme).group(1)
             textColor = re.search(r"textColor=(.*)", theme).group(1)
-
-            self.bus.emit(message.response({"name": name,
-                                            "primaryColor": primaryColor,
-                                            "secondaryColor": secondaryColor,
-                                            "textColor": textColor}))
-
+            return {"name": name,
+                    "primaryColor": primaryColor,
+                    "secondaryColor": secondaryColor,
+                    "textColor": textColor}
         except Exception as e:
             LOG.error(e)
-            return
+            return None
+
+    def provide_theme(self, message):
+        theme = self.get_theme()
+        if theme is not None:
+            self.bus.emit(message.response(theme))
@@ -0,0 +1,111 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from ovos_bus_client import Message
+from ovos_config import Configuration
+from ovos_utils.log import LOG
+
+Path = Union[str, Sequence[str]]
+# where the plugin config lives in mycroft.conf
+PLUGIN_CONFIG_PATH = "gui.ovos-gui-plugin-shell-companion"
+_MISSING = object()
+
+
+def split_path(path: Path) -> Tuple[str, ...]:
+    """ "gui.ovos-gui-plugin-shell-companion" -> ("gui", "ovos-gui-plugin-shell-companion") """
+    if isinstance(path, str):
+        return tuple(k for k in path.split(".") if k)
+    return tuple(path)
+
+
+class ConfigSnapshot:
+    """ merged configuration shared by every companion manager
+
+    the configuration stack is merged once and kept until the next
+    configuration.updated message, lookups by path are plain dict accesses.
+    Managers subscribe to the subtrees they care about and are only called
+    when one of them changed after a refresh
+
+    the snapshot is a private deep copy, ovos_config updates the merged
+    configuration in place on reload, comparing against it would never find
+    a change. The snapshot is shared, callers must not modify returned values
+    """
+
+    def __init__(self, bus=None, loader: Callable[[], dict] = Configuration,
+                 reloader: Optional[Callable[[], None]] = Configuration.reload):
+        """
+        Args:
+            bus: messagebus, refreshes on configuration.updated if given
+            loader: returns the merged configuration
+            reloader: re-reads the configuration files before a refresh
+        """
+        self.loader = loader
+        self.reloader = reloader
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Tuple[str, ...], List[Callable[[Any], None]]] = {}
+        self._data: dict = copy.deepcopy(dict(loader()))
+        self.version = 0
+        if bus is not None:
+            bus.on("configuration.updated", self.handle_configuration_updated)
+
+    @property
+    def data(self) -> dict:
+        return self._data
+
+    def get(self, path: Path = "", default: Any = None) -> Any:
+        """ value at a dotted path, eg. get("location.timezone.code") """
+        value = self._lookup(self._data, split_path(path))
+        return default if value is _MISSING else value
+
+    @staticmethod
+    def _lookup(data: dict, keys: Tuple[str, ...]) -> Any:
+        value = data
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                return _MISSING
+            value = value[key]
+        return value
+
+    def subscribe(self, path: Path, callback: Callable[[Any], None]):
+        """ call callback(new value) whenever the subtree at path changes, "" for any change """
+        with self._lock:
+            self._subscribers.setdefault(split_path(path), []).append(callback)
+
+    def unsubscribe(self, path: Path, callback: Callable[[Any], None]):
+        with self._lock:
+            callbacks = self._subscribers.get(split_path(path), [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def refresh(self) -> List[str]:
+        """ merge the configuration again and notify subscribers of changed subtrees
+
+        Returns:
+            list: changed subscribed paths
+        """
+        if self.reloader:
+            self.reloader()
+        new = copy.deepcopy(dict(self.loader()))
+        with self._lock:
+            old, self._data = self._data, new
+            self.version += 1
+            subscribers = [(keys, list(callbacks)) for keys, callbacks in self._subscribers.items()]
+        changed = []
+        for keys, callbacks in subscribers:
+            value = self._lookup(new, keys)
+            if value == self._lookup(old, keys):
+                continue
+            changed.append(".".join(keys))
+            value = None if value is _MISSING else value
+            for callback in callbacks:
+                try:
+                    callback(value)
+                except Exception as e:
+                    LOG.exception(f"configuration subscriber for '{'.'.join(keys)}' failed: {e}")
+        return changed
+
+    def handle_configuration_updated(self, message: Message):
+        changed = self.refresh()
+        if changed:
+            LOG.debug(f"configuration changed: {changed}")
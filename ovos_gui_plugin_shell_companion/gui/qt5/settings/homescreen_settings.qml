@@ -93,6 +93,19 @@ Item {
                             Layout.fillWidth: true
                             spacing: Math.round(units.gridUnit / 2)
 
+                            Image {
+                                id: previewImage
+                                Layout.alignment: Qt.AlignVCenter | Qt.AlignLeft
+                                Layout.preferredHeight: units.gridUnit * 4
+                                Layout.preferredWidth: units.gridUnit * 6
+                                visible: modelData.preview ? true : false
+                                source: modelData.preview ? Qt.resolvedUrl(modelData.preview) : ""
+                                sourceSize.width: units.gridUnit * 6
+                                sourceSize.height: units.gridUnit * 4
+                                fillMode: Image.PreserveAspectCrop
+                                asynchronous: true
+                            }
+
                             Kirigami.Heading {
                                 Layout.fillWidth: true
                                 Layout.alignment: Qt.AlignHCenter
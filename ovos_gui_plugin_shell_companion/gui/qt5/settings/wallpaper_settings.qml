@@ -31,6 +31,7 @@ Item {
     property var currentWallpaper
     property var providersModel
     property var wallpapersProviderCollection
+    property var wallpapersProviderThumbnails
     property bool providerHasCollection
     property bool providerIsConfigurable
     property bool wallpaperRotation: false
@@ -84,6 +85,7 @@ Item {
     function refreshProvider() {
         var idx = providersComboBox.currentIndex
         wallpapersProviderCollection = providersComboBox.model[idx].wallpaper_collection
+        wallpapersProviderThumbnails = providersComboBox.model[idx].wallpaper_thumbnails
         providerIsConfigurable = providersComboBox.model[idx].provider_configurable
         if(wallpapersProviderCollection.length > 0) {
             providerHasCollection = true
@@ -305,7 +307,11 @@ Item {
                         id: delegateImage
                         anchors.fill: parent
                         anchors.margins: 4
-                        source: Qt.resolvedUrl(modelData)
+                        source: wallpaperSettings.wallpapersProviderThumbnails && wallpaperSettings.wallpapersProviderThumbnails[index] ? Qt.resolvedUrl(wallpaperSettings.wallpapersProviderThumbnails[index]) : Qt.resolvedUrl(modelData)
+                        sourceSize.width: wallpapersView.cellWidth
+                        sourceSize.height: wallpapersView.cellHeight
+                        fillMode: Image.PreserveAspectCrop
+                        asynchronous: true
                     }
                 }
 
@@ -0,0 +1,63 @@
+import threading
+from contextlib import contextmanager
+
+from ovos_bus_client.apis.gui import GUIInterface
+
+
+class ShellGUIInterface(GUIInterface):
+    """ GUIInterface that can batch session data changes
+
+    every session data change is synced to the GUI as soon as it is made,
+    inside a batch changes (and the page to show) are collected instead and
+    flushed once when the outermost batch exits, so pages never render with
+    partial state and a settings page switch costs a single update
+
+        with gui.batch():
+            gui["state"] = "settings/display_settings"
+            gui["display_auto_dim"] = True
+            gui.show_page("AdditionalSettings", override_idle=True)
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._batch_lock = threading.RLock()
+        self._batch_depth = 0
+        self._batch_dirty = False
+        self._batch_pages = None
+        super().__init__(*args, **kwargs)
+
+    @contextmanager
+    def batch(self):
+        with self._batch_lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush_batch()
+
+    def _flush_batch(self):
+        pages, dirty = self._batch_pages, self._batch_dirty
+        self._batch_pages, self._batch_dirty = None, False
+        if pages is not None:
+            # syncs all session data before showing the page
+            super().show_pages(*pages[0], **pages[1])
+        elif dirty:
+            super()._sync_data()
+
+    def _sync_data(self):
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+        super()._sync_data()
+
+    def __setitem__(self, key, value):
+        with self._batch_lock:
+            super().__setitem__(key, value)
+
+    def show_pages(self, *args, **kwargs):
+        with self._batch_lock:
+            if self._batch_depth:
+                self._batch_pages = (args, kwargs)
+                return
+            super().show_pages(*args, **kwargs)
@@ -1,5 +1,7 @@
+import copy
 import json
 import os
+from typing import Optional
 
 from ovos_bus_client import Message
 from ovos_config import Configuration
@@ -7,6 +9,8 @@ from ovos_config import LocalConf, USER_CONFIG
 from ovos_config.config import update_mycroft_config
 from ovos_utils.log import LOG
 
+from ovos_gui_plugin_shell_companion.config_snapshot import ConfigSnapshot
+
 
 def update_config(k, v):
     """helper to update config permanently (on mycroft.conf)"""
@@ -23,17 +27,29 @@ def update_config(k, v):
 class ConfigUIManager:
     """ handle UI for developer settings dropdown menu in ovos-shell """
 
-    def __init__(self, bus):
+    def __init__(self, bus, config: Optional[ConfigSnapshot] = None):
         self.bus = bus
+        self.config = config or ConfigSnapshot(bus, loader=Configuration, reloader=Configuration.reload)
         self.settings_meta = {}
+        self._stale = False
         self.build_settings_meta()
+        # settings meta is rebuilt on the next request after any configuration change
+        self.config.subscribe("", self._on_config_change)
 
         self.bus.on("ovos.phal.configuration.provider.list.groups", self.list_groups)
         self.bus.on("ovos.phal.configuration.provider.get", self.get_settings_meta)
         self.bus.on("ovos.phal.configuration.provider.set", self.set_settings_in_config)
 
+    def _on_config_change(self, config: dict):
+        self._stale = True
+
+    def _refresh_settings_meta(self):
+        if self._stale:
+            self._stale = False
+            self.build_settings_meta()
+
     def build_settings_meta(self):
-        readable_config = Configuration()
+        readable_config = self.config.data
         misc = {}
         new_config = {}
 
@@ -179,16 +195,19 @@ class ConfigUIManager:
                         return description["value"]
         return ""
 
+    def get_group_names(self):
+        return [group["group_name"] for group in self.settings_meta["settings"]]
+
     def list_groups(self, message=None):
-        group_names = []
-        for group in self.settings_meta["settings"]:
-            group_names.append(group["group_name"])
+        self._refresh_settings_meta()
+        group_names = self.get_group_names()
 
         self.bus.emit(Message("ovos.phal.configuration.provider.list.groups.response", {"groups": group_names}))
 
     def get_settings_meta(self, message=None):
         group_request = message.data.get("group")
         LOG.info(f"Getting settings meta for section: {group_request}")
+        self._refresh_settings_meta()
 
         for group in self.settings_meta["settings"]:
             if group["group_name"] == group_request:
@@ -214,7 +233,8 @@ class ConfigUIManager:
     def set_settings_in_config(self, message=None):
         group_name = message.data.get("group_name")
         configuration = message.data.get("configuration")
-        mycroft_config = Configuration()
+        # modified below, never touch the shared snapshot
+        mycroft_config = copy.deepcopy(self.config.data)
 
         misc = {}
         new_config = {}
@@ -256,3 +276,5 @@ class ConfigUIManager:
                             subkey, configuration, new_config[key][subkey])
 
                         update_mycroft_config(new_config[key][subkey])
+        # pick up the new values right away, other managers are notified of the change
+        self.config.refresh()
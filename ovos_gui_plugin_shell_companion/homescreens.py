@@ -0,0 +1,66 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.thumbnails import ThumbnailCache
+
+# homescreen.manager.add fields that may reference a preview image, in order of preference.
+# values are local paths, file:// or remote urls, homescreens without any are listed by name only
+PREVIEW_KEYS = ("preview", "thumbnail", "image", "icon")
+
+
+class HomescreenCatalog:
+    """ compact list of the registered homescreens, shown by the homescreen settings page
+
+    every entry only carries the homescreen id, display name and the path of a
+    preview thumbnail, whatever else homescreens sent when registering is not
+    forwarded to ovos-shell. The list is built once and kept until a homescreen
+    registers or deregisters. Previews are downscaled once per image version
+    by the thumbnail cache, inline (data:) images are never sent
+    """
+
+    def __init__(self, get_homescreens: Callable[[], List[dict]], thumbnails: ThumbnailCache):
+        """
+        Args:
+            get_homescreens: returns the homescreens registered with the homescreen manager
+            thumbnails: generates and stores the preview thumbnails
+        """
+        self.get_homescreens = get_homescreens
+        self.thumbnails = thumbnails
+        self._lock = threading.Lock()
+        self._entries: Optional[List[Dict[str, Optional[str]]]] = None
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+
+    def entries(self) -> List[Dict[str, Optional[str]]]:
+        """ {"id", "name", "preview"} of every registered homescreen """
+        with self._lock:
+            if self._entries is None:
+                self._entries = [self._entry(homescreen) for homescreen in self.get_homescreens() or []
+                                 if isinstance(homescreen, dict) and homescreen.get("id")]
+            return self._entries
+
+    def _entry(self, homescreen: dict) -> Dict[str, Optional[str]]:
+        return {"id": homescreen["id"],
+                "name": homescreen.get("name") or homescreen["id"],
+                "preview": self._preview(homescreen)}
+
+    def _preview(self, homescreen: dict) -> Optional[str]:
+        for key in PREVIEW_KEYS:
+            url = homescreen.get(key)
+            if not url or not isinstance(url, str):
+                continue
+            if url.startswith("data:"):
+                LOG.debug(f"inline {key} image of homescreen {homescreen['id']} not sent to the shell")
+                continue
+            path = url[7:] if url.startswith("file://") else url
+            if os.path.isfile(path):
+                # until the thumbnail is ready the original image is referenced
+                return self.thumbnails.get(path) or path
+            if "://" in url:
+                return url  # remote images are not cached
+        return None
@@ -0,0 +1,155 @@
+import bisect
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+
+from ovos_gui_plugin_shell_companion.tracing import percentile
+
+# latency histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+# most recent latencies kept per handler for percentiles
+LATENCY_SAMPLES = 1024
+
+
+class HandlerStats:
+    """ counters for a single bus handler """
+    __slots__ = ("calls", "errors", "emitted", "total", "max", "buckets", "samples", "last_error")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.errors = 0
+        self.emitted = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+        self.last_error = None
+
+    def as_dict(self) -> dict:
+        histogram = {f"<={bound}ms": count
+                     for bound, count in zip(LATENCY_BUCKETS, self.buckets)}
+        histogram[f">{LATENCY_BUCKETS[-1]}ms"] = self.buckets[-1]
+        samples = list(self.samples)
+        return {"calls": self.calls,
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "emitted": self.emitted,
+                "total_ms": round(self.total * 1000, 3),
+                "avg_ms": round(self.total * 1000 / self.calls, 3) if self.calls else 0,
+                "max_ms": round(self.max * 1000, 3),
+                "p50_ms": round(percentile(samples, 50) * 1000, 3),
+                "p95_ms": round(percentile(samples, 95) * 1000, 3),
+                "p99_ms": round(percentile(samples, 99) * 1000, 3),
+                "histogram": histogram}
+
+
+class HandlerMetrics:
+    """ call counts, latency histograms, exceptions and emitted messages per bus handler
+
+    handlers are instrumented by wrapping them with wrap(), messages emitted
+    while a wrapped handler runs are attributed to it
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, HandlerStats] = {}
+        self._local = threading.local()
+        self._started = time.time()
+
+    @staticmethod
+    def handler_name(event: str, handler: Callable) -> str:
+        name = getattr(handler, "__qualname__", None) or repr(handler)
+        return f"{event}:{name}"
+
+    def wrap(self, event: str, handler: Callable) -> Callable:
+        name = self.handler_name(event, handler)
+        with self._lock:
+            stats = self._stats.setdefault(name, HandlerStats())
+
+        @wraps(handler)
+        def instrumented(*args, **kwargs):
+            stack = self._current_stack()
+            stack.append(stats)
+            start = time.perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            except Exception as e:
+                with self._lock:
+                    stats.errors += 1
+                    stats.last_error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                with self._lock:
+                    stats.calls += 1
+                    stats.total += elapsed
+                    stats.max = max(stats.max, elapsed)
+                    stats.samples.append(elapsed)
+                    stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed * 1000)] += 1
+
+        instrumented.__instrumented__ = True
+        return instrumented
+
+    def record_emit(self):
+        """ attribute an emitted message to the handler running in this thread, if any """
+        stack = self._current_stack()
+        if stack:
+            with self._lock:
+                stack[-1].emitted += 1
+
+    def _current_stack(self) -> List[HandlerStats]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def reset(self):
+        with self._lock:
+            for stats in self._stats.values():
+                stats.reset()
+            self._started = time.time()
+
+    def snapshot(self) -> dict:
+        """ JSON serializable copy of all collected metrics """
+        with self._lock:
+            return {"since": self._started,
+                    "handlers": {name: stats.as_dict()
+                                 for name, stats in sorted(self._stats.items())}}
+
+
+class InstrumentedBus:
+    """ messagebus proxy wrapping every registered handler with HandlerMetrics """
+
+    def __init__(self, bus, metrics: HandlerMetrics):
+        self._bus = bus
+        self.metrics = metrics
+        self._wrapped: Dict[Tuple[str, Callable], Callable] = {}
+
+    def _wrap(self, event: str, handler: Callable) -> Callable:
+        if getattr(handler, "__instrumented__", False):
+            return handler  # already instrumented where it runs, eg. in a subsystem worker
+        return self.metrics.wrap(event, handler)
+
+    def on(self, event: str, handler: Callable):
+        wrapped = self._wrap(event, handler)
+        self._wrapped[(event, handler)] = wrapped
+        self._bus.on(event, wrapped)
+
+    def once(self, event: str, handler: Callable):
+        self._bus.once(event, self._wrap(event, handler))
+
+    def remove(self, event: str, handler: Callable):
+        self._bus.remove(event, self._wrapped.pop((event, handler), handler))
+
+    def emit(self, message, *args, **kwargs):
+        self.metrics.record_emit()
+        return self._bus.emit(message, *args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._bus, item)
@@ -0,0 +1,691 @@
+import bisect
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from os.path import dirname, exists
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+
+# notification fields with a secondary index, usable as query filters
+INDEXED_FIELDS = ("sender", "style", "type")
+
+
+class NotificationJournal:
+    """ append-only journal persisting a NotificationStore across restarts
+
+    every change is appended as a json line, once the journal grows well past
+    the number of live notifications it is rewritten with only the live ones
+    """
+
+    def __init__(self, path: str, compact_threshold: int = 500):
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self.entries = 0
+
+    def load(self) -> List[dict]:
+        """
+        Read all journal operations
+
+        Returns:
+            list: journal operations, in the order they were written
+        """
+        ops = []
+        if not exists(self.path):
+            return ops
+        with open(self.path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    ops.append(json.loads(line))
+                except json.JSONDecodeError:
+                    LOG.warning(f"Skipping corrupted notification journal entry: {line}")
+        self.entries = len(ops)
+        return ops
+
+    def append(self, op: dict):
+        os.makedirs(dirname(self.path), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(op) + "\n")
+        self.entries += 1
+
+    def needs_compaction(self, live: int) -> bool:
+        return self.entries > self.compact_threshold and self.entries > 2 * live
+
+    def compact(self, ops: List[dict]):
+        """
+        Atomically replace the journal contents
+
+        Args:
+            ops: operations rebuilding the current state
+        """
+        os.makedirs(dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for op in ops:
+                f.write(json.dumps(op) + "\n")
+        os.replace(tmp_path, self.path)
+        self.entries = len(ops)
+        LOG.debug(f"Compacted notification journal to {self.entries} entries")
+
+
+class NotificationStore:
+    """ insertion ordered collection of notifications
+
+    notifications are keyed by a stable notification id, a secondary
+    (sender, text, timestamp) index allows resolving notifications sent back
+    by ovos-shell without an id, without scanning the whole model. Repeated
+    notifications with the same text are distinct, they were sent at
+    different times
+
+    the store can optionally be bounded by count and/or serialized size,
+    oldest notifications are evicted first, and notifications may expire
+    after a time to live. If a journal is provided all changes are persisted
+
+    if change tracking is enabled every commit bumps a revision number and
+    produces a delta (added, removed and updated notifications), a bounded
+    history of deltas allows catching up from older revisions
+
+    every notification gets an insertion sequence number, secondary indexes
+    by sender, style, type (sorted sequence lists) and timestamp (sorted
+    (timestamp, sequence) pairs) let query() page through matching
+    notifications without scanning the whole store.
+    Removed or moved index entries are left behind as tombstones, skipped by
+    query(), and dropped by rebuilding the indexes once they outnumber the
+    stored notifications, so removals never shift the sorted lists
+    """
+
+    def __init__(self, max_count: int = 0, max_bytes: int = 0,
+                 default_ttl: float = 0,
+                 journal: Optional[NotificationJournal] = None,
+                 track_changes: bool = False,
+                 history_size: int = 64):
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.journal = journal
+        self.track_changes = track_changes
+        self.revision = 0
+        self._history = deque(maxlen=history_size)
+        self._reset_changes()
+        self._lock = threading.RLock()
+        self._notifications: Dict[str, dict] = OrderedDict()
+        self._content_index: Dict[Tuple[str, str, float], str] = {}
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._expires: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._seq = itertools.count(1)
+        self._seqs: Dict[str, int] = {}  # notification id: insertion sequence
+        self._by_seq: Dict[int, str] = {}
+        self._seq_index: List[int] = []  # sequences of all stored notifications, ascending
+        self._field_index: Dict[str, Dict[str, List[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self._time_index: List[Tuple[float, int]] = []  # (timestamp, sequence), ascending
+        self._stale = 0  # tombstones left in the indexes
+        self._removed_times: Dict[int, float] = {}  # sequence: timestamp, of removed notifications
+        if self.journal:
+            self._restore()
+
+    @staticmethod
+    def content_key(notification: dict) -> Tuple[str, str, float]:
+        return (notification.get("sender", ""), notification.get("text", ""),
+                NotificationStore._timestamp(notification))
+
+    def find(self, notification: dict) -> Optional[str]:
+        """
+        Resolve the id of a stored notification
+
+        Args:
+            notification: notification data, as sent to ovos-shell
+
+        Returns:
+            str: notification id, None if not stored
+        """
+        notification_id = notification.get("id")
+        if notification_id in self._notifications:
+            return notification_id
+        return self._content_index.get(self.content_key(notification))
+
+    def get(self, notification_id: str) -> Optional[dict]:
+        return self._notifications.get(notification_id)
+
+    def add(self, notification: dict, ttl: Optional[float] = None) -> bool:
+        """
+        Add a notification unless an equivalent one is already stored
+
+        Args:
+            notification: notification data, an "id" is assigned if missing
+            ttl: seconds until the notification expires, overrides the store default
+
+        Returns:
+            bool: True if the notification was added, False if duplicate
+        """
+        with self._lock:
+            self.expire()
+            if self.find(notification) is not None:
+                return False
+            notification_id = notification.get("id") or uuid4().hex
+            notification["id"] = notification_id
+            ttl = ttl or self.default_ttl
+            expires = time.time() + ttl if ttl else 0
+            self._insert(notification, expires)
+            if self.track_changes:
+                self._changes["added"][notification_id] = notification
+            if self.journal:
+                self.journal.append({"op": "add", "notification": notification,
+                                     "expires": expires})
+            self._evict()
+            self._maybe_compact()
+            return True
+
+    def remove(self, notification: dict) -> Optional[dict]:
+        """
+        Remove a notification
+
+        Args:
+            notification: notification data, matched by id or (sender, text, timestamp)
+
+        Returns:
+            dict: the removed notification, None if it was not stored
+        """
+        with self._lock:
+            notification_id = self.find(notification)
+            if notification_id is None:
+                return None
+            return self.pop(notification_id)
+
+    def pop(self, notification_id: str) -> Optional[dict]:
+        with self._lock:
+            notification = self._discard(notification_id)
+            if notification is None:
+                return None
+            if self.track_changes:
+                self._changes["updated"].pop(notification_id, None)
+                if self._changes["added"].pop(notification_id, None) is None:
+                    self._changes["removed"].append(notification_id)
+            if self.journal:
+                self.journal.append({"op": "remove", "id": notification_id})
+                self._maybe_compact()
+            return notification
+
+    def update(self, notification_id: str, **fields) -> Optional[dict]:
+        """
+        Update fields of a stored notification in place
+
+        Returns:
+            dict: the updated notification, None if it was not stored
+        """
+        with self._lock:
+            notification = self._notifications.get(notification_id)
+            if notification is None:
+                return None
+            old_key = self.content_key(notification)
+            old_values = self._index_values(notification)
+            notification.update(fields)
+            self._reindex(self._seqs[notification_id], notification, old_values)
+            new_key = self.content_key(notification)
+            if new_key != old_key:
+                if self._content_index.get(old_key) == notification_id:
+                    del self._content_index[old_key]
+                self._content_index[new_key] = notification_id
+            size = len(json.dumps(notification))
+            self._bytes += size - self._sizes.get(notification_id, 0)
+            self._sizes[notification_id] = size
+            if self.track_changes and notification_id not in self._changes["added"]:
+                self._changes["updated"][notification_id] = notification
+            if self.journal:
+                self.journal.append({"op": "update", "id": notification_id, "fields": fields})
+                self._maybe_compact()
+            self._evict()
+            return notification
+
+    def clear(self):
+        with self._lock:
+            self._notifications.clear()
+            self._content_index.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self._expires.clear()
+            self._expiry_heap = []
+            self._seqs.clear()
+            self._by_seq.clear()
+            self._seq_index = []
+            self._field_index = {field: {} for field in INDEXED_FIELDS}
+            self._time_index = []
+            self._stale = 0
+            self._removed_times.clear()
+            if self.track_changes:
+                self._reset_changes()
+                self._changes["cleared"] = True
+            if self.journal:
+                self.journal.compact([])
+
+    def commit(self) -> Optional[dict]:
+        """
+        Bump the revision with all changes since the previous commit
+
+        Returns:
+            dict: the delta, None if nothing changed
+        """
+        with self._lock:
+            self.expire()
+            changes = self._changes
+            if not (changes["cleared"] or changes["added"] or
+                    changes["removed"] or changes["updated"]):
+                return None
+            self._reset_changes()
+            self.revision += 1
+            delta = {"base_revision": self.revision - 1,
+                     "revision": self.revision,
+                     "cleared": changes["cleared"],
+                     "added": list(changes["added"].values()),
+                     "removed": changes["removed"],
+                     "updated": list(changes["updated"].values())}
+            self._history.append(delta)
+            return delta
+
+    def changes_since(self, revision: int) -> Optional[dict]:
+        """
+        Merge all committed deltas after a given revision
+
+        Args:
+            revision: last revision known by the requester
+
+        Returns:
+            dict: merged delta, None if the history no longer covers the
+                requested revision and a full snapshot is needed
+        """
+        with self._lock:
+            if revision > self.revision:
+                return None
+            deltas = [d for d in self._history if d["revision"] > revision]
+            if revision < self.revision and \
+                    (not deltas or deltas[0]["base_revision"] != revision):
+                return None  # revision gap
+            merged = {"base_revision": revision, "revision": self.revision,
+                      "cleared": False, "added": {}, "removed": [], "updated": {}}
+            for delta in deltas:
+                if delta["cleared"]:
+                    merged.update(cleared=True, added={}, removed=[], updated={})
+                for n in delta["added"]:
+                    merged["added"][n["id"]] = n
+                for notification_id in delta["removed"]:
+                    merged["updated"].pop(notification_id, None)
+                    if merged["added"].pop(notification_id, None) is None:
+                        merged["removed"].append(notification_id)
+                for n in delta["updated"]:
+                    if n["id"] in merged["added"]:
+                        merged["added"][n["id"]] = n
+                    else:
+                        merged["updated"][n["id"]] = n
+            merged["added"] = list(merged["added"].values())
+            merged["updated"] = list(merged["updated"].values())
+            return merged
+
+    def expire(self, now: Optional[float] = None) -> List[dict]:
+        """
+        Drop notifications whose time to live elapsed
+
+        Returns:
+            list: the expired notifications
+        """
+        now = now or time.time()
+        expired = []
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires, notification_id = heapq.heappop(self._expiry_heap)
+                if self._expires.get(notification_id) != expires:
+                    continue  # stale heap entry, notification already removed
+                expired.append(self.pop(notification_id))
+        return expired
+
+    def values(self) -> List[dict]:
+        with self._lock:
+            self.expire()
+            return list(self._notifications.values())
+
+    def query(self, filters: Optional[Dict[str, Any]] = None, since: Optional[float] = None,
+              until: Optional[float] = None, limit: int = 50,
+              cursor: Optional[int] = None) -> Tuple[List[dict], Optional[int]]:
+        """
+        Stored notifications matching all filters, newest first
+
+        when since or until are given the time index is walked and notifications
+        are ordered by timestamp, otherwise by insertion order
+
+        Args:
+            filters: {field: value or list of values} for any of INDEXED_FIELDS
+            since: min notification timestamp
+            until: max notification timestamp
+            limit: max notifications returned
+            cursor: cursor returned by the previous page
+
+        Returns:
+            tuple: (notifications, cursor of the next page or None if this is the last one)
+        """
+        checks = []
+        with self._lock:
+            self.expire()
+            for field, wanted in (filters or {}).items():
+                if field not in INDEXED_FIELDS or wanted is None:
+                    continue
+                checks.append((field, {str(v) for v in (wanted if isinstance(wanted, (list, tuple, set))
+                                                        else [wanted])}))
+            if since is not None or until is not None:
+                return self._query_time_range(checks, since, until, limit, cursor)
+            candidates = [self._seq_index]
+            for field, values in checks:
+                buckets = [self._field_index[field].get(v, []) for v in values]
+                # an updated notification may still have a tombstone in its previous bucket
+                candidates.append(buckets[0] if len(buckets) == 1 else sorted(set(itertools.chain(*buckets))))
+            # walk the smallest index backwards from the cursor, checking the other filters
+            driver = min(candidates, key=len)
+            end = bisect.bisect_left(driver, cursor) if isinstance(cursor, int) else len(driver)
+            results, last = [], None
+            for seq in reversed(driver[:end]):
+                notification_id = self._by_seq.get(seq)
+                if notification_id is None:
+                    continue  # tombstone of a removed notification
+                notification = self._notifications[notification_id]
+                # indexes may hold tombstones of previous values, filters are checked on the notification
+                if not self._matches(notification, checks):
+                    continue
+                if len(results) == limit:
+                    return results, last  # there is at least one more
+                results.append(notification)
+                last = seq
+            return results, None
+
+    def _query_time_range(self, checks: List[Tuple[str, set]], since: Optional[float], until: Optional[float],
+                          limit: int, cursor: Optional[int]) -> Tuple[List[dict], Optional[int]]:
+        """ walk the time index backwards from the cursor, newest timestamp first """
+        lo = bisect.bisect_left(self._time_index, (since,)) if since is not None else 0
+        hi = bisect.bisect_right(self._time_index, (until, float("inf"))) \
+            if until is not None else len(self._time_index)
+        if isinstance(cursor, int):
+            hi = min(hi, self._time_cursor(cursor))
+        results, last = [], None
+        for idx in range(hi - 1, lo - 1, -1):
+            timestamp, seq = self._time_index[idx]
+            notification_id = self._by_seq.get(seq)
+            if notification_id is None:
+                continue  # tombstone of a removed notification
+            notification = self._notifications[notification_id]
+            if self._timestamp(notification) != timestamp:
+                continue  # tombstone of a previous timestamp
+            if not self._matches(notification, checks):
+                continue
+            if len(results) == limit:
+                return results, last  # there is at least one more
+            results.append(notification)
+            last = seq
+        return results, None
+
+    def _time_cursor(self, cursor: int) -> int:
+        """ position in the time index right before the cursor notification """
+        notification_id = self._by_seq.get(cursor)
+        if notification_id is not None:
+            timestamp = self._timestamp(self._notifications[notification_id])
+        elif cursor in self._removed_times:
+            timestamp = self._removed_times[cursor]
+        else:
+            # tombstones were dropped since, continue after the next older notification
+            idx = bisect.bisect_left(self._seq_index, cursor)
+            older = (seq for seq in reversed(self._seq_index[:idx]) if seq in self._by_seq)
+            cursor = next(older, None)
+            if cursor is None:
+                return 0
+            timestamp = self._timestamp(self._notifications[self._by_seq[cursor]])
+            return bisect.bisect_right(self._time_index, (timestamp, cursor))
+        return bisect.bisect_left(self._time_index, (timestamp, cursor))
+
+    @staticmethod
+    def _matches(notification: dict, checks: List[Tuple[str, set]]) -> bool:
+        return all(str(notification.get(field, "")) in values for field, values in checks)
+
+    def _reset_changes(self):
+        self._changes = {"cleared": False, "added": OrderedDict(),
+                         "removed": [], "updated": OrderedDict()}
+
+    @staticmethod
+    def _timestamp(notification: dict) -> float:
+        try:
+            return float(notification.get("timestamp") or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def _index_values(self, notification: dict) -> Tuple[Tuple[str, ...], float]:
+        return tuple(str(notification.get(field, "")) for field in INDEXED_FIELDS), self._timestamp(notification)
+
+    def _index(self, notification_id: str, notification: dict):
+        seq = next(self._seq)  # new notifications always sort last
+        self._seqs[notification_id] = seq
+        self._by_seq[seq] = notification_id
+        self._seq_index.append(seq)
+        values, timestamp = self._index_values(notification)
+        for field, value in zip(INDEXED_FIELDS, values):
+            self._field_index[field].setdefault(value, []).append(seq)
+        bisect.insort(self._time_index, (timestamp, seq))
+
+    def _reindex(self, seq: int, notification: dict, old_values: Tuple[Tuple[str, ...], float]):
+        """ add index entries for changed values, the previous ones become tombstones """
+        values, timestamp = self._index_values(notification)
+        for field, value, old_value in zip(INDEXED_FIELDS, values, old_values[0]):
+            if value != old_value:
+                bucket = self._field_index[field].setdefault(value, [])
+                idx = bisect.bisect_left(bucket, seq)
+                if idx == len(bucket) or bucket[idx] != seq:  # not already back from a tombstone
+                    bucket.insert(idx, seq)
+                self._stale += 1
+        if timestamp != old_values[1]:
+            bisect.insort(self._time_index, (timestamp, seq))
+            self._stale += 1
+        self._maybe_rebuild_indexes()
+
+    def _unindex(self, notification_id: str, notification: dict):
+        seq = self._seqs.pop(notification_id, None)
+        if seq is not None:
+            del self._by_seq[seq]
+            # lets cursors pointing at it resume from its position in the time index
+            self._removed_times[seq] = self._timestamp(notification)
+            self._stale += 1
+            self._maybe_rebuild_indexes()
+
+    def _maybe_rebuild_indexes(self):
+        if self._stale > len(self._seqs) + 64:
+            self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """ drop every tombstone, amortized over the removals that left them behind """
+        self._seq_index = sorted(self._by_seq)
+        self._field_index = {field: {} for field in INDEXED_FIELDS}
+        time_index = []
+        for seq in self._seq_index:
+            values, timestamp = self._index_values(self._notifications[self._by_seq[seq]])
+            for field, value in zip(INDEXED_FIELDS, values):
+                self._field_index[field].setdefault(value, []).append(seq)
+            time_index.append((timestamp, seq))
+        self._time_index = sorted(time_index)
+        self._stale = 0
+        self._removed_times.clear()
+
+    def _insert(self, notification: dict, expires: float = 0):
+        notification_id = notification["id"]
+        size = len(json.dumps(notification))
+        self._notifications[notification_id] = notification
+        self._index(notification_id, notification)
+        self._content_index[self.content_key(notification)] = notification_id
+        self._sizes[notification_id] = size
+        self._bytes += size
+        if expires:
+            self._expires[notification_id] = expires
+            heapq.heappush(self._expiry_heap, (expires, notification_id))
+            if len(self._expiry_heap) > 2 * len(self._expires) + 64:
+                # too many stale entries left behind by removed notifications
+                self._expiry_heap = [(e, i) for i, e in self._expires.items()]
+                heapq.heapify(self._expiry_heap)
+
+    def _discard(self, notification_id: str) -> Optional[dict]:
+        notification = self._notifications.pop(notification_id, None)
+        if notification is not None:
+            self._unindex(notification_id, notification)
+            key = self.content_key(notification)
+            if self._content_index.get(key) == notification_id:
+                del self._content_index[key]
+            self._bytes -= self._sizes.pop(notification_id, 0)
+            self._expires.pop(notification_id, None)
+        return notification
+
+    def _evict(self):
+        while self._notifications and (
+                (self.max_count and len(self._notifications) > self.max_count) or
+                (self.max_bytes and self._bytes > self.max_bytes)):
+            oldest = next(iter(self._notifications))
+            LOG.debug(f"Notification storage full, evicting: {oldest}")
+            self.pop(oldest)
+
+    def _restore(self):
+        journal, self.journal = self.journal, None
+        track_changes, self.track_changes = self.track_changes, False
+        for op in journal.load():
+            if op.get("op") == "add":
+                notification = op.get("notification") or {}
+                if "id" in notification and notification["id"] not in self._notifications:
+                    self._insert(notification, op.get("expires") or 0)
+            elif op.get("op") == "remove":
+                self._discard(op.get("id"))
+            elif op.get("op") == "update":
+                self.update(op.get("id"), **(op.get("fields") or {}))
+        # drop anything that expired or no longer fits while we were offline
+        self.expire()
+        self._evict()
+        self.journal, self.track_changes = journal, track_changes
+        self.journal.compact(self._snapshot_ops())
+        LOG.info(f"Restored {len(self._notifications)} stored notifications")
+
+    def _snapshot_ops(self) -> List[dict]:
+        return [{"op": "add", "notification": n,
+                 "expires": self._expires.get(notification_id, 0)}
+                for notification_id, n in self._notifications.items()]
+
+    def _maybe_compact(self):
+        if self.journal and self.journal.needs_compaction(len(self._notifications)):
+            self.journal.compact(self._snapshot_ops())
+
+    def __contains__(self, notification: dict) -> bool:
+        return self.find(notification) is not None
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.expire()
+            return len(self._notifications)
+
+
+class NotificationGrouper:
+    """ collapse bursts of notifications from the same sender
+
+    the first notification from a sender opens a grouping window, further
+    notifications from that sender arriving before the window closes are
+    merged into a single notification carrying the latest text and a count
+
+    senders are rate limited with a token bucket, once a sender runs out of
+    tokens its group is held back (and keeps absorbing notifications) until
+    a token is available again
+    """
+
+    def __init__(self, callback: Callable[[dict], None], timers: TimerQueue,
+                 window: float = 2, rate_limit: int = 0, rate_period: float = 60):
+        """
+        Args:
+            callback: called with each grouped notification once released
+            timers: timer queue used to close grouping windows
+            window: seconds to wait for more notifications from the same sender
+            rate_limit: max notifications released per sender every rate_period, 0 to disable
+            rate_period: seconds over which rate_limit applies
+        """
+        self.callback = callback
+        self.timers = timers
+        self.window = window
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self._lock = threading.Lock()
+        self._groups: Dict[str, dict] = {}
+        self._timers: Dict[str, list] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # sender: (tokens, last refill)
+
+    def add(self, notification: dict):
+        sender = notification.get("sender", "")
+        with self._lock:
+            group = self._groups.get(sender)
+            if group is not None:
+                count = group.get("count", 1) + 1
+                group.clear()
+                group.update(notification, count=count)
+                return
+            if not self.window and self._take_token(sender):
+                release = True
+            else:
+                self._groups[sender] = dict(notification)
+                self._schedule(sender, self.window)
+                release = False
+        if release:
+            self.callback(notification)
+
+    def _schedule(self, sender: str, delay: float):
+        self._timers[sender] = self.timers.schedule(delay, self._release, sender)
+
+    def _release(self, sender: str):
+        with self._lock:
+            self._timers.pop(sender, None)
+            if not self._take_token(sender):
+                # rate limited, keep grouping until a token is available
+                self._schedule(sender, self._token_wait(sender))
+                return
+            group = self._groups.pop(sender, None)
+        if group is not None:
+            if group.get("count", 1) > 1:
+                LOG.debug(f"Grouped {group['count']} notifications from '{sender}'")
+            self.callback(group)
+
+    def _refill(self, sender: str) -> float:
+        now = time.monotonic()
+        tokens, last = self._buckets.get(sender, (self.rate_limit, now))
+        tokens = min(self.rate_limit, tokens + (now - last) * self.rate_limit / self.rate_period)
+        self._buckets[sender] = (tokens, now)
+        return tokens
+
+    def _take_token(self, sender: str) -> bool:
+        if not self.rate_limit:
+            return True
+        tokens = self._refill(sender)
+        if tokens < 1:
+            return False
+        self._buckets[sender] = (tokens - 1, self._buckets[sender][1])
+        if len(self._buckets) > 256:
+            # forget senders whose bucket refilled completely
+            for s in [s for s in self._buckets if s != sender and self._refill(s) >= self.rate_limit]:
+                del self._buckets[s]
+        return True
+
+    def _token_wait(self, sender: str) -> float:
+        tokens = self._refill(sender)
+        return max(0.05, (1 - tokens) * self.rate_period / self.rate_limit)
+
+    def shutdown(self):
+        with self._lock:
+            for timer in self._timers.values():
+                self.timers.cancel(timer)
+            self._timers.clear()
+            self._groups.clear()
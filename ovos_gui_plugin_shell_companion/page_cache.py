@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+
+
+class SettingsPageCache:
+    """ session data for settings pages, prepared ahead of time
+
+    each page registers a provider returning the data it displays. A page
+    is prepared again once the device is idle when its data was dropped
+    because the underlying source changed, or when it was served past its
+    max age, so opening it later only pushes what was already prepared.
+    The prefetch timer only runs while pages wait to be prepared, nothing
+    is recomputed on an idle device with nothing invalidated
+    """
+
+    def __init__(self, timers: TimerQueue, idle_seconds: float = 30,
+                 default_max_age: float = 60,
+                 max_ages: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            timers: timer queue running the idle prefetch checks
+            idle_seconds: seconds without user activity before prefetching
+            default_max_age: seconds cached page data is considered fresh
+            max_ages: per page max age, overriding default_max_age
+        """
+        self.timers = timers
+        self.idle_seconds = idle_seconds
+        self.default_max_age = default_max_age
+        self.max_ages = max_ages or {}
+        self._lock = threading.RLock()
+        self._providers: Dict[str, Callable[[], dict]] = {}
+        self._entries: Dict[str, Tuple[float, dict]] = {}
+        self._pending: Set[str] = set()  # pages to prepare once idle
+        self._last_activity = time.monotonic()
+        self._timer = None
+
+    def register(self, page: str, provider: Callable[[], dict]):
+        self._providers[page] = provider
+
+    def max_age(self, page: str) -> float:
+        return self.max_ages.get(page, self.default_max_age)
+
+    def get(self, page: str) -> dict:
+        """
+        Get the data for a settings page, computed now if not cached
+
+        data older than the max age of the page is still returned, and
+        prepared again in the background for the next time
+
+        Args:
+            page: registered page name
+
+        Returns:
+            dict: session data for the page
+        """
+        with self._lock:
+            entry = self._entries.get(page)
+        if entry is None:
+            return self._refresh(page)
+        if time.monotonic() - entry[0] > self.max_age(page):
+            self._request_prefetch([page])
+        return entry[1]
+
+    def invalidate(self, *pages: str):
+        """ drop cached data and prepare it again once idle, all pages if none specified """
+        with self._lock:
+            pages = pages or tuple(self._providers)
+            for page in pages:
+                self._entries.pop(page, None)
+        self._request_prefetch(pages)
+
+    def touch(self):
+        """ register user activity, postponing prefetching """
+        self._last_activity = time.monotonic()
+
+    def start(self):
+        """ prepare every registered page once the device is idle """
+        self._request_prefetch(list(self._providers))
+
+    @property
+    def pending(self) -> Set[str]:
+        """ pages waiting to be prepared """
+        with self._lock:
+            return set(self._pending)
+
+    def prefetch(self):
+        """ prepare every page waiting for it """
+        with self._lock:
+            pages, self._pending = self._pending, set()
+        for page in pages:
+            try:
+                self._refresh(page)
+            except Exception as e:
+                LOG.error(f"Failed to prefetch settings page '{page}': {e}")
+
+    def _refresh(self, page: str) -> dict:
+        data = self._providers[page]()
+        with self._lock:
+            self._entries[page] = (time.monotonic(), data)
+        return data
+
+    def _request_prefetch(self, pages: Iterable[str]):
+        with self._lock:
+            self._pending.update(page for page in pages if page in self._providers)
+            if self._pending and self._timer is None:
+                self._timer = self.timers.schedule(self.idle_seconds, self._tick)
+
+    def _tick(self):
+        with self._lock:
+            self._timer = None
+            idle_for = time.monotonic() - self._last_activity
+            if idle_for < self.idle_seconds:
+                self._timer = self.timers.schedule(self.idle_seconds - idle_for, self._tick)
+                return
+        self.prefetch()
@@ -0,0 +1,324 @@
+import heapq
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+from typing import Callable, List, Optional
+
+from ovos_utils.log import LOG
+
+
+class TimerQueue:
+    """ run callbacks after a delay from a single worker thread
+
+    pending callbacks are kept in a heap ordered by due time, scheduling and
+    cancelling are O(log n) and O(1) and no thread is created per timer
+    """
+
+    def __init__(self, name: str = "TimerQueue"):
+        self.name = name
+        self._heap: List[list] = []
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)  # notified after every callback
+        self._busy = False
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = True
+
+    def schedule(self, delay: float, callback: Callable, *args) -> list:
+        """
+        Run a callback after a delay
+
+        Args:
+            delay: seconds to wait
+            callback: function to call
+            args: positional arguments for callback
+
+        Returns:
+            list: timer handle, can be passed to cancel
+        """
+        timer = [time.monotonic() + delay, next(self._seq), callback, args]
+        with self._cond:
+            heapq.heappush(self._heap, timer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return timer
+
+    @staticmethod
+    def cancel(timer: Optional[list]):
+        """ cancel a scheduled callback, cancelled timers are dropped once due """
+        if timer is not None:
+            timer[2] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def wait_idle(self, timeout: Optional[float] = None, until: Optional[float] = None) -> bool:
+        """
+        Block until the scheduled callbacks ran, including the ones they schedule
+
+        Args:
+            timeout: seconds to wait at most, None waits forever
+            until: time.monotonic() deadline, callbacks due up to then are waited for too,
+                None waits for every scheduled callback
+
+        Returns:
+            bool: False on timeout
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._idle:
+            while self._busy or any(timer[2] is not None and (until is None or timer[0] <= until)
+                                    for timer in self._heap):
+                wait = deadline - time.monotonic() if deadline is not None else None
+                if wait is not None and wait <= 0:
+                    return False
+                self._idle.wait(wait)
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                    else:
+                        wait = None
+                    self._cond.wait(wait)
+                if not self._running:
+                    return
+                _, _, callback, args = heapq.heappop(self._heap)
+                self._busy = callback is not None
+                if callback is None:
+                    self._idle.notify_all()
+                    continue  # cancelled
+            try:
+                callback(*args)
+            except Exception as e:
+                LOG.exception(f"{self.name}: timer callback failed: {e}")
+            finally:
+                with self._lock:
+                    self._busy = False
+                    self._idle.notify_all()
+
+    def shutdown(self):
+        with self._cond:
+            self._running = False
+            self._heap = []
+            self._cond.notify()
+            self._idle.notify_all()
+
+
+class UpdateThrottle:
+    """ rate limit updates per key, pending updates collapse to the latest value
+
+    the first update for a key is delivered right away, updates arriving
+    before the minimum interval elapsed replace each other and only the most
+    recent one is delivered once the interval is over
+    """
+
+    def __init__(self, callback: Callable, timers: TimerQueue,
+                 max_rate: float = 0, rates: Optional[dict] = None):
+        """
+        Args:
+            callback: called with (key, value) for every delivered update
+            timers: timer queue used to deliver deferred updates
+            max_rate: default max updates per second for each key, 0 to disable
+            rates: per key max updates per second, overriding max_rate
+        """
+        self.callback = callback
+        self.timers = timers
+        self.max_rate = max_rate
+        self.rates = rates or {}
+        self._lock = threading.Lock()
+        self._last_sent = {}
+        self._pending = {}
+        self._timers = {}
+
+    def interval(self, key) -> float:
+        rate = self.rates.get(key, self.max_rate)
+        return 1 / rate if rate else 0
+
+    def submit(self, key, value):
+        interval = self.interval(key)
+        with self._lock:
+            if key in self._timers:
+                self._pending[key] = value  # last value wins
+                return
+            last_sent = self._last_sent.get(key)
+            wait = last_sent + interval - time.monotonic() if last_sent is not None else 0
+            if wait > 0:
+                self._pending[key] = value
+                self._timers[key] = self.timers.schedule(wait, self._deliver, key)
+                return
+            self._last_sent[key] = time.monotonic()
+        self.callback(key, value)
+
+    def cancel(self, key):
+        """ drop any pending update for key """
+        with self._lock:
+            self.timers.cancel(self._timers.pop(key, None))
+            self._pending.pop(key, None)
+
+    def _deliver(self, key):
+        with self._lock:
+            self._timers.pop(key, None)
+            if key not in self._pending:
+                return
+            value = self._pending.pop(key)
+            self._last_sent[key] = time.monotonic()
+        self.callback(key, value)
+
+
+class SerialWorker:
+    """ run callbacks one at a time, in submission order, from a dedicated thread
+
+    the queue is bounded, when it is full submit() blocks the caller until
+    there is room (backpressure). Dropping is opt-in, with a block_timeout
+    the callback is dropped once that many seconds passed without room.
+    Queue depth, wait and run times are tracked and reported by stats()
+
+    callbacks submitted from the worker thread itself run right away, they
+    would otherwise wait forever for room in their own full queue
+    """
+
+    def __init__(self, name: str = "SerialWorker", max_depth: int = 100,
+                 block_timeout: Optional[float] = None):
+        """
+        Args:
+            name: thread name, used in logs
+            max_depth: max queued callbacks, 0 for an unbounded queue
+            block_timeout: seconds submit() waits for room in a full queue before dropping
+                the callback, None waits as long as needed and never drops
+        """
+        self.name = name
+        self.max_depth = max_depth
+        self.block_timeout = block_timeout
+        self._queue = queue.Queue(maxsize=max_depth)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self._submitted = self._completed = self._failed = 0
+            self._blocked = self._dropped = 0
+            self._high_watermark = 0
+            self._wait_total = self._wait_max = 0.0
+            self._run_total = self._run_max = 0.0
+
+    def submit(self, callback: Callable, *args, on_drop: Optional[Callable] = None) -> Future:
+        """
+        Queue a callback
+
+        Args:
+            callback: function to call
+            args: positional arguments for callback
+            on_drop: called with args instead if the callback is dropped from a full queue
+
+        Returns:
+            Future: resolved with the callback result once it ran
+        """
+        future = Future()
+        if threading.current_thread() is self._thread:
+            try:
+                future.set_result(callback(*args))
+            except Exception as e:
+                LOG.exception(f"{self.name}: callback failed: {e}")
+                future.set_exception(e)
+            return future
+        item = (time.monotonic(), future, callback, args)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._lock:
+                self._blocked += 1
+            try:
+                self._queue.put(item, timeout=self.block_timeout)
+            except queue.Full as e:
+                with self._lock:
+                    self._dropped += 1
+                LOG.warning(f"{self.name}: queue full, dropping {getattr(callback, '__name__', callback)}")
+                future.set_exception(e)
+                if on_drop is not None:
+                    try:
+                        on_drop(*args)
+                    except Exception as e:
+                        LOG.exception(f"{self.name}: drop callback failed: {e}")
+                return future
+        with self._lock:
+            self._submitted += 1
+            self._high_watermark = max(self._high_watermark, self._queue.qsize())
+        return future
+
+    def dispatcher(self, handler: Callable, on_drop: Optional[Callable] = None) -> Callable:
+        """ wrap a handler so every call is queued instead of run in the caller thread
+
+        on_drop is called with the handler arguments when a call is dropped from a full queue
+        """
+
+        @wraps(handler)
+        def dispatch(*args):
+            self.submit(handler, *args, on_drop=on_drop)
+
+        return dispatch
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """ block until every queued callback ran, returns False on timeout """
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks,
+                                                       timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self._completed + self._failed
+            return {"depth": self._queue.qsize(),
+                    "max_depth": self.max_depth,
+                    "high_watermark": self._high_watermark,
+                    "submitted": self._submitted,
+                    "completed": self._completed,
+                    "failed": self._failed,
+                    "blocked": self._blocked,
+                    "dropped": self._dropped,
+                    "avg_wait_ms": round(self._wait_total * 1000 / done, 3) if done else 0,
+                    "max_wait_ms": round(self._wait_max * 1000, 3),
+                    "avg_run_ms": round(self._run_total * 1000 / done, 3) if done else 0,
+                    "max_run_ms": round(self._run_max * 1000, 3)}
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            queued, future, callback, args = item
+            start = time.monotonic()
+            failed = False
+            try:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(callback(*args))
+            except Exception as e:
+                failed = True
+                LOG.exception(f"{self.name}: callback failed: {e}")
+                future.set_exception(e)
+            end = time.monotonic()
+            with self._lock:
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+                self._wait_total += start - queued
+                self._wait_max = max(self._wait_max, start - queued)
+                self._run_total += end - start
+                self._run_max = max(self._run_max, end - start)
+            self._queue.task_done()
+
+    def shutdown(self):
+        self._queue.put(None)
@@ -0,0 +1,204 @@
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+
+DEFAULT_SESSION = "default"
+
+
+def routing_context(message: Message) -> Dict[str, Any]:
+    """ context of messages sent back to the client that sent message """
+    context = {}
+    if message.context.get("session"):
+        context["session"] = message.context["session"]
+    if message.context.get("source"):
+        context["destination"] = message.context["source"]
+    return context
+
+
+class ShellSession:
+    """ state of a single shell attached to the companion
+
+    managers keep their per-shell state under a namespace, created the first
+    time the shell sends them a message
+    """
+    __slots__ = ("session_id", "context", "created", "last_seen", "_state", "_lock")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.context: Dict[str, Any] = {}  # routing context for messages sent to this shell
+        self.created = self.last_seen = time.monotonic()
+        self._state: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_default(self) -> bool:
+        return self.session_id == DEFAULT_SESSION
+
+    def get(self, namespace: str, factory: Callable[[], Any]) -> Any:
+        """ state kept by a manager for this shell, created on first use """
+        state = self._state.get(namespace)
+        if state is None:
+            with self._lock:
+                state = self._state.get(namespace)
+                if state is None:
+                    state = self._state[namespace] = factory()
+        return state
+
+    def peek(self, namespace: str) -> Any:
+        """ state kept by a manager for this shell, None if never created """
+        return self._state.get(namespace)
+
+    def touch(self, message: Optional[Message] = None):
+        self.last_seen = time.monotonic()
+        if message is not None:
+            context = routing_context(message)
+            if context:
+                self.context = context
+
+
+class SessionRegistry:
+    """ shells attached to the companion, keyed by the message session or source
+
+    sessions are created lazily from incoming messages and evicted once idle
+    for idle_timeout seconds, or when max_sessions is exceeded (least recently
+    seen first). The default session is never evicted, when disabled every
+    message belongs to it and the companion behaves as with a single shell
+
+    bus handlers are still registered once, handlers look up the session of
+    each message instead of being registered per shell
+    """
+
+    def __init__(self, enabled: bool = False, idle_timeout: float = 900, max_sessions: int = 16,
+                 key_by_source: bool = False, timers: Optional[TimerQueue] = None):
+        """
+        Args:
+            enabled: track shells separately, everything maps to the default session otherwise
+            idle_timeout: seconds without messages before a session is evicted
+            max_sessions: sessions kept besides the default one
+            key_by_source: messages without a session id are keyed by their source
+            timers: timer queue used to check for idle sessions
+        """
+        self.enabled = enabled
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.key_by_source = key_by_source
+        # an empty TimerQueue is falsy
+        self.timers = timers if timers is not None else TimerQueue("SessionRegistry.timers")
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, ShellSession] = {DEFAULT_SESSION: ShellSession(DEFAULT_SESSION)}
+        self._evict_callbacks: List[Callable[[ShellSession], None]] = []
+        self._sweep_timer = None
+        self._local = threading.local()
+
+    @property
+    def default(self) -> ShellSession:
+        return self._sessions[DEFAULT_SESSION]
+
+    @property
+    def current(self) -> ShellSession:
+        """ session of the message being handled by a bound handler in this thread """
+        return getattr(self._local, "session", None) or self.default
+
+    def bound(self, handler: Callable) -> Callable:
+        """ wrap a bus handler so code it calls can find the session of its message in current """
+
+        @wraps(handler)
+        def wrapper(message: Message):
+            previous = getattr(self._local, "session", None)
+            self._local.session = self.get(message)
+            try:
+                return handler(message)
+            finally:
+                self._local.session = previous
+
+        return wrapper
+
+    def session_id(self, message: Optional[Message]) -> str:
+        if not self.enabled or message is None:
+            return DEFAULT_SESSION
+        sess = message.context.get("session")
+        if isinstance(sess, dict) and sess.get("session_id"):
+            return str(sess["session_id"])
+        source = message.context.get("source")
+        if self.key_by_source and source and isinstance(source, str):
+            return source
+        return DEFAULT_SESSION
+
+    def get(self, message: Optional[Message] = None) -> ShellSession:
+        """ session a message belongs to, created if needed """
+        session_id = self.session_id(message)
+        session = self._sessions.get(session_id)
+        if session is None:
+            evicted = []
+            with self._lock:
+                session = self._sessions.get(session_id)
+                if session is None:
+                    session = self._sessions[session_id] = ShellSession(session_id)
+                    LOG.debug(f"Shell session created: {session_id}")
+                    if len(self._sessions) - 1 > self.max_sessions:
+                        oldest = min((s for s in self._sessions.values() if s is not session and not s.is_default),
+                                     key=lambda s: s.last_seen)
+                        evicted.append(self._sessions.pop(oldest.session_id))
+                    if self._sweep_timer is None:
+                        self._sweep_timer = self.timers.schedule(self.idle_timeout, self._sweep)
+            for old in evicted:
+                self._notify_evicted(old)
+        if self.enabled:
+            session.touch(message)
+        return session
+
+    def lookup(self, session_id: str) -> Optional[ShellSession]:
+        """ an existing session, without creating it or marking it as active """
+        return self._sessions.get(session_id)
+
+    def sessions(self) -> List[ShellSession]:
+        return list(self._sessions.values())
+
+    def on_evict(self, callback: Callable[[ShellSession], None]):
+        """ call callback(session) when a session is evicted, to release its state """
+        self._evict_callbacks.append(callback)
+
+    def evict(self, session_id: str) -> bool:
+        if session_id == DEFAULT_SESSION:
+            return False
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._notify_evicted(session)
+        return True
+
+    def _notify_evicted(self, session: ShellSession):
+        LOG.debug(f"Shell session evicted: {session.session_id}")
+        for callback in self._evict_callbacks:
+            try:
+                callback(session)
+            except Exception as e:
+                LOG.exception(f"session eviction callback failed: {e}")
+
+    def _sweep(self):
+        # a single timer checks every session, rescheduled while there are sessions to check
+        now = time.monotonic()
+        with self._lock:
+            self._sweep_timer = None
+            idle = [s for s in self._sessions.values()
+                    if not s.is_default and now - s.last_seen >= self.idle_timeout]
+            for session in idle:
+                self._sessions.pop(session.session_id)
+            remaining = [s for s in self._sessions.values() if not s.is_default]
+            if remaining:
+                delay = max(0.0, min(s.last_seen for s in remaining) + self.idle_timeout - now)
+                self._sweep_timer = self.timers.schedule(delay, self._sweep)
+        for session in idle:
+            self._notify_evicted(session)
+
+    def shutdown(self):
+        with self._lock:
+            self.timers.cancel(self._sweep_timer)
+            self._sweep_timer = None
@@ -0,0 +1,223 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.config_snapshot import ConfigSnapshot, Path
+from ovos_gui_plugin_shell_companion.instrumentation import HandlerMetrics
+from ovos_gui_plugin_shell_companion.scheduler import SerialWorker
+
+
+class SubsystemBus:
+    """ messagebus proxy handed to a companion subsystem
+
+    behaves like the wrapped bus, but keeps track of the handlers the
+    subsystem registers so they can be looked up per message type. Handlers
+    for routed events are not registered with the bus, the subsystem routes
+    those messages itself. With a worker, handlers run in the subsystem worker
+    thread instead of the bus thread, one message at a time and in the order
+    they were received
+    """
+
+    def __init__(self, bus, name: str, worker: Optional[SerialWorker] = None,
+                 metrics: Optional[HandlerMetrics] = None, routed: Iterable[str] = ()):
+        self._bus = bus
+        self.name = name
+        self.worker = worker
+        self.metrics = metrics
+        self.routed = set(routed)
+        self.handlers: Dict[str, List[Callable]] = {}
+        self._dispatchers: Dict[Tuple[str, Callable], Callable] = {}
+
+    def _dispatcher(self, event: str, handler: Callable) -> Callable:
+        if self.metrics:
+            # measured where it runs, not where it is queued
+            handler = self.metrics.wrap(event, handler)
+        if self.worker:
+            handler = self.worker.dispatcher(handler, on_drop=self._on_dropped)
+        return handler
+
+    def _on_dropped(self, message=None, *args):
+        """ a full worker queue dropped the message, answer it instead of leaving the requester waiting """
+        if isinstance(message, Message):
+            self._bus.emit(message.response({"error": f"{self.name} is busy, {message.msg_type} was dropped"}))
+
+    def on(self, event: str, handler: Callable):
+        dispatch = self._dispatcher(event, handler)
+        self._dispatchers[(event, handler)] = dispatch
+        self.handlers.setdefault(event, []).append(dispatch)
+        if event not in self.routed:
+            self._bus.on(event, dispatch)
+
+    def once(self, event: str, handler: Callable):
+        self._bus.once(event, self._dispatcher(event, handler))
+
+    def remove(self, event: str, handler: Callable):
+        dispatch = self._dispatchers.pop((event, handler), handler)
+        if dispatch in self.handlers.get(event, []):
+            self.handlers[event].remove(dispatch)
+        if event not in self.routed:
+            self._bus.remove(event, dispatch)
+
+    def __getattr__(self, item):
+        return getattr(self._bus, item)
+
+
+class SubsystemConfig:
+    """ configuration snapshot proxy handed to a companion subsystem
+
+    behaves like the wrapped snapshot, but subscriber callbacks registered
+    through it run in the subsystem worker thread, queued after the messages
+    received before the configuration changed, instead of in the thread
+    refreshing the snapshot
+    """
+
+    def __init__(self, config: ConfigSnapshot, worker: Optional[SerialWorker] = None):
+        self._config = config
+        self.worker = worker
+        self._dispatchers: Dict[Tuple[Path, Callable], Callable] = {}
+
+    def subscribe(self, path: Path, callback: Callable[[Any], None]):
+        dispatch = self.worker.dispatcher(callback) if self.worker else callback
+        self._dispatchers[(path, callback)] = dispatch
+        self._config.subscribe(path, dispatch)
+
+    def unsubscribe(self, path: Path, callback: Callable[[Any], None]):
+        self._config.unsubscribe(path, self._dispatchers.pop((path, callback), callback))
+
+    def __getattr__(self, item):
+        return getattr(self._config, item)
+
+
+class LazySubsystem:
+    """ a companion subsystem that is only instantiated when first needed
+
+    a single router per message the subsystem answers is registered with the
+    bus for its whole lifetime, the first of those messages builds the real
+    manager. Messages arriving while it is being built are queued and handed
+    over in order once it is ready, so the manager is built once and every
+    message reaches its handlers exactly once
+    """
+
+    def __init__(self, name: str, bus, factory: Callable[[SubsystemBus], Any],
+                 events: List[str], enabled: bool = True, lazy: bool = True,
+                 worker_factory: Optional[Callable[[], SerialWorker]] = None,
+                 metrics: Optional[HandlerMetrics] = None):
+        """
+        Args:
+            name: subsystem name, used in logs and config
+            bus: messagebus client
+            factory: builds the subsystem manager given a bus
+            events: messages that require the subsystem
+            enabled: if False the subsystem is never instantiated
+            lazy: if False the subsystem is instantiated right away
+            worker_factory: creates the worker running the subsystem handlers once loaded,
+                if None they run in the bus thread
+            metrics: instruments the subsystem handlers
+        """
+        self.name = name
+        self.worker: Optional[SerialWorker] = None
+        self.worker_factory = worker_factory
+        self.metrics = metrics
+        self.bus = bus
+        self.factory = factory
+        self.events = events
+        self.enabled = enabled
+        self.startup_time: Optional[float] = None
+        self._instance = None
+        self._subsystem_bus: Optional[SubsystemBus] = None
+        self._cond = threading.Condition()
+        self._loading = False
+        self._loader: Optional[int] = None  # thread building the subsystem
+        self._building = None
+        self._pending: List[Message] = []
+        if not enabled:
+            LOG.info(f"Shell companion: {name} disabled")
+            return
+        for event in self.events:
+            self.bus.on(event, self._router())
+        if not lazy:
+            self.get()
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> Optional[Any]:
+        """ the subsystem manager, instantiated if needed. None if disabled """
+        if not self.enabled:
+            return None
+        if self._instance is None:
+            with self._cond:
+                if self._loader == threading.get_ident():
+                    return self._building  # asked for by the subsystem while it is built
+                while self._loading:
+                    self._cond.wait()
+                loader = self._instance is None
+                if loader:
+                    self._start_loading()
+            if loader:
+                self._load()
+        return self._instance
+
+    def _router(self) -> Callable:
+        def route(message: Message):
+            if self._instance is None:
+                with self._cond:
+                    queued = self._instance is None
+                    if queued:
+                        self._pending.append(message)
+                        loader = not self._loading
+                        if loader:
+                            self._start_loading()
+                if queued:
+                    if loader:
+                        self._load()
+                    return  # handed over by the thread building the subsystem
+            self._dispatch(message)
+
+        # handlers are instrumented in the subsystem bus, where they run
+        route.__instrumented__ = True
+        return route
+
+    def _start_loading(self):
+        self._loading = True
+        self._loader = threading.get_ident()
+
+    def _load(self):
+        """ build the subsystem, then hand over the messages queued meanwhile """
+        start = time.monotonic()
+        try:
+            if self.worker_factory and self.worker is None:
+                self.worker = self.worker_factory()
+            self._subsystem_bus = SubsystemBus(self.bus, self.name, worker=self.worker,
+                                               metrics=self.metrics, routed=self.events)
+            self._building = self.factory(self._subsystem_bus)
+            self.startup_time = time.monotonic() - start
+            LOG.info(f"Shell companion: {self.name} started in {self.startup_time * 1000:.1f} ms")
+            while True:
+                with self._cond:
+                    pending, self._pending = self._pending, []
+                    if not pending:
+                        self._instance = self._building
+                        break
+                for message in pending:
+                    self._dispatch(message)
+        finally:
+            with self._cond:
+                if self._instance is None:
+                    self._pending = []  # failed to build, retried by the next message
+                self._building = None
+                self._loading = False
+                self._loader = None
+                self._cond.notify_all()
+
+    def _dispatch(self, message: Message):
+        for handler in list(self._subsystem_bus.handlers.get(message.msg_type, [])):
+            handler(message)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """ block until every queued handler ran, returns False on timeout """
+        return self.worker.wait_idle(timeout) if self.worker else True
@@ -0,0 +1,154 @@
+import glob
+import time
+from typing import Callable, List, Optional, Tuple
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+
+
+def read_cpu_times() -> Optional[Tuple[int, int]]:
+    """ (idle, total) jiffies from /proc/stat """
+    try:
+        with open("/proc/stat") as f:
+            fields = [int(v) for v in f.readline().split()[1:]]
+        return fields[3] + fields[4], sum(fields)  # idle + iowait
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def read_load_average() -> Optional[str]:
+    try:
+        with open("/proc/loadavg") as f:
+            return " ".join(f.read().split()[:3])
+    except OSError:
+        return None
+
+
+def read_memory() -> Optional[str]:
+    try:
+        meminfo = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])  # kB
+        total, available = meminfo["MemTotal"], meminfo["MemAvailable"]
+    except (OSError, ValueError, KeyError):
+        return None
+    used = total - available
+    return f"{used // 1024} / {total // 1024} MB ({used * 100 // total}%)"
+
+
+def read_temperature() -> Optional[str]:
+    temps = []
+    for path in glob.glob("/sys/class/thermal/thermal_zone*/temp"):
+        try:
+            with open(path) as f:
+                temps.append(int(f.read().strip()) / 1000)
+        except (OSError, ValueError):
+            continue
+    if not temps:
+        return None
+    return f"{max(temps):.1f} °C"
+
+
+def read_uptime() -> Optional[str]:
+    try:
+        with open("/proc/uptime") as f:
+            seconds = int(float(f.read().split()[0]))
+    except (OSError, ValueError, IndexError):
+        return None
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    return f"{days}d {hours}h {seconds // 60}m"
+
+
+class SystemInfoSampler:
+    """ live system metrics for the about page
+
+    metrics are read from /proc and /sys, and the messagebus round trip time
+    is measured with a ping message. Sampling only happens between start()
+    and stop(), ie. while the about page is visible
+    """
+
+    def __init__(self, bus, timers: TimerQueue,
+                 callback: Callable[[List[dict]], None],
+                 interval: float = 2, max_duration: float = 600):
+        """
+        Args:
+            bus: messagebus used to measure latency
+            timers: timer queue running the sampling
+            callback: called with the live about page entries after every sample
+            interval: seconds between samples
+            max_duration: stop sampling after this many seconds, in case the page close was missed
+        """
+        self.bus = bus
+        self.timers = timers
+        self.callback = callback
+        self.interval = max(interval, 0.5)
+        self.max_duration = max_duration
+        self._generation = 0
+        self._started = 0
+        self._timer = None
+        self._cpu_times = None
+        self._bus_latency = None
+        self.bus.on("ovos.shell.companion.ping", self.handle_ping)
+
+    @property
+    def running(self) -> bool:
+        return self._timer is not None
+
+    def start(self):
+        if self.running:
+            return
+        LOG.debug("About page: starting live system info sampling")
+        self._generation += 1
+        self._started = time.monotonic()
+        self._cpu_times = read_cpu_times()
+        self._timer = self.timers.schedule(0, self._tick, self._generation)
+
+    def stop(self):
+        if not self.running:
+            return
+        LOG.debug("About page: stopping live system info sampling")
+        self._generation += 1
+        self.timers.cancel(self._timer)
+        self._timer = None
+
+    def handle_ping(self, message: Message):
+        sent = message.data.get("sent")
+        if message.data.get("sender") == id(self) and sent:
+            self._bus_latency = time.monotonic() - sent
+
+    def sample(self) -> List[dict]:
+        entries = []
+        cpu_times = read_cpu_times()
+        if cpu_times and self._cpu_times and cpu_times[1] > self._cpu_times[1]:
+            idle = cpu_times[0] - self._cpu_times[0]
+            total = cpu_times[1] - self._cpu_times[1]
+            entries.append(("CPU Usage", f"{100 * (total - idle) / total:.0f}%"))
+        self._cpu_times = cpu_times
+        entries.append(("CPU Load", read_load_average()))
+        entries.append(("Memory", read_memory()))
+        entries.append(("Temperature", read_temperature()))
+        entries.append(("Uptime", read_uptime()))
+        if self._bus_latency is not None:
+            entries.append(("Bus Latency", f"{self._bus_latency * 1000:.1f} ms"))
+        return [{"display_key": key, "display_value": value}
+                for key, value in entries if value is not None]
+
+    def _tick(self, generation: int):
+        if generation != self._generation:
+            return  # stopped or restarted meanwhile
+        if time.monotonic() - self._started > self.max_duration:
+            self.stop()
+            return
+        self.bus.emit(Message("ovos.shell.companion.ping",
+                              {"sent": time.monotonic(), "sender": id(self)}))
+        try:
+            self.callback(self.sample())
+        except Exception as e:
+            LOG.error(f"Failed to update live system info: {e}")
+        if generation == self._generation:
+            self._timer = self.timers.schedule(self.interval, self._tick, generation)
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import threading
+from os.path import exists, join
+from typing import Callable, Dict, Optional
+
+from ovos_utils.log import LOG
+
+from ovos_gui_plugin_shell_companion.scheduler import SerialWorker
+
+_NOT_IMPORTED = object()
+# PIL.Image, only imported once a thumbnail is needed, None without Pillow
+Image = _NOT_IMPORTED
+
+
+def _pil_image():
+    global Image
+    if Image is _NOT_IMPORTED:
+        try:
+            from PIL import Image as pil_image
+        except ImportError:  # thumbnails are optional
+            pil_image = None
+            LOG.info("Pillow not installed, image thumbnails disabled")
+        Image = pil_image
+    return Image
+
+
+class ThumbnailCache:
+    """ downscaled copies of local images, generated once and kept on disk
+
+    thumbnails are keyed by image path and modification time, so a changed
+    image gets a new thumbnail. Missing thumbnails are generated in the
+    background, in batches, from a single worker thread. Requires Pillow,
+    without it get() always returns None and callers fall back to the
+    original image. Pillow and the cache directory are only touched once
+    a thumbnail is requested
+    """
+
+    def __init__(self, cache_dir: str, size: int = 384, batch_size: int = 16,
+                 on_update: Optional[Callable[[], None]] = None,
+                 worker: Optional[SerialWorker] = None):
+        """
+        Args:
+            cache_dir: directory thumbnails are written to
+            size: max width/height of a thumbnail, in pixels
+            batch_size: thumbnails generated per background job
+            on_update: called once all queued thumbnails were generated
+            worker: runs the background jobs, one is created if needed
+        """
+        self.cache_dir = cache_dir
+        self.size = size
+        self.batch_size = batch_size
+        self.on_update = on_update
+        self._worker = worker
+        self._lock = threading.Lock()
+        self._pending: Dict[str, float] = {}  # path: mtime, waiting for a batch
+        self._queued = set()  # paths in the pending dict or in a batch being generated
+        self._cached: Optional[set] = None  # file names in cache_dir, listed on first use
+        self._updated = False  # thumbnails generated since on_update was last called
+
+    @property
+    def enabled(self) -> bool:
+        return _pil_image() is not None
+
+    def _cached_names(self) -> set:
+        if self._cached is None:
+            with self._lock:
+                if self._cached is None:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    self._cached = set(os.listdir(self.cache_dir))
+        return self._cached
+
+    def key(self, path: str, mtime: float) -> str:
+        digest = hashlib.sha1(f"{path}:{mtime}:{self.size}".encode("utf-8")).hexdigest()
+        return f"{digest}.jpg"
+
+    def get(self, path: str, mtime: Optional[float] = None) -> Optional[str]:
+        """ path of the thumbnail of an image, None if not generated yet
+
+        missing thumbnails are queued for background generation
+        """
+        if not self.enabled:
+            return None
+        if mtime is None:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                return None
+        name = self.key(path, mtime)
+        if name in self._cached_names():
+            return join(self.cache_dir, name)
+        with self._lock:
+            if path not in self._queued:
+                self._queued.add(path)
+                self._pending[path] = mtime
+                if len(self._pending) == 1:
+                    self._get_worker().submit(self._generate_batch)
+        return None
+
+    def _get_worker(self) -> SerialWorker:
+        if self._worker is None:
+            self._worker = SerialWorker("ThumbnailCache.worker", max_depth=0)
+        return self._worker
+
+    def _generate_batch(self):
+        with self._lock:
+            batch = list(self._pending.items())[:self.batch_size]
+            for path, _ in batch:
+                self._pending.pop(path)
+            if self._pending:
+                self._get_worker().submit(self._generate_batch)
+        for path, mtime in batch:
+            try:
+                if self._generate(path, mtime):
+                    self._updated = True
+            except Exception as e:
+                LOG.warning(f"Failed to generate thumbnail for {path}: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(path)
+        with self._lock:
+            notify = self._updated and not self._pending
+            if notify:
+                self._updated = False
+        if notify and self.on_update:
+            self.on_update()
+
+    def _generate(self, path: str, mtime: float) -> bool:
+        name = self.key(path, mtime)
+        target = join(self.cache_dir, name)
+        if exists(target):
+            self._cached.add(name)
+            return False
+        with Image.open(path) as img:
+            img.draft("RGB", (self.size, self.size))  # decode jpegs already downscaled
+            img.thumbnail((self.size, self.size))
+            tmp = f"{target}.tmp"
+            img.convert("RGB").save(tmp, "JPEG", quality=85)
+        os.replace(tmp, target)
+        self._cached.add(name)
+        return True
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        return self._worker.wait_idle(timeout) if self._worker else True
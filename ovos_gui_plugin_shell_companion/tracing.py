@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Tuple
+from uuid import uuid4
+
+from ovos_bus_client import Message
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """ nearest rank percentile """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class NavigationSpan:
+    """ timeline of a single settings page navigation """
+    __slots__ = ("id", "name", "start", "marks")
+
+    def __init__(self, correlation_id: str, name: str):
+        self.id = correlation_id
+        self.name = name
+        self.start = time.monotonic()
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, name: str):
+        self.marks.append((name, time.monotonic() - self.start))
+
+    @property
+    def elapsed(self) -> float:
+        return self.marks[-1][1] if self.marks else 0
+
+    def as_dict(self) -> dict:
+        return {"correlation_id": self.id,
+                "trigger": self.name,
+                "marks": [{"name": name, "ms": round(t * 1000, 3)}
+                          for name, t in self.marks]}
+
+
+class NavigationTracer:
+    """ end to end latency of settings page navigation
+
+    a span starts when a GUI event (or a request the page depends on) is
+    received, reusing the correlation id of the message context if it has
+    one, and is followed on the handler thread: every message emitted
+    meanwhile (session data updates, page show) is stamped with the span
+    correlation id and recorded. Received messages are shared with every
+    other bus listener, they are never modified. When the page has to wait on a round trip the span is parked
+    until the response arrives. Durations are kept per page, the last
+    "history" navigations of each
+    """
+
+    def __init__(self, enabled: bool = True, history: int = 100, timeout: float = 30):
+        """
+        Args:
+            enabled: if False no spans are recorded
+            history: navigations kept per page for percentiles
+            timeout: seconds a span waits for a round trip response before being dropped
+        """
+        self.enabled = enabled
+        self.history = history
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pending: Dict[Hashable, NavigationSpan] = {}
+        self._durations: Dict[str, Deque[float]] = {}
+        self._last: Dict[str, NavigationSpan] = {}
+
+    @property
+    def current(self) -> Optional[NavigationSpan]:
+        return getattr(self._local, "span", None)
+
+    def begin(self, name: str, message: Message) -> Optional[NavigationSpan]:
+        """ start tracing a navigation in the current thread """
+        if not self.enabled:
+            return None
+        correlation_id = message.context.get("correlation_id") or uuid4().hex
+        span = NavigationSpan(correlation_id, name)
+        span.mark(message.msg_type)
+        self._local.span = span
+        return span
+
+    def detach(self):
+        """ stop following the span in the current thread, it is not recorded unless ended """
+        self._local.span = None
+
+    def traced(self, name: str, handler: Callable) -> Callable:
+        """ wrap a bus handler so a span is started for every message it receives """
+
+        @wraps(handler)
+        def wrapper(message: Message):
+            self.begin(name, message)
+            try:
+                return handler(message)
+            finally:
+                self.detach()
+
+        return wrapper
+
+    def stamp(self, message: Message):
+        """ tag an outgoing message with the current span correlation id """
+        span = self.current
+        if span is not None:
+            # a copy, forwarded messages share their context with the original
+            message.context = dict(message.context, correlation_id=span.id)
+            span.mark(message.msg_type)
+
+    def wait(self, key: Hashable):
+        """ park the current span until resume(key) is called by the response handler """
+        span = self.current
+        if span is None:
+            return
+        span.mark("waiting")
+        now = time.monotonic()
+        with self._lock:
+            for pending_key, pending in list(self._pending.items()):
+                if now - pending.start > self.timeout:
+                    self._pending.pop(pending_key)
+            self._pending[key] = span
+        self.detach()
+
+    def resume(self, key: Hashable, message: Optional[Message] = None):
+        """ continue a parked span in the current thread """
+        with self._lock:
+            span = self._pending.pop(key, None)
+        if span is None:
+            return
+        span.mark(message.msg_type if message else "resumed")
+        self._local.span = span
+
+    def end(self, page: str):
+        """ the page was shown, record the navigation duration """
+        span = self.current
+        if span is None:
+            return
+        span.mark("shown")
+        self.detach()
+        with self._lock:
+            durations = self._durations.setdefault(page, deque(maxlen=self.history))
+            durations.append(span.elapsed)
+            self._last[page] = span
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._last.clear()
+
+    def report(self) -> Dict[str, dict]:
+        """ p50/p95 navigation latency per page, with the last span timeline """
+        with self._lock:
+            report = {}
+            for page, durations in self._durations.items():
+                values = list(durations)
+                report[page] = {"count": len(values),
+                                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                                "max_ms": round(max(values) * 1000, 3),
+                                "last": self._last[page].as_dict()}
+            return report
+
+
+class TracingBus:
+    """ messagebus proxy stamping outgoing messages with the current navigation span """
+
+    def __init__(self, bus, tracer: NavigationTracer):
+        self._bus = bus
+        self.tracer = tracer
+
+    def emit(self, message: Message, *args, **kwargs):
+        self.tracer.stamp(message)
+        return self._bus.emit(message, *args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._bus, item)
@@ -0,0 +1,308 @@
+import os
+import threading
+from os.path import join
+from typing import Dict, List, Optional
+
+from ovos_bus_client import Message
+from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_cache_home, xdg_data_home
+
+from ovos_gui_plugin_shell_companion.helpers import update_config
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+from ovos_gui_plugin_shell_companion.thumbnails import ThumbnailCache
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+LOCAL_PROVIDER = "ovos-shell-companion"
+
+
+class WallpaperIndex:
+    """ image files found under a set of directories, refreshed incrementally
+
+    the files of every directory are listed once and only listed again when
+    the directory modification time changes, so a refresh of an unchanged
+    collection costs a stat() per directory
+    """
+
+    def __init__(self, directories: List[str], extensions=IMAGE_EXTENSIONS):
+        self.directories = [os.path.expanduser(d) for d in directories]
+        self.extensions = extensions
+        self._lock = threading.Lock()
+        self._dirs: Dict[str, float] = {}  # directory: mtime when listed
+        self._subdirs: Dict[str, List[str]] = {}
+        self._files: Dict[str, Dict[str, float]] = {}  # directory: {image path: mtime}
+        self._images: Optional[Dict[str, float]] = None
+
+    def refresh(self) -> bool:
+        """ rescan changed directories, returns True if the collection changed """
+        with self._lock:
+            seen = set()
+            changed = False
+            for directory in self.directories:
+                changed = self._scan(directory, seen) or changed
+            for directory in set(self._dirs) - seen:  # removed directories
+                self._dirs.pop(directory)
+                self._subdirs.pop(directory, None)
+                self._files.pop(directory, None)
+                changed = True
+            if changed or self._images is None:
+                self._images = {path: mtime for directory in sorted(self._files)
+                                for path, mtime in sorted(self._files[directory].items())}
+            return changed
+
+    def _scan(self, directory: str, seen: set) -> bool:
+        if directory in seen:
+            return False
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return False
+        seen.add(directory)
+        changed = False
+        if self._dirs.get(directory) != mtime:
+            files, subdirs = {}, []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(self.extensions):
+                            files[entry.path] = entry.stat().st_mtime
+            except OSError as e:
+                LOG.warning(f"Failed to list wallpapers in {directory}: {e}")
+            self._dirs[directory] = mtime
+            self._subdirs[directory] = sorted(subdirs)
+            self._files[directory] = files
+            changed = True
+        for subdir in self._subdirs.get(directory, []):
+            changed = self._scan(subdir, seen) or changed
+        return changed
+
+    @property
+    def images(self) -> Dict[str, float]:
+        """ {image path: mtime} of every indexed image, sorted by path """
+        if self._images is None:
+            self.refresh()
+        return self._images
+
+
+class WallpaperManager:
+    """ answers the ovos.wallpaper.manager.* API used by ovos-shell
+
+    wallpaper providers (eg. the homescreen skill) register their collections
+    over the bus, local directories are indexed as a built-in provider.
+    Thumbnails of local images are served alongside the collections so the
+    wallpaper picker never loads full resolution images, and auto rotation
+    runs on a single timer
+    """
+
+    def __init__(self, bus, config: Optional[dict] = None, timers: Optional[TimerQueue] = None):
+        self.bus = bus
+        self.config = config if config is not None else {}
+        self.wallpaper_config = self.config.setdefault("wallpapers", {})
+        # an empty TimerQueue is falsy
+        self.timers = timers if timers is not None else TimerQueue("WallpaperManager.timers")
+        self._lock = threading.RLock()
+        self.providers: Dict[str, dict] = {}
+        self.active_provider: Optional[str] = self.wallpaper_config.get("active_provider")
+        self.wallpaper: Optional[str] = self.wallpaper_config.get("wallpaper")
+        self._rotation_timer = None
+        self._rotation_index: Dict[str, int] = {}
+
+        directories = self.wallpaper_config.get("directories") or \
+            [join(xdg_data_home(), "wallpapers"), "/usr/share/wallpapers"]
+        self.index = WallpaperIndex(directories)
+        self.thumbnails = ThumbnailCache(join(xdg_cache_home(), "OVOS", "ShellCompanion", "thumbnails"),
+                                         size=self.wallpaper_config.get("thumbnail_size", 384),
+                                         batch_size=self.wallpaper_config.get("thumbnail_batch", 16),
+                                         on_update=self._on_thumbnails_update)
+
+        self.bus.on("ovos.wallpaper.manager.register.provider", self.handle_register_provider)
+        self.bus.on("ovos.wallpaper.manager.get.registered.providers", self.handle_get_providers)
+        self.bus.on("ovos.wallpaper.manager.get.active.provider", self.handle_get_active_provider)
+        self.bus.on("ovos.wallpaper.manager.set.active.provider", self.handle_set_active_provider)
+        self.bus.on("ovos.wallpaper.manager.get.wallpaper", self.handle_get_wallpaper)
+        self.bus.on("ovos.wallpaper.manager.set.wallpaper", self.handle_set_wallpaper)
+        self.bus.on("ovos.wallpaper.manager.swap.wallpaper", self.handle_swap_wallpaper)
+        self.bus.on("ovos.wallpaper.manager.get.provider.config", self.handle_get_provider_config)
+        self.bus.on("ovos.wallpaper.manager.set.provider.config", self.handle_set_provider_config)
+        self.bus.on("ovos.wallpaper.manager.get.auto.rotation", self.handle_get_auto_rotation)
+        self.bus.on("ovos.wallpaper.manager.enable.auto.rotation", self.handle_enable_auto_rotation)
+        self.bus.on("ovos.wallpaper.manager.disable.auto.rotation", self.handle_disable_auto_rotation)
+
+        if self.auto_rotation:
+            self._schedule_rotation()
+        # providers that started before us register again
+        self.bus.emit(Message("ovos.wallpaper.manager.loaded"))
+
+    @property
+    def auto_rotation(self) -> bool:
+        return self.wallpaper_config.get("auto_rotation", False)
+
+    @property
+    def rotation_time(self) -> float:
+        return self.wallpaper_config.get("rotation_time", 300)
+
+    # providers
+    def _local_provider(self) -> Optional[dict]:
+        self.index.refresh()
+        if not self.index.images:
+            return None
+        return {"provider_name": LOCAL_PROVIDER,
+                "provider_display_name": "Local Wallpapers",
+                "provider_configurable": False,
+                "wallpaper_collection": list(self.index.images)}
+
+    def get_providers(self) -> List[dict]:
+        """ registered providers, every collection with its thumbnails """
+        with self._lock:
+            providers = [dict(p) for p in self.providers.values()]
+        local = self._local_provider()
+        if local:
+            providers.insert(0, local)
+        local_images = self.index.images
+        for provider in providers:
+            collection = provider.get("wallpaper_collection") or []
+            thumbnails = []
+            for url in collection:
+                path = url[7:] if url.startswith("file://") else url
+                if path in local_images or os.path.isfile(path):
+                    thumbnails.append(self.thumbnails.get(path, local_images.get(path)) or url)
+                else:
+                    thumbnails.append(url)  # remote images are not cached
+            provider["wallpaper_thumbnails"] = thumbnails
+        return providers
+
+    def get_provider(self, name: Optional[str]) -> Optional[dict]:
+        if name == LOCAL_PROVIDER:
+            return self._local_provider()
+        with self._lock:
+            return self.providers.get(name)
+
+    def handle_register_provider(self, message: Message):
+        name = message.data.get("provider_name")
+        if not name:
+            return
+        provider = {"provider_name": name,
+                    "provider_display_name": message.data.get("provider_display_name", name),
+                    "provider_configurable": message.data.get("provider_configurable", False),
+                    "wallpaper_collection": message.data.get("wallpaper_collection") or [],
+                    "provider_config": message.data.get("provider_config") or {}}
+        with self._lock:
+            self.providers[name] = provider
+        LOG.info(f"Wallpaper provider registered: {name}")
+        self.bus.emit(Message("ovos.phal.wallpaper.manager.provider.registered", {"provider_name": name}))
+
+    def handle_get_providers(self, message: Message):
+        self.bus.emit(message.response({"registered_providers": self.get_providers()}))
+
+    def handle_get_active_provider(self, message: Message):
+        self.bus.emit(message.response({"active_provider": self.active_provider}))
+
+    def handle_set_active_provider(self, message: Message):
+        name = message.data.get("provider_name")
+        provider = self.get_provider(name)
+        if provider is None:
+            LOG.warning(f"Unknown wallpaper provider: {name}")
+            return
+        self.active_provider = name
+        self._persist("active_provider", name)
+        if message.data.get("provider_image"):
+            self.set_wallpaper(message.data["provider_image"])
+        else:
+            self.next_wallpaper()
+        if self.auto_rotation:
+            self._schedule_rotation()
+
+    # wallpaper
+    def set_wallpaper(self, url: str, persist: bool = True):
+        self.wallpaper = url
+        if persist:
+            self._persist("wallpaper", url)
+        self.bus.emit(Message("homescreen.wallpaper.set", {"url": url}))
+
+    def next_wallpaper(self):
+        """ move to the next wallpaper of the active provider """
+        provider = self.get_provider(self.active_provider)
+        if provider is None:
+            return
+        collection = provider.get("wallpaper_collection") or []
+        if not collection:  # dynamic provider, it answers with ovos.wallpaper.manager.set.wallpaper
+            self.bus.emit(Message(f"{self.active_provider}.get.new.wallpaper"))
+            return
+        with self._lock:
+            if self.wallpaper in collection:
+                idx = collection.index(self.wallpaper) + 1
+            else:
+                idx = self._rotation_index.get(self.active_provider, 0)
+            idx = idx % len(collection)
+            self._rotation_index[self.active_provider] = idx + 1
+        self.set_wallpaper(collection[idx], persist=False)
+
+    def handle_get_wallpaper(self, message: Message):
+        self.bus.emit(message.response({"url": self.wallpaper}))
+
+    def handle_set_wallpaper(self, message: Message):
+        url = message.data.get("url")
+        if url:
+            self.set_wallpaper(url)
+
+    def handle_swap_wallpaper(self, message: Message):
+        self.next_wallpaper()
+
+    # provider config
+    def handle_get_provider_config(self, message: Message):
+        name = message.data.get("provider_name")
+        provider = self.get_provider(name) or {}
+        self.bus.emit(message.response({"provider_name": name,
+                                        "config": provider.get("provider_config") or {}}))
+
+    def handle_set_provider_config(self, message: Message):
+        name = message.data.get("provider_name")
+        config = message.data.get("config") or {}
+        with self._lock:
+            if name not in self.providers:
+                LOG.warning(f"Unknown wallpaper provider: {name}")
+                return
+            self.providers[name]["provider_config"] = config
+        self.bus.emit(Message(f"{name}.set.wallpaper.config", {"provider_name": name, "config": config}))
+
+    # auto rotation
+    def handle_get_auto_rotation(self, message: Message):
+        self.bus.emit(message.response({"auto_rotation": self.auto_rotation,
+                                        "rotation_time": self.rotation_time}))
+
+    def handle_enable_auto_rotation(self, message: Message):
+        if message.data.get("rotation_time"):
+            self._persist("rotation_time", message.data["rotation_time"])
+        self._persist("auto_rotation", True)
+        self._schedule_rotation()
+
+    def handle_disable_auto_rotation(self, message: Message):
+        self._persist("auto_rotation", False)
+        with self._lock:
+            self.timers.cancel(self._rotation_timer)
+            self._rotation_timer = None
+
+    def _schedule_rotation(self):
+        # a single timer, rescheduled after every rotation
+        with self._lock:
+            self.timers.cancel(self._rotation_timer)
+            self._rotation_timer = self.timers.schedule(self.rotation_time, self._rotate)
+
+    def _rotate(self):
+        if not self.auto_rotation:
+            return
+        try:
+            self.next_wallpaper()
+        finally:
+            self._schedule_rotation()
+
+    def _on_thumbnails_update(self):
+        # the wallpaper picker requests the providers again
+        self.bus.emit(Message("ovos.phal.wallpaper.manager.provider.registered",
+                              {"provider_name": LOCAL_PROVIDER}))
+
+    def _persist(self, key: str, value):
+        if self.wallpaper_config.get(key) != value:
+            self.wallpaper_config[key] = value
+            update_config("wallpapers", self.wallpaper_config)
@@ -1,14 +1,76 @@
+import threading
 import time
+from os.path import join
+from typing import Dict, List, Optional, Tuple
 
 from ovos_bus_client import Message
 from ovos_utils.log import LOG
+from ovos_utils.xdg_utils import xdg_data_home
+
+from ovos_gui_plugin_shell_companion.notifications import INDEXED_FIELDS, NotificationGrouper, \
+    NotificationJournal, NotificationStore
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue, UpdateThrottle
+from ovos_gui_plugin_shell_companion.sessions import SessionRegistry, ShellSession, routing_context
+
+
+# widget type: ovos-shell widget namespace, ovos.widgets.{namespace}.display/update/remove
+DEFAULT_WIDGET_TYPES = {
+    "timer": "timer",
+    "alarm": "alarm",
+    "audio": "media"
+}
+
+
+class ShellNotifications:
+    """ notifications displayed by a single shell, the notification storage is shared """
+
+    def __init__(self, session: ShellSession):
+        self.session = session
+        self.model = NotificationStore()
+        self.grouper: Optional[NotificationGrouper] = None
+        # notification id: expiry timer, for notifications with a duration
+        self.expiry_timers = {}
+        self.expiry_sync_scheduled = False
+        # (session id, source): routing context of every client of this shell that requested
+        # storage deltas, without sessions all clients share the default shell
+        self.delta_requesters: Dict[Tuple[str, str], dict] = {}
 
 
 class WidgetManager:
-    def __init__(self, bus):
+    def __init__(self, bus, config: Optional[dict] = None, sessions: Optional[SessionRegistry] = None):
         self.bus = bus
+        config = config or {}
+        self.notification_config = config.get("notifications", {})
+        self.widget_config = config.get("widgets", {})
+        self.sessions = sessions or SessionRegistry()
+        self.sessions.on_evict(self.__notificationAPI_on_session_evicted)
+
+        # Notifications Bits
+        self.__notificationAPI_notifications_storage_model = self._build_storage_model()
+        self.__timers = TimerQueue("WidgetManager.timers")
+        # Widgets Bits
+        self.__widgetsAPI_lock = threading.Lock()
+        self.__widgetsAPI_types = dict(DEFAULT_WIDGET_TYPES)
+        self.__widgetsAPI_types.update(self.widget_config.get("types") or {})
+        self.__widgetsAPI_state = {}  # widget type: current widget data
+        self.__widgetsAPI_emitted = {}  # widget type: widget data last sent to ovos-shell
+        # timer and media skills can update very often, only forward the latest state
+        self.__widgetsAPI_throttle = UpdateThrottle(
+            self.__widgetsAPI_emit_widget_update, self.__timers,
+            max_rate=self.widget_config.get("max_update_rate", 1),
+            rates=self.widget_config.get("update_rates"))
+        # shells that never requested deltas get the full storage model, at most
+        # storage_model_max_rate times per second, a burst of changes is sent once
+        self.__notificationAPI_storage_throttle = UpdateThrottle(
+            lambda key, value: self.__notificationAPI_emit_storage_model(), self.__timers,
+            max_rate=self.notification_config.get("storage_model_max_rate", 2))
+
         self.bus.on("ovos.notification.api.request.storage.model",
                     self.notificationAPI_update_storage_model)
+        self.bus.on("ovos.notification.api.request.storage.delta",
+                    self.notificationAPI_handle_storage_delta_request)
+        self.bus.on("ovos.notification.api.storage.query",
+                    self.notificationAPI_handle_storage_query)
         self.bus.on("ovos.notification.api.set",
                     self.__notificationAPI_handle_display_notification)
         self.bus.on("ovos.notification.api.pop.clear",
@@ -30,20 +92,167 @@ class WidgetManager:
                     self.__widgetsAPI_handle_handle_widget_remove)
         self.bus.on("ovos.widgets.update",
                     self.__widgetsAPI_handle_handle_widget_update)
-
-        # Notifications Bits
-        self.__notificationAPI_notifications_model = []
-        self.__notificationAPI_notifications_storage_model = []
+        self.bus.on("ovos.widgets.get",
+                    self.__widgetsAPI_handle_get_widgets)
+        self.bus.on("ovos.widgets.register",
+                    self.__widgetsAPI_handle_register_widget_type)
 
         LOG.info("Notification & Widgets Plugin Initalized")
 
+    def _build_storage_model(self) -> NotificationStore:
+        """ notification history, bounded and persisted according to config """
+        journal = None
+        if self.notification_config.get("persist_storage", True):
+            path = self.notification_config.get("journal_path") or \
+                   join(xdg_data_home(), "OVOS", "ShellCompanion", "notifications.jsonl")
+            journal = NotificationJournal(path, self.notification_config.get("journal_compact_threshold", 500))
+        limits = dict(max_count=self.notification_config.get("storage_max_count", 500),
+                      max_bytes=self.notification_config.get("storage_max_bytes", 0),
+                      default_ttl=self.notification_config.get("storage_ttl", 0),
+                      track_changes=True,
+                      history_size=self.notification_config.get("storage_delta_history", 64))
+        try:
+            return NotificationStore(journal=journal, **limits)
+        except Exception as e:
+            LOG.error(f"Failed to restore notification storage, history will not be persisted: {e}")
+            return NotificationStore(**limits)
+
     def notificationAPI_update_storage_model(self, message=None):
         """ Update Notification Storage Model """
         LOG.info("Notification API: Update Notification Storage Model")
+        if message is not None:
+            self.__notificationAPI_shell(self.sessions.get(message))
+        # pending changes still reach the shells receiving deltas
+        self.__notificationAPI_sync_storage_model(full_model=False)
+        self.__notificationAPI_storage_throttle.cancel("storage_model")
+        self.__notificationAPI_emit_storage_model()
+
+    def __notificationAPI_emit_storage_model(self, context: Optional[dict] = None):
+        storage = self.__notificationAPI_notifications_storage_model
         self.bus.emit(Message("ovos.notification.update_storage_model", data={"notification_model": {
-            "storedmodel": self.__notificationAPI_notifications_storage_model,
-            "count": len(self.__notificationAPI_notifications_storage_model)
-        }}))
+            "storedmodel": storage.values(),
+            "count": len(storage),
+            "revision": storage.revision
+        }}, context=context))
+
+    def __notificationAPI_shell(self, session: Optional[ShellSession] = None) -> ShellNotifications:
+        """ displayed notifications of a shell, created on first use """
+        session = session or self.sessions.default
+        return session.get("notifications", lambda: self.__notificationAPI_new_shell(session))
+
+    def __notificationAPI_new_shell(self, session: ShellSession) -> ShellNotifications:
+        shell = ShellNotifications(session)
+        shell.grouper = NotificationGrouper(
+            lambda notification: self.__notificationAPI_show_notification(shell, notification), self.__timers,
+            window=self.notification_config.get("group_window", 2),
+            rate_limit=self.notification_config.get("sender_rate_limit", 0),
+            rate_period=self.notification_config.get("sender_rate_period", 60))
+        return shell
+
+    def wait_timers(self, timeout: Optional[float] = None) -> bool:
+        """ block until pending groups, expiries and throttled updates were delivered, False on timeout """
+        return self.__timers.wait_idle(timeout)
+
+    def __notificationAPI_shells(self):
+        """ notification state of every shell that talked to the companion so far """
+        return [shell for shell in (session.peek("notifications") for session in self.sessions.sessions())
+                if shell is not None]
+
+    def __notificationAPI_on_session_evicted(self, session: ShellSession):
+        """ Shell Went Away, Drop Its Pending Groups And Expiry Timers """
+        shell = session.peek("notifications")
+        if shell is None:
+            return
+        shell.grouper.shutdown()
+        for timer in list(shell.expiry_timers.values()):
+            self.__timers.cancel(timer)
+        shell.expiry_timers.clear()
+
+    def get_notifications(self, session: Optional[ShellSession] = None) -> dict:
+        """ displayed notifications and notification storage, as seen by ovos-shell """
+        shell = self.__notificationAPI_shell(session)
+        storage = self.__notificationAPI_notifications_storage_model
+        self.__notificationAPI_sync_storage_model()
+        return {"notification_counter": len(shell.model),
+                "notifications": shell.model.values(),
+                "storedmodel": storage.values(),
+                "revision": storage.revision}
+
+    @staticmethod
+    def __notificationAPI_requester(message) -> Tuple[str, str]:
+        """ the client that sent a message, told apart even when sessions are disabled """
+        session = message.context.get("session")
+        session_id = session.get("session_id") if isinstance(session, dict) else None
+        return str(session_id or ""), str(message.context.get("source") or "")
+
+    def notificationAPI_handle_storage_delta_request(self, message):
+        """ Send Storage Model Changes Since A Known Revision, Deltas From Now On """
+        shell = self.__notificationAPI_shell(self.sessions.get(message))
+        requester = self.__notificationAPI_requester(message)
+        context = routing_context(message)
+        shell.delta_requesters[requester] = context
+        # the answer below covers pending changes for the requesting client
+        self.__notificationAPI_sync_storage_model(exclude=requester)
+        revision = message.data.get("revision")
+        storage = self.__notificationAPI_notifications_storage_model
+        delta = storage.changes_since(revision) if isinstance(revision, int) else None
+        if delta is None:
+            LOG.debug(f"Notification API: revision gap ({revision}), sending full storage model")
+            self.__notificationAPI_emit_storage_model(dict(context))
+        else:
+            self.__notificationAPI_emit_storage_delta(context, delta)
+
+    def notificationAPI_handle_storage_query(self, message):
+        """ Page Through Stored Notifications Matching A Filter """
+        data = message.data
+        try:
+            limit = int(data.get("limit") or self.notification_config.get("query_limit", 50))
+            since = float(data["since"]) if data.get("since") is not None else None
+            until = float(data["until"]) if data.get("until") is not None else None
+            cursor = int(data["cursor"]) if data.get("cursor") is not None else None
+        except (TypeError, ValueError) as e:
+            self.bus.emit(message.response({"error": f"invalid query: {e}"}))
+            return
+        storage = self.__notificationAPI_notifications_storage_model
+        notifications, cursor = storage.query(filters={field: data.get(field) for field in INDEXED_FIELDS},
+                                              since=since, until=until, limit=max(limit, 1),
+                                              cursor=cursor)
+        self.bus.emit(message.response({"notifications": notifications,
+                                        "cursor": cursor,
+                                        "count": len(storage),
+                                        "revision": storage.revision}))
+
+    def __notificationAPI_sync_storage_model(self, full_model: bool = True,
+                                             exclude: Optional[Tuple[str, str]] = None):
+        """ Notify ovos-shell about storage model changes
+
+        Args:
+            full_model: also send the full storage model unless every shell requested deltas
+            exclude: requester not sent the delta, it is answered separately
+        """
+        delta = self.__notificationAPI_notifications_storage_model.commit()
+        if delta is None:
+            return
+        shells = self.__notificationAPI_shells()
+        for shell in shells:
+            for requester, context in list(shell.delta_requesters.items()):
+                if requester != exclude:
+                    self.__notificationAPI_emit_storage_delta(context, delta)
+        if full_model and self.__notificationAPI_needs_full_model(shells):
+            self.__notificationAPI_storage_throttle.submit("storage_model", None)
+
+    def __notificationAPI_needs_full_model(self, shells: List[ShellNotifications]) -> bool:
+        """ a client that only understands full models may be listening """
+        # without sessions every client shares one shell, a delta request
+        # from one of them says nothing about the others (eg. plain ovos-shell)
+        if not self.sessions.enabled or not shells:
+            return True
+        return not all(shell.delta_requesters for shell in shells)
+
+    def __notificationAPI_emit_storage_delta(self, context: dict, delta):
+        delta = dict(delta, count=len(self.__notificationAPI_notifications_storage_model))
+        self.bus.emit(Message("ovos.notification.update_storage_model.delta",
+                              data={"notification_delta": delta}, context=dict(context)))
 
     def __notificationAPI_handle_display_notification(self, message):
         """ Get Notification & Action """
@@ -58,15 +267,54 @@ class WidgetManager:
             "callback_data": message.data.get("callback_data") or dict(),
             "timestamp": time.time()
         }
-        if notification_message not in self.__notificationAPI_notifications_model:
-            self.__notificationAPI_notifications_model.append(
-                notification_message)
-            time.sleep(2)
-            self.bus.emit(Message("ovos.notification.update_counter", data={
-                "notification_counter": len(self.__notificationAPI_notifications_model)}))
+        if message.data.get("ttl"):
+            # seconds to keep this notification in storage once cleared
+            notification_message["ttl"] = message.data["ttl"]
+        # bursts from the same sender are grouped before being displayed
+        self.__notificationAPI_shell(self.sessions.get(message)).grouper.add(notification_message)
+
+    def __notificationAPI_show_notification(self, shell: ShellNotifications, notification_message):
+        """ Display A (Grouped) Notification """
+        if shell.model.add(notification_message):
+            duration = notification_message.get("duration") or 0
+            if duration > 0 and self.notification_config.get("expire_notifications", True):
+                shell.expiry_timers[notification_message["id"]] = self.__timers.schedule(
+                    duration, self.__notificationAPI_expire_notification, shell, notification_message["id"])
+            self.__notificationAPI_update_counter(shell)
             self.bus.emit(Message("ovos.notification.notification_data", data={
-                "notification": notification_message}))
-            self.bus.emit(Message("ovos.notification.show"))
+                "notification": notification_message}, context=dict(shell.session.context)))
+            self.bus.emit(Message("ovos.notification.show", context=dict(shell.session.context)))
+
+    def __notificationAPI_update_counter(self, shell: ShellNotifications):
+        self.bus.emit(Message("ovos.notification.update_counter", data={
+            "notification_counter": len(shell.model)}, context=dict(shell.session.context)))
+
+    def __notificationAPI_expire_notification(self, shell: ShellNotifications, notification_id):
+        """ Notification Duration Elapsed, Move To Storage Or Drop It """
+        shell.expiry_timers.pop(notification_id, None)
+        notification = shell.model.pop(notification_id)
+        if notification is None:
+            return
+        LOG.debug(f"Notification API: notification expired: {notification_id}")
+        if self.notification_config.get("store_expired", True):
+            self.__notificationAPI_notifications_storage_model.add(notification,
+                                                                   ttl=notification.get("ttl"))
+        if not shell.expiry_sync_scheduled:
+            # runs after any other expiry already due, a burst of expirations is synced once
+            shell.expiry_sync_scheduled = True
+            self.__timers.schedule(0, self.__notificationAPI_sync_expired, shell)
+
+    def __notificationAPI_sync_expired(self, shell: ShellNotifications):
+        shell.expiry_sync_scheduled = False
+        self.__notificationAPI_sync_storage_model()
+        self.__notificationAPI_update_counter(shell)
+
+    def __notificationAPI_remove_pending(self, shell: ShellNotifications, notification_data):
+        """ Remove A Displayed Notification And Cancel Its Expiry """
+        notification = shell.model.remove(notification_data)
+        if notification is not None:
+            self.__timers.cancel(shell.expiry_timers.pop(notification["id"], None))
+        return notification
 
     def __notificationAPI_handle_display_controlled(self, message):
         """ Get Controlled Notification """
@@ -86,22 +334,22 @@ class WidgetManager:
     def __notificationAPI_handle_clear_notification_data(self, message):
         """ Clear Pop Notification & Put In Storage """
         notification_data = message.data.get("notification", "")
-        if not notification_data or \
-                notification_data in self.__notificationAPI_notifications_storage_model:
-            LOG.debug(f"Empty or duplicate notification data, dropped: {notification_data}")
+        if not notification_data:
+            LOG.debug(f"Empty notification data, dropped: {notification_data}")
             return
-        self.__notificationAPI_notifications_storage_model.append(
-            notification_data)
-        for i in range(len(self.__notificationAPI_notifications_model)):
-            if (
-                    self.__notificationAPI_notifications_model[i]["sender"] == notification_data["sender"]
-                    and self.__notificationAPI_notifications_model[i]["text"] == notification_data["text"]
-            ):
-                del self.__notificationAPI_notifications_model[i]
-                break
-        self.notificationAPI_update_storage_model()
+        shell = self.__notificationAPI_shell(self.sessions.get(message))
+        # the popup is always dismissed, even if the notification was already stored
+        removed = self.__notificationAPI_remove_pending(shell, notification_data)
+        if notification_data in self.__notificationAPI_notifications_storage_model:
+            LOG.debug(f"Duplicate notification data, not stored again: {notification_data}")
+            if removed is None:
+                return
+        else:
+            self.__notificationAPI_notifications_storage_model.add(notification_data,
+                                                                   ttl=notification_data.get("ttl"))
+            self.__notificationAPI_sync_storage_model()
         self.bus.emit(Message("ovos.notification.notification_data",
-                              data={"notification": {}}))
+                              data={"notification": {}}, context=dict(shell.session.context)))
 
     def __notificationAPI_handle_clear_delete_notification_data(self, message):
         """ Clear Pop Notification & Delete Notification data """
@@ -112,18 +360,13 @@ class WidgetManager:
         LOG.info(
             "Notification API: Clear Pop Notification & Delete Notification data")
 
-        for i in range(len(self.__notificationAPI_notifications_model)):
-            if (
-                    self.__notificationAPI_notifications_model[i]["sender"] == notification_data["sender"]
-                    and self.__notificationAPI_notifications_model[i]["text"] == notification_data["text"]
-            ):
-                del self.__notificationAPI_notifications_model[i]
-                break
+        self.__notificationAPI_remove_pending(self.__notificationAPI_shell(self.sessions.get(message)),
+                                              notification_data)
 
     def __notificationAPI_handle_clear_notification_storage(self, _):
         """ Clear All Notification Storage Model """
-        self.__notificationAPI_notifications_storage_model = []
-        self.notificationAPI_update_storage_model()
+        self.__notificationAPI_notifications_storage_model.clear()
+        self.__notificationAPI_sync_storage_model()
 
     def __notificationAPI_handle_clear_notification_storage_item(
             self, message):
@@ -134,59 +377,104 @@ class WidgetManager:
             return
         LOG.info(
             "Notification API: Clear Single Item From Notification Storage Model")
-        for i in range(
-                len(self.__notificationAPI_notifications_storage_model)):
-            if (
-                    self.__notificationAPI_notifications_storage_model[i]["sender"]
-                    == notification_data["sender"]
-                    and self.__notificationAPI_notifications_storage_model[i]["text"]
-                    == notification_data["text"]
-            ):
-                self.__notificationAPI_notifications_storage_model.pop(i)
-
-        self.notificationAPI_update_storage_model()
+        self.__notificationAPI_notifications_storage_model.remove(notification_data)
+        self.__notificationAPI_sync_storage_model()
 
         # Skills that can display widgets on the homescreen are: Timer, Alarm and
         # Media Player
 
+    def register_widget_type(self, widget_type: str, namespace: Optional[str] = None):
+        """
+        Register a widget type that can be displayed in ovos-shell
+
+        Args:
+            widget_type: widget type used in ovos.widgets.* requests
+            namespace: ovos-shell widget namespace, defaults to widget_type
+        """
+        with self.__widgetsAPI_lock:
+            self.__widgetsAPI_types[widget_type] = namespace or widget_type
+        LOG.info(f"Widgets API: registered widget type '{widget_type}'")
+
+    def get_widgets(self) -> dict:
+        """ current data of every displayed widget, keyed by widget type """
+        with self.__widgetsAPI_lock:
+            return {widget_type: data for widget_type, data in self.__widgetsAPI_state.items()}
+
+    def __widgetsAPI_handle_register_widget_type(self, message):
+        """ Handle Widget Type Registration """
+        widget_type = message.data.get("type")
+        if widget_type:
+            self.register_widget_type(widget_type, message.data.get("namespace"))
+
+    def __widgetsAPI_handle_get_widgets(self, message):
+        """ Snapshot Of All Active Widgets, Used By ovos-shell To Rebuild Widgets On (Re)Connect """
+        self.bus.emit(message.response({"widgets": self.get_widgets(),
+                                        "namespaces": dict(self.__widgetsAPI_types)}))
+
+    def __widgetsAPI_namespace(self, widget_type) -> Optional[str]:
+        namespace = self.__widgetsAPI_types.get(widget_type)
+        if namespace is None:
+            LOG.debug(f"Widgets API: ignoring unknown widget type '{widget_type}'")
+        return namespace
+
     def __widgetsAPI_handle_handle_widget_display(self, message):
         """ Handle Widget Display """
         LOG.info("Widgets API: Handle Widget Display")
         widget_data = message.data.get("data", "")
         widget_type = message.data.get("type", "")
-        if widget_type == "timer":
-            self.bus.emit(Message("ovos.widgets.timer.display", data={
-                "widget": widget_data}))
-        elif widget_type == "alarm":
-            self.bus.emit(Message("ovos.widgets.alarm.display", data={
-                "widget": widget_data}))
-        elif widget_type == "audio":
-            self.bus.emit(Message("ovos.widgets.media.display", data={
-                "widget": widget_data}))
+        namespace = self.__widgetsAPI_namespace(widget_type)
+        if namespace is None:
+            return
+        # display carries the latest state, any throttled update is outdated
+        self.__widgetsAPI_throttle.cancel(widget_type)
+        with self.__widgetsAPI_lock:
+            self.__widgetsAPI_state[widget_type] = widget_data
+            self.__widgetsAPI_emitted[widget_type] = widget_data
+        self.bus.emit(Message(f"ovos.widgets.{namespace}.display", data={
+            "widget": widget_data}))
 
     def __widgetsAPI_handle_handle_widget_remove(self, message):
         """ Handle Widget Remove """
         LOG.info("Widgets API: Handle Widget Remove")
-        widget_data = message.data.get("data", "")
         widget_type = message.data.get("type", "")
-        if widget_type == "timer":
-            self.bus.emit(Message("ovos.widgets.timer.remove"))
-        elif widget_type == "alarm":
-            self.bus.emit(Message("ovos.widgets.alarm.remove"))
-        elif widget_type == "audio":
-            self.bus.emit(Message("ovos.widgets.media.remove"))
+        namespace = self.__widgetsAPI_namespace(widget_type)
+        if namespace is None:
+            return
+        self.__widgetsAPI_throttle.cancel(widget_type)
+        with self.__widgetsAPI_lock:
+            self.__widgetsAPI_state.pop(widget_type, None)
+            self.__widgetsAPI_emitted.pop(widget_type, None)
+        self.bus.emit(Message(f"ovos.widgets.{namespace}.remove"))
 
     def __widgetsAPI_handle_handle_widget_update(self, message):
         """ Handle Widget Update """
-        LOG.info("Widgets API: Handle Widget Update")
+        LOG.debug("Widgets API: Handle Widget Update")
         widget_data = message.data.get("data", "")
         widget_type = message.data.get("type", "")
-        if widget_type == "timer":
-            self.bus.emit(Message("ovos.widgets.timer.update", data={
-                "widget": widget_data}))
-        elif widget_type == "alarm":
-            self.bus.emit(Message("ovos.widgets.alarm.update", data={
-                "widget": widget_data}))
-        elif widget_type == "audio":
-            self.bus.emit(Message("ovos.widgets.media.update", data={
+        if self.__widgetsAPI_namespace(widget_type) is None:
+            return
+        with self.__widgetsAPI_lock:
+            self.__widgetsAPI_state[widget_type] = widget_data
+        self.__widgetsAPI_throttle.submit(widget_type, widget_data)
+
+    def __widgetsAPI_emit_widget_update(self, widget_type, widget_data):
+        """ Forward A (Throttled) Widget Update, Skipping Unchanged Fields """
+        namespace = self.__widgetsAPI_types.get(widget_type)
+        with self.__widgetsAPI_lock:
+            if widget_type not in self.__widgetsAPI_state:
+                return  # removed while the update was pending
+            previous = self.__widgetsAPI_emitted.get(widget_type)
+            self.__widgetsAPI_emitted[widget_type] = widget_data
+        if previous == widget_data:
+            return
+        # opt-in, ovos-shell replaces the widget data with the update payload,
+        # only shells merging "partial" updates can be sent the changed fields alone
+        if self.widget_config.get("partial_updates", False) and \
+                isinstance(previous, dict) and isinstance(widget_data, dict) and \
+                previous.keys() <= widget_data.keys():
+            changed = {k: v for k, v in widget_data.items() if previous.get(k) != v}
+            self.bus.emit(Message(f"ovos.widgets.{namespace}.update", data={
+                "widget": changed, "partial": True}))
+        else:
+            self.bus.emit(Message(f"ovos.widgets.{namespace}.update", data={
                 "widget": widget_data}))
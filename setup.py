@@ -69,6 +69,8 @@ setup(
     packages=['ovos_gui_plugin_shell_companion'],
     package_data={'': package_files('ovos_gui_plugin_shell_companion')},
     install_requires=required("requirements.txt"),
+    # wallpaper and homescreen preview thumbnails
+    extras_require={"thumbnails": ["Pillow"]},
     zip_safe=True,
     include_package_data=True,
     classifiers=[
@@ -0,0 +1,59 @@
+import logging
+from os.path import dirname, join
+from unittest.mock import patch
+
+import pytest
+from ovos_utils.fakebus import FakeBus
+from pytest_benchmark.utils import parse_compare_fail
+
+import replay
+
+BASELINE_STORAGE = join(dirname(__file__), "baselines")
+# a benchmark fails the comparison when its median is this much slower than the baseline
+REGRESSION_THRESHOLD = "median:20%"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False,
+                     help="also run the benchmarks marked slow")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: long running benchmark, only collected with --runslow")
+    # keep baselines with the benchmarks unless another storage is requested
+    if config.getoption("benchmark_storage") == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{BASELINE_STORAGE}"
+    if config.getoption("benchmark_compare") and not config.getoption("benchmark_compare_fail"):
+        config.option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    selected = [item for item in items if "slow" not in item.keywords]
+    if len(selected) != len(items):
+        config.hook.pytest_deselected(items=[item for item in items if "slow" in item.keywords])
+        items[:] = selected
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(tmp_path):
+    """ never touch the user data, config, cache or mycroft.conf """
+    with replay.isolated_environment(tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture
+def quiet_log():
+    """ LOG inspects the whole call stack on every call, it would dominate the notification timings """
+    log = logging.getLogger("benchmarks")
+    log.disabled = True
+    with patch("ovos_gui_plugin_shell_companion.wigets.LOG", log), \
+            patch("ovos_gui_plugin_shell_companion.notifications.LOG", log):
+        yield
+
+
+@pytest.fixture
+def bus():
+    return FakeBus()
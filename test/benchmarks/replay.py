@@ -0,0 +1,394 @@
+""" replay a recorded messagebus trace against the shell companion
+
+reproduces production load on a dev machine: every message of a JSONL trace
+is emitted, at its recorded pace or accelerated, into a fully constructed
+OVOSShellCompanionExtension running on an in-process fake bus, no OVOS
+services needed. Reports handler latency percentiles per message type,
+emitted message amplification, peak memory and thread counts
+
+trace lines are serialized bus messages plus the time they were seen,
+in seconds, eg. {"ts": 12.5, "type": "ovos.theme.get", "data": {}, "context": {}}
+
+    # record 10 minutes of a live messagebus
+    python test/benchmarks/replay.py record trace.jsonl --duration 600
+    # or generate a synthetic trace
+    python test/benchmarks/replay.py generate trace.jsonl --duration 120
+    # replay 10x faster, save the report to compare builds
+    python test/benchmarks/replay.py replay trace.jsonl --speed 10 --output report.json
+    python test/benchmarks/replay.py replay trace.jsonl --speed 10 --compare report.json
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from unittest.mock import patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion.tracing import percentile
+
+# handlers that write mycroft.conf, never touched by a replay
+CONFIG_WRITERS = ["ovos_gui_plugin_shell_companion.helpers.update_mycroft_config",
+                  "ovos_gui_plugin_shell_companion.helpers.update_config",
+                  "ovos_gui_plugin_shell_companion.brightness.update_config",
+                  "ovos_gui_plugin_shell_companion.wallpapers.update_config"]
+# GUI events sent by ovos-shell reach the bus prefixed with the companion GUI namespace
+GUI_NAMESPACE = "ovos_gui_plugin_shell_companion"
+
+
+@contextmanager
+def isolated_environment(root: Optional[str] = None):
+    """ never touch the user data, config, cache or mycroft.conf
+
+    Args:
+        root: directory holding the redirected XDG directories, a temporary one if not given
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = str(root or tmp)
+        env = {"XDG_DATA_HOME": os.path.join(root, "data"),
+               "XDG_CONFIG_HOME": os.path.join(root, "config"),
+               "XDG_CACHE_HOME": os.path.join(root, "cache")}
+        with patch.dict(os.environ, env):
+            # USER_CONFIG was resolved when ovos_config got imported, before the redirect
+            from ovos_config.locations import find_user_config
+            patches = [patch(target) for target in CONFIG_WRITERS]
+            patches.append(patch("ovos_gui_plugin_shell_companion.helpers.USER_CONFIG", find_user_config()))
+            for p in patches:
+                p.start()
+            try:
+                yield root
+            finally:
+                for p in patches:
+                    p.stop()
+
+
+class CountingBus(FakeBus):
+    """ fake bus counting every emitted message per type """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    def emit(self, message):
+        with self._lock:
+            self.counts[message.msg_type] += 1
+        super().emit(message)
+
+
+class ThreadSampler:
+    """ samples the number of live threads in the background """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ReplayThreadSampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+
+
+def load_trace(path: str) -> List[Tuple[float, Message]]:
+    """ (seconds since the first message, message) for every line of a JSONL trace """
+    trace = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            trace.append((float(entry.get("ts", 0)),
+                          Message(entry["type"], entry.get("data") or {}, entry.get("context") or {})))
+    trace.sort(key=lambda e: e[0])
+    start = trace[0][0] if trace else 0
+    return [(ts - start, message) for ts, message in trace]
+
+
+def record_trace(path: str, duration: float, host: Optional[str] = None, port: Optional[int] = None):
+    """ write every message seen on a live messagebus during duration seconds """
+    from ovos_bus_client import MessageBusClient
+
+    kwargs = {k: v for k, v in (("host", host), ("port", port)) if v}
+    client = MessageBusClient(**kwargs)
+    lock = threading.Lock()
+    start = time.monotonic()
+    count = 0
+    with open(path, "w") as f:
+
+        def on_message(serialized: str):
+            nonlocal count
+            entry = json.loads(serialized)
+            line = json.dumps({"ts": round(time.monotonic() - start, 6), "type": entry["type"],
+                               "data": entry.get("data", {}), "context": entry.get("context", {})})
+            with lock:
+                f.write(line + "\n")
+                count += 1
+
+        client.on("message", on_message)
+        client.run_in_thread()
+        client.connected_event.wait()
+        time.sleep(duration)
+        client.close()
+    print(f"recorded {count} messages to {path}")
+
+
+def generate_trace(duration: float = 120, seed: int = 0) -> Iterator[dict]:
+    """ synthetic trace mixing the load the companion sees on a busy device
+
+    interaction bursts, notification storms, widget updates, theme requests
+    and settings navigation, all randomized from seed
+    """
+    rng = random.Random(seed)
+    entries = []
+
+    def add(ts: float, msg_type: str, data: Optional[dict] = None):
+        if ts < duration:
+            entries.append({"ts": round(ts, 4), "type": msg_type, "data": data or {}, "context": {}})
+
+    t = 0.0
+    while t < duration:  # interaction bursts, user tapping and talking to the device
+        for i in range(rng.randint(5, 30)):
+            add(t + i * rng.uniform(0.05, 0.3),
+                rng.choice(["gui.page_interaction", "gui.page_interaction",
+                            "recognizer_loop:wakeword", "recognizer_loop:record_begin"]))
+        t += rng.uniform(5, 20)
+    t = rng.uniform(0, 10)
+    while t < duration:  # notification storms, a few senders flooding at once
+        senders = [f"skill-{n}" for n in range(rng.randint(1, 5))]
+        for i in range(rng.randint(20, 200)):
+            add(t + i * 0.01, "ovos.notification.api.set",
+                {"sender": rng.choice(senders), "text": f"notification {i}",
+                 "duration": rng.choice([5, 10, 30]), "style": rng.choice(["info", "warning"])})
+        add(t + 5, "ovos.notification.api.request.storage.model")
+        add(t + 6, "ovos.notification.api.storage.clear")
+        t += rng.uniform(20, 60)
+    t = rng.uniform(0, 5)
+    for widget in ("timer", "audio"):  # widget updates, every second while active
+        add(t, "ovos.widgets.display", {"type": widget, "data": {"remaining": 0}})
+        for i in range(int(duration - t)):
+            add(t + i + rng.uniform(0, 0.2), "ovos.widgets.update",
+                {"type": widget, "data": {"remaining": i}})
+    t = 0.0
+    while t < duration:  # theme requests from shells and skills
+        add(t, "ovos.theme.get")
+        t += rng.uniform(2, 15)
+    t = rng.uniform(0, 10)
+    pages = ["mycroft.device.settings", "mycroft.device.settings.homescreen",
+             "mycroft.device.settings.display", "mycroft.device.settings.customize",
+             "mycroft.device.settings.about.page", "mycroft.device.settings.developer"]
+    while t < duration:  # settings navigation
+        for i, page in enumerate(rng.sample(pages, rng.randint(1, len(pages)))):
+            add(t + i * rng.uniform(0.5, 3), f"{GUI_NAMESPACE}.{page}")
+        add(t, "ovos.phal.configuration.provider.list.groups")
+        t += rng.uniform(10, 40)
+    entries.sort(key=lambda e: e["ts"])
+    return iter(entries)
+
+
+def handler_latencies(snapshot: dict) -> Dict[str, dict]:
+    """ HandlerMetrics snapshot regrouped per message type """
+    per_type = defaultdict(dict)
+    for name, stats in snapshot.get("handlers", {}).items():
+        if not stats["calls"]:
+            continue
+        msg_type, handler = name.rsplit(":", 1)
+        per_type[msg_type][handler] = {k: stats[k] for k in
+                                       ("calls", "errors", "p50_ms", "p95_ms", "p99_ms", "max_ms", "emitted")}
+    return dict(per_type)
+
+
+def drain(ext, timeout: float) -> bool:
+    """ wait for the work left once the last message was emitted, False on timeout
+
+    subsystem workers, then notification groups, expiries and throttled
+    updates, then companion timers already due, again the workers for the
+    messages those timers emitted
+    """
+    deadline = time.monotonic() + timeout
+    remaining = lambda: max(deadline - time.monotonic(), 0)
+    drained = ext.wait_idle(remaining())
+    if ext.subsystems["widgets"].loaded:
+        drained = ext.widgets.wait_timers(remaining()) and drained
+    drained = ext.timers.wait_idle(remaining(), until=time.monotonic()) and drained
+    return ext.wait_idle(remaining()) and drained
+
+
+def replay(trace: List[Tuple[float, Message]], speed: float = 1.0, config: Optional[dict] = None,
+           trace_memory: bool = False, idle_timeout: float = 60) -> dict:
+    """ replay a trace against a new extension and report how it coped
+
+    Args:
+        trace: output of load_trace
+        speed: replay speed multiplier, 0 emits as fast as possible
+        config: extra plugin config merged over the replay defaults
+        trace_memory: measure peak python allocations with tracemalloc, slows down the replay
+        idle_timeout: seconds to wait for the workers and pending timers to drain after the last message
+    """
+    from ovos_gui_plugin_shell_companion import OVOSShellCompanionExtension
+
+    plugin_config = {"metrics": {"enabled": True}}
+    plugin_config.update(config or {})
+    threads_before = threading.active_count()
+    bus = CountingBus()
+    if trace_memory:
+        tracemalloc.start()
+    ext = OVOSShellCompanionExtension(plugin_config, bus=bus)
+    startup_emitted = sum(bus.counts.values())
+
+    inputs = Counter()
+    dispatch = defaultdict(list)
+    lag = []
+    with ThreadSampler() as threads:
+        start = time.monotonic()
+        for ts, message in trace:
+            if speed:
+                delay = start + ts / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    lag.append(-delay)
+            inputs[message.msg_type] += 1
+            sent = time.perf_counter()
+            bus.emit(message)
+            dispatch[message.msg_type].append(time.perf_counter() - sent)
+        replay_time = time.monotonic() - start
+        drained = drain(ext, idle_timeout)
+        total_time = time.monotonic() - start
+    peak_python = None
+    if trace_memory:
+        peak_python = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    received = sum(inputs.values())
+    emitted = Counter(bus.counts)
+    emitted.subtract(inputs)
+    emitted = +emitted  # drop the replayed messages
+    emitted_total = sum(emitted.values()) - startup_emitted
+    report = {
+        "messages": received,
+        "speed": speed,
+        "trace_seconds": round(trace[-1][0], 3) if trace else 0,
+        "replay_seconds": round(replay_time, 3),
+        "drain_seconds": round(total_time - replay_time, 3),
+        "drained": drained,
+        "max_lag_ms": round(max(lag) * 1000, 3) if lag else 0,
+        "amplification": round(emitted_total / received, 3) if received else 0,
+        "emitted": dict(emitted.most_common()),
+        "message_types": {
+            msg_type: {"received": count,
+                       "dispatch_p50_ms": round(percentile(dispatch[msg_type], 50) * 1000, 3),
+                       "dispatch_p95_ms": round(percentile(dispatch[msg_type], 95) * 1000, 3),
+                       "dispatch_max_ms": round(max(dispatch[msg_type]) * 1000, 3)}
+            for msg_type, count in inputs.most_common()},
+        "handlers": handler_latencies(ext.metrics.snapshot()),
+        "workers": {name: subsystem.worker.stats() for name, subsystem in ext.subsystems.items()
+                    if subsystem.worker and subsystem.loaded},
+        "memory": {"peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   "peak_traced_kb": peak_python // 1024 if peak_python is not None else None},
+        "threads": {"before": threads_before, "peak": threads.peak,
+                    "after": threading.active_count()},
+    }
+    for subsystem in ext.subsystems.values():
+        if subsystem.worker:
+            subsystem.worker.shutdown()
+    ext.timers.shutdown()
+    return report
+
+
+def print_report(report: dict, baseline: Optional[dict] = None):
+    print(f"replayed {report['messages']} messages in {report['replay_seconds']}s "
+          f"(trace {report['trace_seconds']}s, speed {report['speed'] or 'max'}), "
+          f"workers drained in {report['drain_seconds']}s"
+          f"{'' if report['drained'] else ' (TIMED OUT)'}, max lag {report['max_lag_ms']}ms")
+    print(f"amplification: {report['amplification']} emitted messages per received message")
+    memory, threads = report["memory"], report["threads"]
+    print(f"peak rss: {memory['peak_rss_kb'] / 1024:.1f} MB"
+          + (f", peak python allocations: {memory['peak_traced_kb'] / 1024:.1f} MB"
+             if memory["peak_traced_kb"] is not None else ""))
+    print(f"threads: {threads['before']} before, {threads['peak']} peak, {threads['after']} after")
+    print()
+    print(f"{'message type / handler':<72} {'calls':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    base_handlers = (baseline or {}).get("handlers", {})
+    for msg_type, handlers in sorted(report["handlers"].items()):
+        print(msg_type)
+        for handler, stats in sorted(handlers.items()):
+            line = (f"  {handler[-70:]:<70} {stats['calls']:>7} {stats['p50_ms']:>9.3f} "
+                    f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+            base = base_handlers.get(msg_type, {}).get(handler)
+            if base and base["p95_ms"]:
+                line += f"  p95 {(stats['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%"
+            print(line)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="shell companion messagebus trace replay")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser("replay", help="replay a trace and report")
+    replay_parser.add_argument("trace", help="JSONL trace")
+    replay_parser.add_argument("--speed", type=float, default=1.0,
+                               help="replay speed multiplier, 0 replays as fast as possible")
+    replay_parser.add_argument("--config", help="JSON file with plugin config")
+    replay_parser.add_argument("--tracemalloc", action="store_true",
+                               help="measure peak python allocations, slows down the replay")
+    replay_parser.add_argument("--output", help="save the report as JSON")
+    replay_parser.add_argument("--compare", help="JSON report of a previous replay to compare with")
+
+    record_parser = commands.add_parser("record", help="record a trace from a live messagebus")
+    record_parser.add_argument("trace", help="JSONL trace")
+    record_parser.add_argument("--duration", type=float, default=600, help="seconds to record")
+    record_parser.add_argument("--host")
+    record_parser.add_argument("--port", type=int)
+
+    generate_parser = commands.add_parser("generate", help="write a synthetic trace")
+    generate_parser.add_argument("trace", help="JSONL trace")
+    generate_parser.add_argument("--duration", type=float, default=120, help="trace length in seconds")
+    generate_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record_trace(args.trace, args.duration, args.host, args.port)
+    elif args.command == "generate":
+        with open(args.trace, "w") as f:
+            for entry in generate_trace(args.duration, args.seed):
+                f.write(json.dumps(entry) + "\n")
+    else:
+        config = None
+        if args.config:
+            with open(args.config) as f:
+                config = json.load(f)
+        baseline = None
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        trace = load_trace(args.trace)
+        with isolated_environment():
+            report = replay(trace, speed=args.speed, config=config, trace_memory=args.tracemalloc)
+        print_report(report, baseline)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+import pytest
+from ovos_bus_client import Message
+
+from ovos_gui_plugin_shell_companion.brightness import BrightnessManager
+from workloads import emit_all
+
+BURST_SIZES = [10, 100]
+
+
+@pytest.mark.benchmark(group="brightness")
+@pytest.mark.parametrize("burst", BURST_SIZES)
+def test_undim_interaction_burst(benchmark, bus, burst):
+    # auto dim reschedules the dim event on every interaction
+    BrightnessManager(bus, {"auto_dim": True, "auto_nightmode": False})
+    messages = [Message("gui.page_interaction") for _ in range(burst)]
+    benchmark(emit_all, bus, messages)
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+from ovos_bus_client import Message
+
+from ovos_gui_plugin_shell_companion.color_manager import ColorManager
+
+THEME = """name=Benchmark
+primaryColor=#313131
+secondaryColor=#F70D1A
+textColor=#FEFEFE
+"""
+
+
+@pytest.fixture
+def color_manager(bus, isolated_environment):
+    config_home = isolated_environment / "config"
+    os.makedirs(config_home, exist_ok=True)
+    (config_home / "OvosTheme").write_text(THEME)
+    return ColorManager(bus)
+
+
+@pytest.mark.benchmark(group="color")
+def test_provide_theme(benchmark, bus, color_manager):
+    responses = []
+    bus.on("ovos.theme.get.response", responses.append)
+    benchmark(color_manager.provide_theme, Message("ovos.theme.get"))
+    assert responses
@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+import pytest
+from ovos_bus_client import Message
+
+from ovos_gui_plugin_shell_companion.helpers import ConfigUIManager
+from workloads import synthetic_config
+
+# (groups, keys per section, nesting depth)
+CONFIG_SIZES = [(5, 10, 1), (20, 20, 2), (50, 40, 3)]
+
+
+@pytest.fixture(params=CONFIG_SIZES, ids=lambda size: "groups{}-keys{}-depth{}".format(*size))
+def config(request):
+    config = synthetic_config(*request.param)
+    with patch("ovos_gui_plugin_shell_companion.helpers.Configuration", return_value=config):
+        yield config
+
+
+@pytest.mark.benchmark(group="config_ui")
+def test_build_settings_meta(benchmark, bus, config):
+    cui = ConfigUIManager(bus)
+    benchmark(cui.build_settings_meta)
+    assert len(cui.get_group_names()) == len([v for v in config.values() if isinstance(v, dict)]) + 1
+
+
+@pytest.mark.benchmark(group="config_ui")
+def test_set_settings_in_config(benchmark, bus, config):
+    cui = ConfigUIManager(bus)
+    group = cui.settings_meta["settings"][0]
+    fields = [field for section in group["group_sections"] for field in section["section_fields"]]
+    message = Message("ovos.phal.configuration.provider.set",
+                      {"group_name": group["group_name"], "configuration": fields})
+    benchmark(cui.set_settings_in_config, message)
@@ -0,0 +1,83 @@
+import pytest
+
+from ovos_gui_plugin_shell_companion.notifications import NotificationJournal, NotificationStore
+from workloads import stored_notification
+
+STORE_SIZES = [1000, pytest.param(10000, marks=pytest.mark.slow)]
+PAGE_SIZE = 50
+ROUNDS = 5
+
+pytestmark = pytest.mark.usefixtures("quiet_log")
+
+
+def filled_store(size, **kwargs):
+    store = NotificationStore(**kwargs)
+    for i in range(size):
+        store.add(stored_notification(i))
+    return store
+
+
+def page_through(store, **query):
+    cursor, pages = None, 0
+    while True:
+        _, cursor = store.query(limit=PAGE_SIZE, cursor=cursor, **query)
+        pages += 1
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.benchmark(group="notification-store")
+@pytest.mark.parametrize("size", STORE_SIZES)
+def test_add(benchmark, size):
+    def setup():
+        return (NotificationStore(max_count=size // 2), [stored_notification(i) for i in range(size)]), {}
+
+    def add_all(store, notifications):
+        for n in notifications:
+            store.add(n)
+
+    benchmark.pedantic(add_all, setup=setup, rounds=ROUNDS)
+
+
+@pytest.mark.benchmark(group="notification-store")
+@pytest.mark.parametrize("size", STORE_SIZES)
+def test_remove_half(benchmark, size):
+    def setup():
+        store = filled_store(size)
+        return (store, [dict(n) for n in store.values()[::2]]), {}
+
+    def remove_all(store, notifications):
+        for n in notifications:
+            store.remove(n)
+
+    benchmark.pedantic(remove_all, setup=setup, rounds=ROUNDS)
+
+
+@pytest.mark.benchmark(group="notification-store")
+@pytest.mark.parametrize("size", STORE_SIZES)
+@pytest.mark.parametrize("query", [{}, {"filters": {"sender": "skill3"}}, {"since": 0.0}],
+                         ids=["all", "sender", "since"])
+def test_query_pages(benchmark, size, query):
+    store = filled_store(size)
+    benchmark(page_through, store, **query)
+
+
+@pytest.mark.benchmark(group="notification-store")
+@pytest.mark.parametrize("size", STORE_SIZES)
+def test_commit_changes(benchmark, size):
+    def setup():
+        store = filled_store(size, track_changes=True)
+        store.commit()
+        for n in store.values()[:PAGE_SIZE]:
+            store.remove(n)
+        return (store,), {}
+
+    benchmark.pedantic(NotificationStore.commit, setup=setup, rounds=ROUNDS)
+
+
+@pytest.mark.benchmark(group="notification-store")
+@pytest.mark.parametrize("size", STORE_SIZES)
+def test_restore_journal(benchmark, tmp_path, size):
+    path = str(tmp_path / "notifications.jsonl")
+    filled_store(size, journal=NotificationJournal(path))
+    benchmark.pedantic(lambda: NotificationStore(journal=NotificationJournal(path)), rounds=ROUNDS)
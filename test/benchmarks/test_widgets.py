@@ -0,0 +1,78 @@
+import pytest
+from ovos_bus_client import Message
+
+from ovos_gui_plugin_shell_companion.wigets import WidgetManager
+from workloads import StubBus, handle_all, notification
+
+# the largest stores only run with --runslow
+NOTIFICATION_COUNTS = [1000, pytest.param(2000, marks=pytest.mark.slow)]
+ROUNDS = 5
+
+pytestmark = pytest.mark.usefixtures("quiet_log")
+
+
+def build_manager(bus, **notifications_config):
+    config = {"notifications": {"group_window": 0,
+                                "storage_max_count": 10000,
+                                "persist_storage": False,
+                                **notifications_config}}
+    return WidgetManager(bus, config)
+
+
+def display(bus, count):
+    """ display count notifications, returning them as sent to ovos-shell """
+    handle_all(bus, [notification(i, sender=f"skill{i}") for i in range(count)])
+    return [message.data["notification"] for message in bus.emitted
+            if message.msg_type == "ovos.notification.notification_data"]
+
+
+def store(bus, count):
+    """ display and clear count notifications, returning them as sent to ovos-shell """
+    shown = display(bus, count)
+    handle_all(bus, [Message("ovos.notification.api.pop.clear", {"notification": data})
+                     for data in shown])
+    return shown
+
+
+@pytest.mark.benchmark(group="notifications")
+@pytest.mark.parametrize("count", NOTIFICATION_COUNTS)
+def test_add_notifications(benchmark, count):
+    def setup():
+        bus = StubBus()
+        build_manager(bus)
+        return (bus, [notification(i, sender=f"skill{i}") for i in range(count)]), {}
+
+    benchmark.pedantic(handle_all, setup=setup, rounds=ROUNDS)
+
+
+@pytest.mark.benchmark(group="notifications")
+@pytest.mark.parametrize("count", NOTIFICATION_COUNTS)
+def test_clear_notifications_to_storage(benchmark, count):
+    def setup():
+        bus = StubBus()
+        build_manager(bus)
+        return (bus, [Message("ovos.notification.api.pop.clear", {"notification": data})
+                      for data in display(bus, count)]), {}
+
+    benchmark.pedantic(handle_all, setup=setup, rounds=ROUNDS)
+
+
+@pytest.mark.benchmark(group="notifications")
+@pytest.mark.parametrize("count", NOTIFICATION_COUNTS)
+def test_clear_storage_items(benchmark, count):
+    def setup():
+        bus = StubBus()
+        build_manager(bus)
+        return (bus, [Message("ovos.notification.api.storage.clear.item", {"notification": data})
+                      for data in store(bus, count)]), {}
+
+    benchmark.pedantic(handle_all, setup=setup, rounds=ROUNDS)
+
+
+@pytest.mark.benchmark(group="notifications")
+@pytest.mark.parametrize("count", NOTIFICATION_COUNTS)
+def test_storage_model_request(benchmark, count):
+    bus = StubBus()
+    build_manager(bus)
+    store(bus, count)
+    benchmark(bus.handle, Message("ovos.notification.api.request.storage.model"))
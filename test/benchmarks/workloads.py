@@ -0,0 +1,65 @@
+""" synthetic workloads shared by the benchmarks """
+from ovos_bus_client import Message
+
+
+def synthetic_config(groups: int, keys: int, depth: int) -> dict:
+    """ mycroft.conf like dict, every group has keys fields and nested sections up to depth """
+
+    def section(level: int) -> dict:
+        data = {}
+        for i in range(keys):
+            data[f"field_{i}"] = [f"value {i}", i, i / 2, bool(i % 2)][i % 4]
+        if level < depth:
+            data[f"section_{level}"] = section(level + 1)
+        return data
+
+    config = {f"group_{g}": section(1) for g in range(groups)}
+    config.update({f"misc_{i}": i for i in range(keys)})
+    return config
+
+
+def emit_all(bus, messages):
+    for message in messages:
+        bus.emit(message)
+
+
+def notification(i: int, sender: str = "skill") -> Message:
+    return Message("ovos.notification.api.set",
+                   {"sender": sender, "text": f"notification {i}", "duration": 60})
+
+
+def stored_notification(i: int, senders: int = 10) -> dict:
+    """ notification as kept in storage, spread over a few senders and styles """
+    return {"sender": f"skill{i % senders}", "text": f"notification {i}", "style": ["info", "warning"][i % 2],
+            "type": "", "duration": 10, "timestamp": float(i)}
+
+
+class StubBus:
+    """ keeps registered handlers and emitted messages, nothing else
+
+    FakeBus serializes every message and resolves its session, which costs far more
+    than most companion handlers. Benchmarks call handle() to time the handlers alone
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+
+    def on(self, msg_type, handler):
+        self.handlers.setdefault(msg_type, []).append(handler)
+
+    def remove(self, msg_type, handler):
+        if handler in self.handlers.get(msg_type, []):
+            self.handlers[msg_type].remove(handler)
+
+    def emit(self, message):
+        self.emitted.append(message)
+
+    def handle(self, message):
+        for handler in self.handlers.get(message.msg_type, []):
+            handler(message)
+
+
+def handle_all(bus: StubBus, messages):
+    for message in messages:
+        bus.handle(message)
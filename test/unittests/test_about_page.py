@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+
+from ovos_gui_plugin_shell_companion.about import AboutPageProviders
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+
+
+class TestAboutPageProviders(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerQueue("test.timers")
+        self.changes = []
+        self.about = AboutPageProviders(self.timers, on_change=lambda: self.changes.append(1))
+
+    def tearDown(self):
+        self.timers.shutdown()
+        self.about.wait_idle(1)
+
+    def value(self, key):
+        return {e["display_key"]: e["display_value"] for e in self.about.display_list()}.get(key)
+
+    def wait_for(self, condition, timeout=2):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def test_placeholder_until_provider_answers(self):
+        release = threading.Event()
+        self.about.register("Address", lambda: release.wait(5) and "10.0.0.2", placeholder="...")
+        self.assertEqual(self.value("Address"), "...")
+        self.assertIn("Address", self.about)
+        release.set()
+        self.assertTrue(self.about.wait_idle(1))
+        self.assertEqual(self.value("Address"), "10.0.0.2")
+        self.assertEqual(len(self.changes), 1)
+
+    def test_display_order(self):
+        self.about.register("Kernel", lambda: "6.1")
+        self.about.register("Python", lambda: "3.11")
+        self.about.set("Skill", "1.0")
+        self.assertTrue(self.about.wait_idle(1))
+        self.assertEqual([e["display_key"] for e in self.about.display_list()], ["Kernel", "Python", "Skill"])
+
+    def test_ttl_refresh(self):
+        calls = []
+        self.about.register("Address", lambda: calls.append(1) or f"10.0.0.{len(calls)}", ttl=0.02)
+        self.assertTrue(self.wait_for(lambda: len(calls) >= 3))
+        self.assertTrue(self.wait_for(lambda: self.value("Address") != "10.0.0.1"))
+
+    def test_no_ttl_computed_once(self):
+        calls = []
+        self.about.register("Kernel", lambda: calls.append(1) or "6.1")
+        time.sleep(0.1)
+        self.assertTrue(self.about.wait_idle(1))
+        self.assertEqual(len(calls), 1)
+
+    def test_external_value_not_overwritten(self):
+        calls = []
+        self.about.register("Address", lambda: calls.append(1) or "provider", ttl=0.02)
+        self.assertTrue(self.wait_for(lambda: self.value("Address") == "provider"))
+        self.about.set("Address", "external")
+        time.sleep(0.1)
+        self.assertTrue(self.about.wait_idle(1))
+        self.assertEqual(self.value("Address"), "external")
+        # the provider is no longer refreshed
+        count = len(calls)
+        time.sleep(0.1)
+        self.assertEqual(len(calls), count)
+
+    def test_external_value_before_provider(self):
+        release = threading.Event()
+        self.about.register("Address", lambda: release.wait(5) and "provider")
+        self.about.set("Address", "external")
+        release.set()
+        self.assertTrue(self.about.wait_idle(1))
+        self.assertEqual(self.value("Address"), "external")
+
+    def test_failed_provider_keeps_placeholder(self):
+        self.about.register("Core", lambda: 1 / 0, placeholder="unknown")
+        self.assertTrue(self.about.wait_idle(1))
+        self.assertEqual(self.value("Core"), "unknown")
+
+    def test_blocking_provider_does_not_hold_timers(self):
+        release, fired = threading.Event(), threading.Event()
+        threads = []
+        self.about.register("Address",
+                            lambda: threads.append(threading.current_thread().name) or release.wait(5), ttl=0.01)
+        self.assertTrue(self.wait_for(lambda: threads))
+        self.timers.schedule(0, fired.set)
+        self.assertTrue(fired.wait(1))
+        release.set()
+        self.assertNotEqual(threads[0], self.timers.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
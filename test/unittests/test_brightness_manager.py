@@ -0,0 +1,52 @@
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion.brightness import BrightnessManager
+
+
+class TestAutoDim(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("ovos_gui_plugin_shell_companion.brightness.update_config")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bus = FakeBus()
+        self.emitted = []
+        self.bus.on("message", lambda m: self.emitted.append(json.loads(m)))
+        self.bright = BrightnessManager(self.bus, {"auto_dim": True, "auto_nightmode": False})
+
+    def types(self, msg_type):
+        return [m for m in self.emitted if m["type"] == msg_type]
+
+    def test_interaction_reschedules_without_status_query(self):
+        self.bus.emit(Message("gui.page_interaction"))
+        self.emitted.clear()
+        start = time.monotonic()
+        self.bus.emit(Message("gui.page_interaction"))
+        # the event status query blocks until wait_for_response times out, nobody answers it here
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.types("mycroft.scheduler.get_event"), [])
+        self.assertEqual(len(self.types("mycroft.scheduler.remove_event")), 1)
+        self.assertEqual(len(self.types("mycroft.scheduler.schedule_event")), 1)
+
+    def test_stop_cancels_scheduled_dim(self):
+        self.bus.emit(Message("gui.page_interaction"))
+        self.emitted.clear()
+        self.bright.stop_auto_dim()
+        self.assertEqual(len(self.types("mycroft.scheduler.remove_event")), 1)
+        self.assertEqual(self.bright.event_scheduler.events.events, [])
+
+    def test_cancel_without_scheduled_dim(self):
+        self.bright.stop_auto_dim()
+        self.emitted.clear()
+        self.bright.stop_auto_dim()
+        self.assertEqual(self.types("mycroft.scheduler.get_event"), [])
+        self.assertEqual(self.types("mycroft.scheduler.remove_event"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
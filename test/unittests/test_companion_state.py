@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion import STATE_VERSION, OVOSShellCompanionExtension
+
+
+class TestCompanionState(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        env = {"XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+               "XDG_DATA_HOME": os.path.join(tmp, "data")}
+        with patch.dict(os.environ, env):
+            self.bus = FakeBus()
+            self.emitted = []
+            self.bus.on("message", lambda m: self.emitted.append(json.loads(m)))
+            self.ext = OVOSShellCompanionExtension({"notifications": {"persist_storage": False,
+                                                                      "group_window": 0},
+                                                    "sessions": {"enabled": True}},
+                                                   bus=self.bus)
+        self.ext.homescreen_manager = MagicMock(homescreens=[{"id": "skill-a"}, {"id": "skill-b"}])
+        self.ext.homescreen_manager.get_active_homescreen.return_value = "skill-b"
+
+    def tearDown(self):
+        self.ext.wait_idle(5)
+
+    @staticmethod
+    def context(session_id):
+        return {"session": {"session_id": session_id}}
+
+    def get_state(self, context=None):
+        self.bus.emit(Message("ovos.shell.companion.state.get", context=context))
+        self.ext.wait_idle(5)
+        responses = [m for m in self.emitted if m["type"] == "ovos.shell.companion.state.get.response"]
+        self.assertEqual(len(responses), 1)
+        self.emitted.clear()
+        return responses[0]
+
+    def test_layout(self):
+        state = self.get_state()["data"]
+        self.assertEqual(state["version"], STATE_VERSION)
+        self.assertEqual(set(state), {"version", "theme", "display", "notifications", "widgets",
+                                      "homescreen", "configuration_groups"})
+        self.assertEqual(state["homescreen"], {"active": "skill-b",
+                                               "available": [{"id": "skill-a"}, {"id": "skill-b"}]})
+        self.assertEqual(set(state["display"]), {"brightness", "default_brightness", "auto_dim",
+                                                 "auto_nightmode", "external_plugin"})
+        self.assertEqual(set(state["notifications"]), {"notification_counter", "notifications",
+                                                       "storedmodel", "revision"})
+        self.assertIsInstance(state["configuration_groups"], list)
+        json.dumps(state)
+
+    def test_current_values(self):
+        self.bus.emit(Message("ovos.notification.api.set", {"sender": "timer", "text": "Timer done"}))
+        self.bus.emit(Message("ovos.widgets.display", {"type": "timer", "data": {"count": 3}}))
+        self.ext.wait_idle(5)
+        state = self.get_state()["data"]
+        self.assertEqual(state["notifications"]["notification_counter"], 1)
+        self.assertEqual(state["notifications"]["notifications"][0]["text"], "Timer done")
+        self.assertIn("timer", state["widgets"])
+
+    def test_state_of_requesting_shell(self):
+        self.bus.emit(Message("ovos.notification.api.set", {"sender": "timer", "text": "Timer done"},
+                              self.context("shell-a")))
+        self.ext.wait_idle(5)
+        response = self.get_state(self.context("shell-a"))
+        self.assertEqual(response["data"]["notifications"]["notification_counter"], 1)
+        self.assertEqual(response["context"]["session"]["session_id"], "shell-a")
+        self.assertEqual(self.get_state(self.context("shell-b"))["data"]["notifications"]["notification_counter"],
+                         0)
+
+
+if __name__ == "__main__":
+    unittest.main()
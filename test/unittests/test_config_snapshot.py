@@ -0,0 +1,49 @@
+import unittest
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion.config_snapshot import ConfigSnapshot
+
+
+class TestConfigSnapshot(unittest.TestCase):
+    def setUp(self):
+        # like ovos_config, the same merged dict is updated in place on reload
+        self.config = {"location": {"timezone": {"code": "Europe/Lisbon"}},
+                       "gui": {"ovos-gui-plugin-shell-companion": {"auto_dim": False}}}
+        self.bus = FakeBus()
+        self.snapshot = ConfigSnapshot(self.bus, loader=lambda: self.config, reloader=None)
+
+    def test_nested_change_notifies_subscriber(self):
+        seen = []
+        self.snapshot.subscribe("location", seen.append)
+        self.config["location"]["timezone"]["code"] = "America/Chicago"
+        self.bus.emit(Message("configuration.updated"))
+        self.assertEqual(seen, [{"timezone": {"code": "America/Chicago"}}])
+        self.assertEqual(self.snapshot.get("location.timezone.code"), "America/Chicago")
+
+    def test_unrelated_change_not_notified(self):
+        seen = []
+        self.snapshot.subscribe("gui.ovos-gui-plugin-shell-companion", seen.append)
+        self.config["location"]["timezone"]["code"] = "America/Chicago"
+        self.assertEqual(self.snapshot.refresh(), [])
+        self.config["gui"]["ovos-gui-plugin-shell-companion"]["auto_dim"] = True
+        self.assertEqual(self.snapshot.refresh(), ["gui.ovos-gui-plugin-shell-companion"])
+        self.assertEqual(seen, [{"auto_dim": True}])
+
+    def test_any_change(self):
+        seen = []
+        self.snapshot.subscribe("", seen.append)
+        self.snapshot.refresh()
+        self.assertEqual(seen, [])
+        self.config["lang"] = "pt-pt"
+        self.snapshot.refresh()
+        self.assertEqual(len(seen), 1)
+
+    def test_snapshot_is_private(self):
+        self.config["location"]["timezone"]["code"] = "America/Chicago"
+        self.assertEqual(self.snapshot.get("location.timezone.code"), "Europe/Lisbon")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion import OVOSShellCompanionExtension
+from ovos_gui_plugin_shell_companion.gui_interface import ShellGUIInterface
+
+
+class TestShellGUIInterface(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.emitted = []
+        self.bus.on("message", lambda m: self.emitted.append(json.loads(m)))
+        self.gui = ShellGUIInterface("test.skill", bus=self.bus, config={})
+        # session data is only synced once a page is shown
+        self.gui.show_page("AdditionalSettings")
+        self.emitted.clear()
+
+    def messages(self, msg_type):
+        return [m["data"] for m in self.emitted if m["type"] == msg_type]
+
+    def test_synced_on_every_change_outside_batch(self):
+        self.gui["a"] = 1
+        self.gui["b"] = 2
+        self.assertEqual(len(self.messages("gui.value.set")), 2)
+
+    def test_one_sync_per_batch(self):
+        with self.gui.batch():
+            self.gui["a"] = 1
+            self.gui["b"] = 2
+            self.gui["a"] = 3
+            self.assertEqual(self.messages("gui.value.set"), [])
+        synced = self.messages("gui.value.set")
+        self.assertEqual(len(synced), 1)
+        self.assertEqual((synced[0]["a"], synced[0]["b"]), (3, 2))
+
+    def test_page_shown_after_data_sync(self):
+        with self.gui.batch():
+            self.gui["state"] = "settings/display_settings"
+            self.gui.show_page("AdditionalSettings", override_idle=True)
+            self.gui["display_auto_dim"] = True
+        self.assertEqual([m["type"] for m in self.emitted], ["gui.value.set", "gui.page.show"])
+        self.assertTrue(self.messages("gui.value.set")[0]["display_auto_dim"])
+        self.assertEqual(self.messages("gui.page.show")[0]["page_names"], ["AdditionalSettings"])
+
+    def test_nested_batches_flushed_by_outermost(self):
+        with self.gui.batch():
+            with self.gui.batch():
+                self.gui["a"] = 1
+            self.assertEqual(self.messages("gui.value.set"), [])
+            self.gui["b"] = 2
+        self.assertEqual(len(self.messages("gui.value.set")), 1)
+
+    def test_empty_batch_sends_nothing(self):
+        with self.gui.batch():
+            pass
+        self.assertEqual(self.emitted, [])
+
+    def test_flushed_when_batch_raises(self):
+        with self.assertRaises(ValueError):
+            with self.gui.batch():
+                self.gui["a"] = 1
+                raise ValueError
+        self.assertEqual(len(self.messages("gui.value.set")), 1)
+
+
+class TestSettingsPageUpdates(unittest.TestCase):
+    def test_settings_page_single_sync(self):
+        tmp = tempfile.mkdtemp()
+        env = {"XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+               "XDG_DATA_HOME": os.path.join(tmp, "data")}
+        with patch.dict(os.environ, env):
+            bus = FakeBus()
+            ext = OVOSShellCompanionExtension({"notifications": {"persist_storage": False}}, bus=bus)
+        emitted = []
+        bus.on("message", lambda m: emitted.append(json.loads(m)))
+        bus.emit(Message(f"{ext.gui.skill_id}.mycroft.device.settings.display"))
+        ext.wait_idle(5)
+        types = [m["type"] for m in emitted if m["type"] in ("gui.value.set", "gui.page.show")]
+        self.assertEqual(types, ["gui.value.set", "gui.page.show"])
+        self.assertEqual(ext.gui["state"], "settings/display_settings")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion import OVOSShellCompanionExtension, thumbnails
+from ovos_gui_plugin_shell_companion.homescreens import HomescreenCatalog
+from ovos_gui_plugin_shell_companion.thumbnails import ThumbnailCache
+
+
+class TestHomescreenSettings(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        env = {"XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+               "XDG_DATA_HOME": os.path.join(tmp, "data")}
+        with patch.dict(os.environ, env):
+            self.bus = FakeBus()
+            self.ext = OVOSShellCompanionExtension({"notifications": {"persist_storage": False}},
+                                                   bus=self.bus)
+        self.active = "skill-a"
+        homescreens = MagicMock()
+        homescreens.homescreens = [{"id": "skill-a", "name": "Skill A"},
+                                   {"id": "skill-b", "name": "Skill B"}]
+        homescreens.get_active_homescreen.side_effect = lambda: self.active
+        homescreens.set_active_homescreen.side_effect = self.set_active
+        self.ext.homescreen_manager = homescreens
+
+    def set_active(self, homescreen_id):
+        self.active = homescreen_id
+
+    def open_page(self):
+        self.bus.emit(Message(f"{self.ext.gui.skill_id}.mycroft.device.settings.homescreen"))
+        return self.ext.gui["selectedScreen"]
+
+    def test_selection_shown_when_reopened(self):
+        self.assertEqual(self.open_page(), "skill-a")
+        self.bus.emit(Message(f"{self.ext.gui.skill_id}.mycroft.device.set.idle", {"selected": "skill-b"}))
+        self.ext.homescreen_manager.set_active_homescreen.assert_called_once_with("skill-b")
+        self.assertEqual(self.open_page(), "skill-b")
+
+    def test_homescreen_id_key(self):
+        self.open_page()
+        self.ext.handle_set_homescreen(Message("mycroft.device.set.idle", {"homescreen_id": "skill-b"}))
+        self.assertEqual(self.open_page(), "skill-b")
+
+
+class TestLazySettingsPages(unittest.TestCase):
+    def test_built_on_first_use(self):
+        tmp = tempfile.mkdtemp()
+        env = {"XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+               "XDG_DATA_HOME": os.path.join(tmp, "data")}
+        with patch.dict(os.environ, env):
+            bus = FakeBus()
+            ext = OVOSShellCompanionExtension({"notifications": {"persist_storage": False}}, bus=bus)
+            # source changes before the caches exist are no-ops
+            bus.emit(Message("homescreen.manager.add", {"id": "skill-a"}))
+            bus.emit(Message("gui.page_interaction"))
+            self.assertIsNone(ext._homescreen_catalog)
+            self.assertIsNone(ext._page_cache)
+            self.assertEqual(len(ext.timers), 0)
+            ext.homescreen_manager = MagicMock(homescreens=[{"id": "skill-a"}])
+            bus.emit(Message(f"{ext.gui.skill_id}.mycroft.device.settings.homescreen"))
+        self.assertIsNotNone(ext._homescreen_catalog)
+        self.assertIsNotNone(ext._page_cache)
+        self.assertEqual(ext.gui["idleScreenList"]["screenBlob"],
+                         [{"id": "skill-a", "name": "skill-a", "preview": None}])
+        self.assertFalse(os.path.exists(os.path.join(tmp, "cache", "OVOS", "ShellCompanion", "thumbnails")))
+
+
+class TestHomescreenCatalogWithoutPillow(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.image = os.path.join(self.tmp, "preview.png")
+        with open(self.image, "wb") as f:
+            f.write(b"not decoded without Pillow")
+        patcher = patch.object(thumbnails, "Image", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ThumbnailCache(os.path.join(self.tmp, "thumbnails"))
+        self.homescreens = [{"id": "skill-a", "name": "Skill A", "preview": f"file://{self.image}"},
+                            {"id": "skill-b", "icon": "https://example.com/b.png"},
+                            {"id": "skill-c", "preview": "data:image/png;base64,AAAA"},
+                            {"id": "skill-d"}]
+        self.catalog = HomescreenCatalog(lambda: self.homescreens, self.cache)
+
+    def test_original_images_referenced(self):
+        self.assertFalse(self.cache.enabled)
+        self.assertEqual(self.catalog.entries(),
+                         [{"id": "skill-a", "name": "Skill A", "preview": self.image},
+                          {"id": "skill-b", "name": "skill-b", "preview": "https://example.com/b.png"},
+                          {"id": "skill-c", "name": "skill-c", "preview": None},
+                          {"id": "skill-d", "name": "skill-d", "preview": None}])
+
+    def test_no_thumbnails_generated(self):
+        self.catalog.entries()
+        self.assertIsNone(self.cache.get(self.image))
+        self.assertTrue(self.cache.wait_idle(1))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, "thumbnails")))
+
+
+if __name__ == "__main__":
+    unittest.main()
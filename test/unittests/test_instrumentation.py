@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion import OVOSShellCompanionExtension
+from ovos_gui_plugin_shell_companion.instrumentation import HandlerMetrics, InstrumentedBus
+
+
+class TestHandlerMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = HandlerMetrics()
+        self.bus = InstrumentedBus(FakeBus(), self.metrics)
+
+    def stats(self, event, handler):
+        return self.metrics.snapshot()["handlers"][HandlerMetrics.handler_name(event, handler)]
+
+    def test_calls_and_latencies(self):
+        def handler(message):
+            time.sleep(float(message.data["delay"]))
+
+        self.bus.on("test.event", handler)
+        for delay in (0, 0, 0.02):
+            self.bus.emit(Message("test.event", {"delay": delay}))
+        stats = self.stats("test.event", handler)
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["errors"], 0)
+        self.assertGreaterEqual(stats["max_ms"], 20)
+        self.assertGreaterEqual(stats["total_ms"], stats["max_ms"])
+        self.assertAlmostEqual(stats["avg_ms"], stats["total_ms"] / 3, places=2)
+        self.assertLess(stats["p50_ms"], 20)
+        self.assertEqual(stats["p95_ms"], stats["max_ms"])
+        self.assertEqual(sum(stats["histogram"].values()), 3)
+        # the slow call is counted above 10ms
+        self.assertLessEqual(sum(stats["histogram"][f"<={bound}ms"] for bound in (1, 2, 5, 10)), 2)
+
+    def test_errors(self):
+        def handler(message):
+            raise ValueError("broken")
+
+        wrapped = self.metrics.wrap("test.event", handler)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                wrapped(Message("test.event"))
+        stats = self.stats("test.event", handler)
+        self.assertEqual((stats["calls"], stats["errors"]), (2, 2))
+        self.assertEqual(stats["last_error"], "ValueError: broken")
+
+    def test_emitted_messages_attributed(self):
+        def outer(message):
+            self.bus.emit(Message("test.inner"))
+            self.bus.emit(Message("test.other"))
+
+        def inner(message):
+            self.bus.emit(Message("test.other"))
+
+        self.bus.on("test.outer", outer)
+        self.bus.on("test.inner", inner)
+        self.bus.emit(Message("test.outer"))
+        # nested handlers count their own messages only
+        self.assertEqual(self.stats("test.outer", outer)["emitted"], 2)
+        self.assertEqual(self.stats("test.inner", inner)["emitted"], 1)
+
+    def test_removed_handler(self):
+        calls = []
+        self.bus.on("test.event", calls.append)
+        self.bus.remove("test.event", calls.append)
+        self.bus.emit(Message("test.event"))
+        self.assertEqual(calls, [])
+
+    def test_not_wrapped_twice(self):
+        wrapped = self.metrics.wrap("test.event", lambda m: None)
+        self.bus.on("test.event", wrapped)
+        self.bus.emit(Message("test.event"))
+        self.assertEqual(len(self.metrics.snapshot()["handlers"]), 1)
+
+    def test_reset(self):
+        handler = self.metrics.wrap("test.event", lambda m: None)
+        handler(Message("test.event"))
+        self.metrics.reset()
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(list(snapshot["handlers"].values())[0]["calls"], 0)
+        json.dumps(snapshot)
+
+
+class TestCompanionMetrics(unittest.TestCase):
+    def extension(self, config):
+        tmp = tempfile.mkdtemp()
+        env = {"XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+               "XDG_DATA_HOME": os.path.join(tmp, "data")}
+        bus = FakeBus()
+        with patch.dict(os.environ, env):
+            ext = OVOSShellCompanionExtension(dict(config, notifications={"persist_storage": False}), bus=bus)
+        responses = []
+        bus.on("ovos.shell.companion.metrics.response", lambda m: responses.append(m.data))
+        return ext, bus, responses
+
+    def test_disabled_by_default(self):
+        ext, bus, responses = self.extension({})
+        self.assertIsNone(ext.metrics)
+        bus.emit(Message("ovos.shell.companion.metrics"))
+        self.assertFalse(responses[0]["enabled"])
+        self.assertNotIn("handlers", responses[0])
+        self.assertIn("workers", responses[0])
+
+    def test_handlers_reported(self):
+        ext, bus, responses = self.extension({"metrics": {"enabled": True}})
+        bus.emit(Message(f"{ext.gui.skill_id}.mycroft.device.settings"))
+        ext.wait_idle(5)
+        bus.emit(Message("ovos.shell.companion.metrics", {"reset": True}))
+        handlers = responses[0]["handlers"]
+        settings = [stats for name, stats in handlers.items() if "handle_device_settings" in name]
+        self.assertEqual(sum(stats["calls"] for stats in settings), 1)
+        self.assertGreater(sum(stats["emitted"] for stats in settings), 0)
+        bus.emit(Message("ovos.shell.companion.metrics"))
+        self.assertTrue(all(stats["calls"] == 0 for name, stats in responses[1]["handlers"].items()
+                            if "handle_device_settings" in name))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import time
+import unittest
+
+from ovos_gui_plugin_shell_companion.notifications import NotificationGrouper
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+
+
+def notification(n, sender="skill"):
+    return {"sender": sender, "text": f"notification {n}"}
+
+
+class TestNotificationGrouper(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerQueue("test.timers")
+        self.released = []
+
+    def tearDown(self):
+        self.timers.shutdown()
+
+    def grouper(self, **kwargs):
+        return NotificationGrouper(self.released.append, self.timers, **kwargs)
+
+    def test_burst_merged(self):
+        grouper = self.grouper(window=0.05)
+        for n in range(3):
+            grouper.add(notification(n))
+        self.assertEqual(self.released, [])
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.released, [{"sender": "skill", "text": "notification 2", "count": 3}])
+
+    def test_single_notification_unchanged(self):
+        grouper = self.grouper(window=0.01)
+        grouper.add(notification(1))
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.released, [notification(1)])
+
+    def test_senders_grouped_separately(self):
+        grouper = self.grouper(window=0.05)
+        for n in range(4):
+            grouper.add(notification(n, sender=f"skill{n % 2}"))
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(sorted((n["sender"], n["text"], n["count"]) for n in self.released),
+                         [("skill0", "notification 2", 2), ("skill1", "notification 3", 2)])
+
+    def test_new_window_after_release(self):
+        grouper = self.grouper(window=0.01)
+        grouper.add(notification(1))
+        self.assertTrue(self.timers.wait_idle(1))
+        grouper.add(notification(2))
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual([n["text"] for n in self.released], ["notification 1", "notification 2"])
+        self.assertNotIn("count", self.released[1])
+
+    def test_no_window_released_immediately(self):
+        grouper = self.grouper(window=0)
+        grouper.add(notification(1))
+        self.assertEqual(self.released, [notification(1)])
+        self.assertEqual(len(self.timers), 0)
+
+    def test_rate_limited_sender_held_back(self):
+        grouper = self.grouper(window=0, rate_limit=1, rate_period=0.2)
+        grouper.add(notification(1))
+        self.assertEqual(len(self.released), 1)
+        # out of tokens, held and grouped until one is available again
+        start = time.monotonic()
+        grouper.add(notification(2))
+        grouper.add(notification(3))
+        grouper.add(notification(4, sender="other"))
+        self.assertEqual([n["text"] for n in self.released], ["notification 1", "notification 4"])
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(self.released[-1], {"sender": "skill", "text": "notification 3", "count": 2})
+
+    def test_shutdown_drops_pending_groups(self):
+        grouper = self.grouper(window=0.05)
+        grouper.add(notification(1))
+        grouper.shutdown()
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.released, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,315 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from ovos_gui_plugin_shell_companion.notifications import NotificationJournal, NotificationStore
+
+
+def notification(n, sender="skill", **fields):
+    return dict({"sender": sender, "text": f"notification {n}", "timestamp": float(n)}, **fields)
+
+
+class TestNotificationStore(unittest.TestCase):
+    def setUp(self):
+        self.store = NotificationStore()
+
+    def test_add_assigns_id(self):
+        n = notification(1)
+        self.assertTrue(self.store.add(n))
+        self.assertTrue(n["id"])
+        self.assertIs(self.store.get(n["id"]), n)
+        self.assertEqual(len(self.store), 1)
+
+    def test_find_by_id_or_content(self):
+        n = notification(1)
+        self.store.add(n)
+        self.assertEqual(self.store.find({"id": n["id"]}), n["id"])
+        # sent back by ovos-shell without an id
+        self.assertEqual(self.store.find({"sender": "skill", "text": "notification 1", "timestamp": 1.0}), n["id"])
+        self.assertIsNone(self.store.find({"sender": "skill", "text": "notification 1", "timestamp": 2.0}))
+        self.assertIn(dict(n), self.store)
+
+    def test_duplicate_not_added(self):
+        n = notification(1)
+        self.assertTrue(self.store.add(n))
+        self.assertFalse(self.store.add(dict(n)))
+        self.assertFalse(self.store.add({k: v for k, v in n.items() if k != "id"}))
+        self.assertEqual(len(self.store), 1)
+
+    def test_repeated_text_kept(self):
+        # the same text sent at different times is a different notification
+        self.assertTrue(self.store.add(notification(1, text="Timer done")))
+        self.assertTrue(self.store.add(notification(2, text="Timer done")))
+        self.assertEqual(len(self.store), 2)
+
+    def test_remove(self):
+        first, second = notification(1), notification(2)
+        self.store.add(first)
+        self.store.add(second)
+        self.assertIs(self.store.remove({"sender": "skill", "text": "notification 1", "timestamp": 1.0}), first)
+        self.assertIsNone(self.store.remove(first))
+        self.assertEqual(self.store.values(), [second])
+        # removed content can be stored again
+        self.assertTrue(self.store.add(notification(1)))
+
+    def test_max_count_evicts_oldest(self):
+        store = NotificationStore(max_count=2)
+        for n in range(3):
+            store.add(notification(n))
+        self.assertEqual([n["text"] for n in store.values()], ["notification 1", "notification 2"])
+
+    def test_ttl_expires(self):
+        n = notification(1)
+        self.store.add(n, ttl=10)
+        self.assertEqual(self.store.expire(now=time.time() + 20), [n])
+        self.assertEqual(len(self.store), 0)
+
+
+class TestNotificationQuery(unittest.TestCase):
+    def setUp(self):
+        self.store = NotificationStore()
+
+    def texts(self, notifications):
+        return [n["text"] for n in notifications]
+
+    def test_newest_first(self):
+        for n in range(5):
+            self.store.add(notification(n))
+        page, cursor = self.store.query()
+        self.assertEqual(self.texts(page), [f"notification {n}" for n in range(4, -1, -1)])
+        self.assertIsNone(cursor)
+
+    def test_filters(self):
+        for n in range(12):
+            self.store.add(notification(n, sender=f"skill{n % 3}", style="warning" if n % 2 else "info"))
+        page, _ = self.store.query({"sender": "skill0", "style": "info"})
+        self.assertEqual(self.texts(page), ["notification 6", "notification 0"])
+        page, _ = self.store.query({"sender": ["skill1", "skill2"], "type": None}, limit=3)
+        self.assertEqual(self.texts(page), ["notification 11", "notification 10", "notification 8"])
+        self.assertEqual(self.store.query({"sender": "unknown"}), ([], None))
+
+    def test_time_range(self):
+        for n in range(10):
+            self.store.add(notification(n))
+        page, _ = self.store.query(since=3, until=5)
+        self.assertEqual(self.texts(page), ["notification 5", "notification 4", "notification 3"])
+        page, _ = self.store.query({"sender": "skill"}, since=8)
+        self.assertEqual(self.texts(page), ["notification 9", "notification 8"])
+
+    def test_time_range_ordered_by_timestamp(self):
+        for n in (3, 1, 4, 0, 2):
+            self.store.add(notification(n))
+        pages, cursor = [], None
+        while True:
+            page, cursor = self.store.query(since=1, limit=2, cursor=cursor)
+            pages.append(self.texts(page))
+            if cursor is None:
+                break
+        self.assertEqual(pages, [["notification 4", "notification 3"], ["notification 2", "notification 1"]])
+
+    def test_time_range_cursor_of_removed_notification(self):
+        stored = [notification(n) for n in range(6)]
+        for n in stored:
+            self.store.add(n)
+        page, cursor = self.store.query(since=0, limit=2)
+        self.assertEqual(self.texts(page), ["notification 5", "notification 4"])
+        self.store.remove(stored[4])
+        page, _ = self.store.query(since=0, limit=2, cursor=cursor)
+        self.assertEqual(self.texts(page), ["notification 3", "notification 2"])
+        # tombstones dropped, resumes after the next older notification
+        self.store._rebuild_indexes()
+        page, _ = self.store.query(since=0, limit=2, cursor=cursor)
+        self.assertEqual(self.texts(page), ["notification 3", "notification 2"])
+
+    def test_cursor_pages(self):
+        for n in range(7):
+            self.store.add(notification(n, sender=f"skill{n % 2}"))
+        pages, cursor = [], None
+        while True:
+            page, cursor = self.store.query({"sender": "skill0"}, limit=2, cursor=cursor)
+            pages.append(self.texts(page))
+            if cursor is None:
+                break
+        self.assertEqual(pages, [["notification 6", "notification 4"], ["notification 2", "notification 0"]])
+
+    def test_cursor_stable_across_changes(self):
+        stored = [notification(n) for n in range(6)]
+        for n in stored:
+            self.store.add(n)
+        page, cursor = self.store.query(limit=2)
+        self.store.add(notification(6))  # newer, not part of the following pages
+        self.store.remove(stored[3])
+        page, cursor = self.store.query(limit=2, cursor=cursor)
+        self.assertEqual(self.texts(page), ["notification 2", "notification 1"])
+
+    def test_removed_notifications_skipped(self):
+        stored = [notification(n, sender=f"skill{n % 2}") for n in range(10)]
+        for n in stored:
+            self.store.add(n)
+        for n in stored[::3]:
+            self.store.remove(n)
+        page, cursor = self.store.query({"sender": "skill0"})
+        self.assertEqual(self.texts(page), ["notification 8", "notification 4", "notification 2"])
+        self.assertIsNone(cursor)
+
+    def test_updated_notification_moves_bucket(self):
+        n = notification(1, sender="a")
+        self.store.add(n)
+        self.store.update(n["id"], sender="b")
+        self.assertEqual(self.store.query({"sender": "a"}), ([], None))
+        self.assertEqual(self.texts(self.store.query({"sender": ["a", "b"]})[0]), ["notification 1"])
+        # back to its first bucket, listed once
+        self.store.update(n["id"], sender="a")
+        self.assertEqual(self.texts(self.store.query({"sender": ["a", "b"]})[0]), ["notification 1"])
+        self.store.update(n["id"], timestamp=50.0)
+        self.assertEqual(self.texts(self.store.query(since=0, until=100)[0]), ["notification 1"])
+        self.assertEqual(self.store.query(until=10), ([], None))
+
+    def test_tombstones_compacted(self):
+        for n in range(1000):
+            self.store.add(notification(n))
+            if n >= 10:
+                self.store.pop(self.store.values()[0]["id"])
+        self.assertEqual(len(self.store), 10)
+        # rebuilt long before every removal piled up in the indexes
+        self.assertLess(len(self.store._seq_index), 10 + 64 + 2)
+        self.assertEqual(self.texts(self.store.query(limit=3)[0]),
+                         ["notification 999", "notification 998", "notification 997"])
+
+
+class TestNotificationChanges(unittest.TestCase):
+    def setUp(self):
+        self.store = NotificationStore(track_changes=True, history_size=4)
+
+    def test_no_change_no_revision(self):
+        self.assertIsNone(self.store.commit())
+        self.assertEqual(self.store.revision, 0)
+
+    def test_commit_delta(self):
+        first, second = notification(1), notification(2)
+        self.store.add(first)
+        self.store.commit()
+        self.store.add(second)
+        self.store.update(first["id"], text="edited")
+        delta = self.store.commit()
+        self.assertEqual((delta["base_revision"], delta["revision"]), (1, 2))
+        self.assertEqual(delta["added"], [second])
+        self.assertEqual(delta["updated"], [first])
+        self.assertEqual(delta["removed"], [])
+        self.assertFalse(delta["cleared"])
+
+    def test_added_then_removed_cancels(self):
+        n = notification(1)
+        self.store.add(n)
+        self.store.remove(n)
+        self.assertIsNone(self.store.commit())
+
+    def test_changes_since_merges(self):
+        first, second = notification(1), notification(2)
+        self.store.add(first)
+        self.store.commit()
+        self.store.add(second)
+        self.store.commit()
+        self.store.remove(first)
+        self.store.update(second["id"], text="edited")
+        self.store.commit()
+        merged = self.store.changes_since(1)
+        self.assertEqual((merged["base_revision"], merged["revision"]), (1, 3))
+        self.assertEqual(merged["added"], [second])  # updates of added notifications are folded in
+        self.assertEqual(merged["removed"], [first["id"]])
+        self.assertEqual(merged["updated"], [])
+        self.assertEqual(self.store.changes_since(0)["added"], [second])
+
+    def test_changes_since_current_revision(self):
+        self.store.add(notification(1))
+        self.store.commit()
+        merged = self.store.changes_since(1)
+        self.assertEqual((merged["added"], merged["removed"], merged["updated"]), ([], [], []))
+
+    def test_revision_gap(self):
+        for n in range(6):
+            self.store.add(notification(n))
+            self.store.commit()
+        self.assertIsNone(self.store.changes_since(1))  # older than the delta history
+        self.assertIsNotNone(self.store.changes_since(2))
+        self.assertIsNone(self.store.changes_since(99))
+
+    def test_clear(self):
+        self.store.add(notification(1))
+        self.store.commit()
+        self.store.clear()
+        self.store.add(notification(2))
+        delta = self.store.commit()
+        self.assertTrue(delta["cleared"])
+        self.assertEqual([n["text"] for n in delta["added"]], ["notification 2"])
+        self.assertTrue(self.store.changes_since(0)["cleared"])
+
+
+class TestNotificationJournal(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "notifications.jsonl")
+
+    def store(self, **kwargs):
+        return NotificationStore(journal=NotificationJournal(self.path, compact_threshold=10), **kwargs)
+
+    def journal_lines(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_replay(self):
+        store = self.store()
+        stored = [notification(n) for n in range(3)]
+        for n in stored:
+            store.add(n)
+        store.remove(stored[0])
+        store.update(stored[1]["id"], text="edited")
+        restored = self.store()
+        self.assertEqual([n["text"] for n in restored.values()], ["edited", "notification 2"])
+        self.assertEqual(restored.find({"id": stored[2]["id"]}), stored[2]["id"])
+
+    def test_corrupted_entry_skipped(self):
+        store = self.store()
+        store.add(notification(1))
+        with open(self.path, "a") as f:
+            f.write("{not json\n")
+        self.assertEqual(len(self.store()), 1)
+
+    def test_expired_dropped_on_restore(self):
+        store = self.store()
+        store.add(notification(1), ttl=0.01)
+        store.add(notification(2))
+        time.sleep(0.02)
+        self.assertEqual([n["text"] for n in self.store().values()], ["notification 2"])
+
+    def test_compaction(self):
+        store = self.store()
+        for n in range(20):
+            stored = notification(n)
+            store.add(stored)
+            store.remove(stored)
+        store.add(notification(99))
+        # rewritten with the live notifications once it grew past the threshold
+        self.assertLessEqual(len(self.journal_lines()), 10)
+        self.assertEqual([n["text"] for n in self.store().values()], ["notification 99"])
+
+    def test_compacted_on_restore(self):
+        store = self.store()
+        for n in range(5):
+            store.add(notification(n))
+        for n in store.values()[:4]:
+            store.remove(n)
+        self.store()
+        self.assertEqual([op["op"] for op in self.journal_lines()], ["add"])
+
+    def test_clear(self):
+        store = self.store()
+        store.add(notification(1))
+        store.clear()
+        self.assertEqual(self.journal_lines(), [])
+        self.assertEqual(len(self.store()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
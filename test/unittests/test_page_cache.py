@@ -0,0 +1,82 @@
+import time
+import unittest
+
+from ovos_gui_plugin_shell_companion.page_cache import SettingsPageCache
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+
+
+class TestSettingsPageCache(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerQueue("test.timers")
+        self.calls = []
+        self.cache = SettingsPageCache(self.timers, idle_seconds=0.05, default_max_age=60)
+        self.cache.register("about_page", lambda: self.provide("about_page"))
+        self.cache.register("display_settings", lambda: self.provide("display_settings"))
+
+    def tearDown(self):
+        self.timers.shutdown()
+
+    def provide(self, page):
+        self.calls.append(page)
+        return {"page": page, "n": len(self.calls)}
+
+    def test_computed_once_while_fresh(self):
+        self.assertEqual(self.cache.get("about_page")["n"], 1)
+        self.assertEqual(self.cache.get("about_page")["n"], 1)
+        self.assertEqual(self.calls, ["about_page"])
+        self.assertEqual(len(self.timers), 0)
+
+    def test_idle_without_invalidation(self):
+        self.cache.get("about_page")
+        time.sleep(0.2)
+        self.assertEqual(self.calls, ["about_page"])
+        self.assertEqual(self.cache.pending, set())
+        self.assertEqual(len(self.timers), 0)
+
+    def test_invalidated_page_prepared_once_idle(self):
+        self.cache.get("about_page")
+        self.cache.invalidate("about_page")
+        self.assertEqual(self.cache.pending, {"about_page"})
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.calls, ["about_page", "about_page"])
+        # served without calling the provider, the timer lapsed
+        self.assertEqual(self.cache.get("about_page")["n"], 2)
+        self.assertEqual(len(self.timers), 0)
+        time.sleep(0.2)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_invalidate_all(self):
+        self.cache.invalidate()
+        self.assertEqual(self.cache.pending, {"about_page", "display_settings"})
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(sorted(self.calls), ["about_page", "display_settings"])
+
+    def test_stale_page_served_and_prepared_again(self):
+        self.cache.max_ages["about_page"] = 0.01
+        self.cache.get("about_page")
+        time.sleep(0.02)
+        self.assertEqual(self.cache.get("about_page")["n"], 1)
+        self.assertEqual(self.cache.pending, {"about_page"})
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.calls, ["about_page", "about_page"])
+
+    def test_activity_postpones_prefetch(self):
+        self.cache.idle_seconds = 0.2
+        self.cache.invalidate("about_page")
+        for _ in range(3):
+            time.sleep(0.1)
+            self.cache.touch()
+        self.assertEqual(self.calls, [])
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.calls, ["about_page"])
+
+    def test_failed_provider(self):
+        self.cache.register("broken", lambda: 1 / 0)
+        self.cache.invalidate("broken", "about_page")
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.calls, ["about_page"])
+        self.assertEqual(self.cache.pending, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
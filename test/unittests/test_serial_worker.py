@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+import unittest
+
+from ovos_gui_plugin_shell_companion.scheduler import SerialWorker
+
+
+class TestSerialWorker(unittest.TestCase):
+    def setUp(self):
+        self.workers = []
+
+    def tearDown(self):
+        for worker in self.workers:
+            worker.shutdown()
+
+    def worker(self, **kwargs):
+        worker = SerialWorker("test", **kwargs)
+        self.workers.append(worker)
+        return worker
+
+    def blocked(self, worker):
+        """ occupy the worker thread until the returned event is set """
+        release, running = threading.Event(), threading.Event()
+        worker.submit(lambda: running.set() or release.wait(5))
+        self.assertTrue(running.wait(1))
+        return release
+
+    def test_runs_in_submission_order(self):
+        worker = self.worker()
+        ran = []
+        futures = [worker.submit(ran.append, n) for n in range(50)]
+        self.assertTrue(worker.wait_idle(1))
+        self.assertEqual(ran, list(range(50)))
+        self.assertTrue(all(f.done() and f.exception() is None for f in futures))
+
+    def test_runs_one_at_a_time_in_its_thread(self):
+        worker = self.worker()
+        threads, active, overlaps = set(), [], []
+
+        def job():
+            threads.add(threading.current_thread().name)
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.001)
+            active.pop()
+
+        for _ in range(10):
+            worker.submit(job)
+        self.assertTrue(worker.wait_idle(1))
+        self.assertEqual(threads, {"test"})
+        self.assertEqual(max(overlaps), 1)
+
+    def test_workers_are_independent(self):
+        slow, fast = self.worker(), self.worker()
+        release = self.blocked(slow)
+        done = fast.submit(lambda: "done")
+        self.assertEqual(done.result(1), "done")
+        release.set()
+        self.assertTrue(slow.wait_idle(1))
+
+    def test_failed_callback_does_not_stop_the_worker(self):
+        worker = self.worker()
+        failed = worker.submit(lambda: 1 / 0)
+        ok = worker.submit(lambda: "ok")
+        self.assertEqual(ok.result(1), "ok")
+        self.assertIsInstance(failed.exception(), ZeroDivisionError)
+        self.assertEqual(worker.stats()["failed"], 1)
+
+    def test_full_queue_blocks_until_there_is_room(self):
+        worker = self.worker(max_depth=1)
+        release = self.blocked(worker)
+        worker.submit(lambda: None)  # fills the queue
+        submitted = threading.Event()
+        ran = []
+
+        def submit():
+            worker.submit(ran.append, "late")
+            submitted.set()
+
+        threading.Thread(target=submit, daemon=True).start()
+        self.assertFalse(submitted.wait(0.2))
+        release.set()
+        self.assertTrue(submitted.wait(1))
+        self.assertTrue(worker.wait_idle(1))
+        self.assertEqual(ran, ["late"])
+        stats = worker.stats()
+        self.assertEqual(stats["blocked"], 1)
+        self.assertEqual(stats["dropped"], 0)
+
+    def test_drop_is_opt_in(self):
+        worker = self.worker(max_depth=1, block_timeout=0.05)
+        release = self.blocked(worker)
+        worker.submit(lambda: None)
+        dropped = []
+        future = worker.submit(lambda n: self.fail("dropped callback ran"), 1,
+                               on_drop=dropped.append)
+        self.assertIsInstance(future.exception(0), queue.Full)
+        self.assertEqual(dropped, [1])
+        release.set()
+        self.assertTrue(worker.wait_idle(1))
+        stats = worker.stats()
+        self.assertEqual(stats["blocked"], 1)
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["submitted"], 2)
+        self.assertEqual(stats["completed"], 2)
+
+    def test_submit_from_worker_thread_runs_inline(self):
+        worker = self.worker(max_depth=1)
+        ran = []
+
+        def job():
+            # the queue is full, waiting for room here would never end
+            worker.submit(lambda: None)
+            worker.submit(ran.append, "nested")
+            ran.append("job")
+
+        worker.submit(job)
+        self.assertTrue(worker.wait_idle(1))
+        self.assertEqual(ran, ["nested", "job"])
+
+    def test_stats(self):
+        worker = self.worker(max_depth=10)
+        release = self.blocked(worker)
+        for _ in range(3):
+            worker.submit(time.sleep, 0.01)
+        stats = worker.stats()
+        self.assertEqual(stats["depth"], 3)
+        self.assertEqual(stats["max_depth"], 10)
+        self.assertEqual(stats["high_watermark"], 3)
+        release.set()
+        self.assertTrue(worker.wait_idle(1))
+        stats = worker.stats()
+        self.assertEqual(stats["depth"], 0)
+        self.assertEqual(stats["submitted"], 4)
+        self.assertEqual(stats["completed"], 4)
+        self.assertGreaterEqual(stats["max_run_ms"], 10)
+        self.assertGreater(stats["max_wait_ms"], 0)
+        self.assertGreater(stats["avg_run_ms"], 0)
+        worker.reset_stats()
+        self.assertEqual(worker.stats()["submitted"], 0)
+        self.assertEqual(worker.stats()["high_watermark"], 0)
@@ -0,0 +1,123 @@
+import time
+import unittest
+
+from ovos_bus_client import Message
+
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+from ovos_gui_plugin_shell_companion.sessions import DEFAULT_SESSION, SessionRegistry, routing_context
+
+
+def message(session_id=None, source=None):
+    context = {}
+    if session_id:
+        context["session"] = {"session_id": session_id}
+    if source:
+        context["source"] = source
+    return Message("test.event", context=context)
+
+
+class TestSessionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerQueue("test.timers")
+        self.evicted = []
+
+    def tearDown(self):
+        self.timers.shutdown()
+
+    def registry(self, **kwargs):
+        registry = SessionRegistry(enabled=True, timers=self.timers, **kwargs)
+        registry.on_evict(lambda session: self.evicted.append(session.session_id))
+        return registry
+
+    def ids(self, registry):
+        return sorted(s.session_id for s in registry.sessions())
+
+    def test_disabled_single_session(self):
+        registry = SessionRegistry(timers=self.timers)
+        self.assertIs(registry.get(message("shell-a")), registry.default)
+        self.assertIs(registry.get(message(source="remote")), registry.default)
+        self.assertEqual(self.ids(registry), [DEFAULT_SESSION])
+
+    def test_session_per_id(self):
+        registry = self.registry()
+        shell = registry.get(message("shell-a"))
+        self.assertIs(registry.get(message("shell-a")), shell)
+        self.assertIsNot(registry.get(message("shell-b")), shell)
+        self.assertIs(registry.get(message()), registry.default)
+        self.assertEqual(self.ids(registry), [DEFAULT_SESSION, "shell-a", "shell-b"])
+
+    def test_key_by_source(self):
+        registry = self.registry()
+        self.assertIs(registry.get(message(source="remote")), registry.default)
+        registry = self.registry(key_by_source=True)
+        remote = registry.get(message(source="remote"))
+        self.assertEqual(remote.session_id, "remote")
+        # the session id wins over the source
+        self.assertEqual(registry.get(message("shell-a", source="remote")).session_id, "shell-a")
+
+    def test_routing_context(self):
+        registry = self.registry()
+        shell = registry.get(message("shell-a", source="remote"))
+        self.assertEqual(shell.context, {"session": {"session_id": "shell-a"}, "destination": "remote"})
+        self.assertEqual(routing_context(message()), {})
+
+    def test_least_recently_seen_evicted_over_max_sessions(self):
+        registry = self.registry(max_sessions=2)
+        registry.get(message("shell-a"))
+        registry.get(message("shell-b"))
+        registry.get(message("shell-a"))  # seen again, shell-b is now the oldest
+        registry.get(message("shell-c"))
+        self.assertEqual(self.evicted, ["shell-b"])
+        self.assertEqual(self.ids(registry), [DEFAULT_SESSION, "shell-a", "shell-c"])
+
+    def test_idle_sessions_evicted(self):
+        registry = self.registry(idle_timeout=0.1)
+        registry.get(message("shell-a"))
+        time.sleep(0.05)
+        registry.get(message("shell-b"))
+        deadline = time.monotonic() + 1
+        while not self.evicted and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(self.evicted, ["shell-a"])
+        self.assertIsNotNone(registry.lookup("shell-b"))
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.evicted, ["shell-a", "shell-b"])
+        # the default session is never evicted and the sweep timer lapsed
+        self.assertEqual(self.ids(registry), [DEFAULT_SESSION])
+        self.assertEqual(len(self.timers), 0)
+
+    def test_uses_the_given_timer_queue(self):
+        registry = self.registry()
+        self.assertIs(registry.timers, self.timers)
+        registry.get(message("shell-a"))
+        self.assertEqual(len(self.timers), 1)
+
+    def test_evict(self):
+        registry = self.registry()
+        registry.get(message("shell-a"))
+        self.assertTrue(registry.evict("shell-a"))
+        self.assertFalse(registry.evict("shell-a"))
+        self.assertFalse(registry.evict(DEFAULT_SESSION))
+        self.assertEqual(self.evicted, ["shell-a"])
+        self.assertIsNone(registry.lookup("shell-a"))
+
+    def test_state_per_session(self):
+        registry = self.registry()
+        shell_a, shell_b = registry.get(message("shell-a")), registry.get(message("shell-b"))
+        shell_a.get("brightness", dict)["level"] = 10
+        self.assertEqual(shell_a.get("brightness", dict), {"level": 10})
+        self.assertEqual(shell_b.get("brightness", dict), {})
+        self.assertIsNone(registry.default.peek("brightness"))
+
+    def test_bound_handler_sees_its_session(self):
+        registry = self.registry()
+        seen = []
+        handler = registry.bound(lambda m: seen.append(registry.current.session_id))
+        handler(message("shell-a"))
+        handler(message())
+        self.assertEqual(seen, ["shell-a", DEFAULT_SESSION])
+        self.assertIs(registry.current, registry.default)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion import OVOSShellCompanionExtension
+from ovos_gui_plugin_shell_companion.scheduler import SerialWorker
+from ovos_gui_plugin_shell_companion.config_snapshot import ConfigSnapshot
+from ovos_gui_plugin_shell_companion.subsystems import LazySubsystem, SubsystemBus, SubsystemConfig
+
+
+class Manager:
+    def __init__(self, bus, on_build=None):
+        self.bus = bus
+        self.received = []
+        bus.on("test.event", self.handle)
+        if on_build:
+            on_build(self)
+
+    def handle(self, message):
+        self.received.append(message.data["n"])
+
+
+class TestLazySubsystem(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.builds = 0
+
+    def subsystem(self, on_build=None, **kwargs):
+        def factory(bus):
+            self.builds += 1
+            return Manager(bus, on_build)
+
+        return LazySubsystem("test", self.bus, factory, events=["test.event"], **kwargs)
+
+    def emit(self, n):
+        self.bus.emit(Message("test.event", {"n": n}))
+
+    def test_built_on_first_message(self):
+        subsystem = self.subsystem()
+        self.assertFalse(subsystem.loaded)
+        self.emit(1)
+        self.emit(2)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(subsystem.get().received, [1, 2])
+
+    def test_messages_while_loading(self):
+        building, release = threading.Event(), threading.Event()
+
+        def slow_build(manager):
+            building.set()
+            release.wait(5)
+
+        subsystem = self.subsystem(slow_build)
+        first = threading.Thread(target=self.emit, args=(1,))
+        first.start()
+        self.assertTrue(building.wait(5))
+        # arrive from other threads while the first message builds the subsystem
+        others = [threading.Thread(target=self.emit, args=(n,)) for n in (2, 3)]
+        for thread in others:
+            thread.start()
+            thread.join(5)
+        release.set()
+        first.join(5)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(subsystem.get().received, [1, 2, 3])
+
+    def test_message_emitted_while_building(self):
+        subsystem = self.subsystem(lambda manager: self.emit(0))
+        self.emit(1)
+        self.assertEqual(self.builds, 1)
+        # handed over in the order they arrived
+        self.assertEqual(subsystem.get().received, [1, 0])
+
+    def test_get_while_loading(self):
+        building, release = threading.Event(), threading.Event()
+
+        def slow_build(manager):
+            building.set()
+            release.wait(5)
+
+        subsystem = self.subsystem(slow_build)
+        first = threading.Thread(target=self.emit, args=(1,))
+        first.start()
+        self.assertTrue(building.wait(5))
+        result = []
+        getter = threading.Thread(target=lambda: result.append(subsystem.get()))
+        getter.start()
+        time.sleep(0.05)
+        self.assertEqual(result, [])  # waits for the build in progress
+        release.set()
+        getter.join(5)
+        first.join(5)
+        self.assertEqual(self.builds, 1)
+        self.assertIs(result[0], subsystem.get())
+
+    def test_worker_created_on_load(self):
+        workers = []
+
+        def worker_factory():
+            workers.append(SerialWorker("test"))
+            return workers[-1]
+
+        subsystem = self.subsystem(worker_factory=worker_factory)
+        self.assertIsNone(subsystem.worker)
+        self.emit(1)
+        self.emit(2)
+        self.assertTrue(subsystem.wait_idle(5))
+        self.assertEqual(len(workers), 1)
+        self.assertEqual(subsystem.get().received, [1, 2])
+        subsystem.worker.shutdown()
+
+    def test_failed_build_retried(self):
+        fail = [True]
+
+        def on_build(manager):
+            if fail.pop():
+                raise RuntimeError("build failed")
+
+        subsystem = self.subsystem(on_build)
+        self.emit(1)
+        self.assertFalse(subsystem.loaded)
+        fail.append(False)
+        self.emit(2)
+        self.assertEqual(subsystem.get().received, [2])
+
+    def test_disabled(self):
+        subsystem = self.subsystem(enabled=False)
+        self.emit(1)
+        self.assertIsNone(subsystem.get())
+        self.assertEqual(self.builds, 0)
+
+
+class TestSubsystemWorker(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.worker = SerialWorker("test", max_depth=1, block_timeout=0.05)
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def test_dropped_message_answered_with_error(self):
+        release, running = threading.Event(), threading.Event()
+        bus = SubsystemBus(self.bus, "test", worker=self.worker)
+        bus.on("test.request", lambda message: running.set() or release.wait(5))
+        responses = []
+        self.bus.on("test.request.response", responses.append)
+        self.bus.emit(Message("test.request", {"n": 1}))
+        self.assertTrue(running.wait(1))
+        self.bus.emit(Message("test.request", {"n": 2}))  # queued
+        self.bus.emit(Message("test.request", {"n": 3}))  # dropped
+        release.set()
+        self.assertTrue(self.worker.wait_idle(1))
+        self.assertEqual(len(responses), 1)
+        self.assertIn("error", responses[0].data)
+        self.assertEqual(self.worker.stats()["dropped"], 1)
+
+    def test_config_subscribers_run_in_worker(self):
+        data = {"gui": {"theme": "dark"}}
+        snapshot = ConfigSnapshot(loader=lambda: data, reloader=None)
+        config = SubsystemConfig(snapshot, self.worker)
+        threads = []
+        callback = lambda value: threads.append((threading.current_thread().name, value))
+        config.subscribe("gui", callback)
+        self.assertEqual(config.get("gui.theme"), "dark")
+        data = {"gui": {"theme": "light"}}
+        snapshot.refresh()
+        self.assertTrue(self.worker.wait_idle(1))
+        self.assertEqual(threads, [("test", {"theme": "light"})])
+        config.unsubscribe("gui", callback)
+        data = {"gui": {"theme": "dark"}}
+        snapshot.refresh()
+        self.assertTrue(self.worker.wait_idle(1))
+        self.assertEqual(len(threads), 1)
+
+
+class TestSubsystemDefaults(unittest.TestCase):
+    def extension(self, config):
+        tmp = tempfile.mkdtemp()
+        env = {"XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+               "XDG_DATA_HOME": os.path.join(tmp, "data")}
+        bus = FakeBus()
+        responses = []
+        bus.on("ovos.wallpaper.manager.get.active.provider.response", responses.append)
+        with patch.dict(os.environ, env):
+            ext = OVOSShellCompanionExtension(config, bus=bus)
+            bus.emit(Message("ovos.wallpaper.manager.get.active.provider"))
+            ext.wait_idle(5)
+        return ext, responses
+
+    def test_wallpapers_disabled_by_default(self):
+        ext, responses = self.extension({})
+        self.assertIsNone(ext.wallpapers)
+        self.assertEqual(responses, [])
+        self.assertTrue(ext.subsystems["widgets"].enabled)
+
+    def test_wallpapers_enabled(self):
+        ext, responses = self.extension({"subsystems": {"wallpapers": True}})
+        self.assertIsNotNone(ext.wallpapers)
+        # rotation runs on the shared timer queue
+        self.assertIs(ext.wallpapers.timers, ext.timers)
+        self.assertEqual(len(responses), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion import OVOSShellCompanionExtension
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue
+from ovos_gui_plugin_shell_companion.system_info import SystemInfoSampler
+
+
+class TestSystemInfoSampler(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerQueue("test.timers")
+        self.samples = []
+        self.sampler = SystemInfoSampler(FakeBus(), self.timers, self.samples.append, interval=0.5)
+
+    def tearDown(self):
+        self.sampler.stop()
+        self.timers.shutdown()
+
+    def wait_for(self, condition, timeout=2):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def test_samples_only_while_started(self):
+        self.assertFalse(self.sampler.running)
+        self.sampler.start()
+        self.assertTrue(self.sampler.running)
+        self.assertTrue(self.wait_for(lambda: self.samples))
+        self.assertTrue(all({"display_key", "display_value"} == set(e) for e in self.samples[0]))
+        self.sampler.stop()
+        self.assertFalse(self.sampler.running)
+        count = len(self.samples)
+        time.sleep(0.6)
+        self.assertEqual(len(self.samples), count)
+
+    def test_start_twice_single_timer(self):
+        self.sampler.start()
+        self.sampler.start()
+        self.assertEqual(len(self.timers), 1)
+
+    def test_bus_latency_measured(self):
+        self.sampler.start()
+        # the fake bus answers the ping synchronously, the next sample reports it
+        self.assertTrue(self.wait_for(lambda: any(e["display_key"] == "Bus Latency"
+                                                  for sample in self.samples for e in sample)))
+
+    def test_stops_after_max_duration(self):
+        self.sampler.max_duration = 0
+        self.sampler.start()
+        self.assertTrue(self.wait_for(lambda: not self.sampler.running))
+        self.assertEqual(self.samples, [])
+
+
+class TestLiveAboutPage(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        env = {"XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+               "XDG_DATA_HOME": os.path.join(tmp, "data")}
+        with patch.dict(os.environ, env):
+            self.bus = FakeBus()
+            self.ext = OVOSShellCompanionExtension({"notifications": {"persist_storage": False},
+                                                    "about_page": {"live_metrics": True},
+                                                    "sessions": {"enabled": True}},
+                                                   bus=self.bus)
+
+    def tearDown(self):
+        self.ext.stop_live_system_info()
+
+    @staticmethod
+    def context(session_id):
+        return {"session": {"session_id": session_id}}
+
+    def open_page(self, page, session_id="shell-a"):
+        self.bus.emit(Message(f"{self.ext.gui.skill_id}.{page}", context=self.context(session_id)))
+        self.ext.wait_idle(5)
+
+    def focus(self, skill_id, session_id="shell-a"):
+        self.bus.emit(Message("gui.page_gained_focus", {"skill_id": skill_id}, self.context(session_id)))
+
+    def test_disabled_by_default(self):
+        with patch.dict(os.environ, {"XDG_DATA_HOME": tempfile.mkdtemp()}):
+            ext = OVOSShellCompanionExtension({"notifications": {"persist_storage": False}}, bus=FakeBus())
+        self.assertIsNone(ext.system_sampler)
+
+    def test_started_with_about_page(self):
+        self.assertFalse(self.ext.system_sampler.running)
+        self.open_page("mycroft.device.settings.about.page")
+        self.assertTrue(self.ext.system_sampler.running)
+
+    def test_stopped_when_another_skill_takes_focus(self):
+        self.open_page("mycroft.device.settings.about.page")
+        self.focus(self.ext.gui.skill_id)
+        self.assertTrue(self.ext.system_sampler.running)
+        self.focus("skill-weather")
+        self.assertFalse(self.ext.system_sampler.running)
+
+    def test_stopped_when_leaving_the_page(self):
+        self.open_page("mycroft.device.settings.about.page")
+        self.open_page("mycroft.device.settings")
+        self.assertFalse(self.ext.system_sampler.running)
+
+    def test_sampling_while_any_shell_shows_the_page(self):
+        self.open_page("mycroft.device.settings.about.page", "shell-a")
+        self.open_page("mycroft.device.settings.about.page", "shell-b")
+        self.focus("skill-weather", "shell-a")
+        self.assertTrue(self.ext.system_sampler.running)
+        self.focus("skill-weather", "shell-b")
+        self.assertFalse(self.ext.system_sampler.running)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion.tracing import NavigationTracer, TracingBus, percentile
+
+
+class TestPercentile(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([3.0, 1.0, 2.0], 50), 2)
+        self.assertEqual(percentile([], 50), 0)
+
+
+class TestNavigationTracer(unittest.TestCase):
+    def setUp(self):
+        self.tracer = NavigationTracer(history=10)
+        self.bus = TracingBus(FakeBus(), self.tracer)
+        self.emitted = []
+        self.bus.on("message", self.emitted.append)
+
+    def navigate(self, page, message=None):
+        message = message or Message("mycroft.device.settings")
+        handler = self.tracer.traced("settings", lambda m: (self.bus.emit(Message("gui.value.set")),
+                                                            self.tracer.end(page)))
+        handler(message)
+        return message
+
+    def test_span_recorded(self):
+        self.navigate("settings/settingspage")
+        report = self.tracer.report()["settings/settingspage"]
+        self.assertEqual(report["count"], 1)
+        self.assertEqual([m["name"] for m in report["last"]["marks"]],
+                         ["mycroft.device.settings", "gui.value.set", "shown"])
+        self.assertEqual(report["last"]["trigger"], "settings")
+
+    def test_emitted_messages_stamped(self):
+        self.navigate("settings/settingspage")
+        correlation_id = self.tracer.report()["settings/settingspage"]["last"]["correlation_id"]
+        self.assertIn(correlation_id, self.emitted[-1])
+        # not stamped outside a span
+        self.bus.emit(Message("gui.value.set"))
+        self.assertNotIn("correlation_id", self.emitted[-1])
+
+    def test_received_message_not_modified(self):
+        message = self.navigate("settings/settingspage", Message("mycroft.device.settings", context={"a": 1}))
+        self.assertEqual(message.context, {"a": 1})
+
+    def test_forwarded_message_stamped_on_a_copy(self):
+        received = Message("mycroft.device.settings", context={"a": 1})
+        self.tracer.begin("settings", received)
+        forwarded = received.forward("gui.value.set")
+        self.bus.emit(forwarded)
+        self.tracer.detach()
+        self.assertEqual(received.context, {"a": 1})
+        self.assertIn("correlation_id", forwarded.context)
+
+    def test_existing_correlation_id_reused(self):
+        self.navigate("settings/settingspage", Message("mycroft.device.settings", context={"correlation_id": "abc"}))
+        self.assertEqual(self.tracer.report()["settings/settingspage"]["last"]["correlation_id"], "abc")
+
+    def test_wait_and_resume(self):
+        request = Message("ovos.phal.configuration.provider.list.groups")
+        self.tracer.begin(request.msg_type, request)
+        self.tracer.wait((request.msg_type, None))
+        self.assertIsNone(self.tracer.current)
+        response = Message("ovos.phal.configuration.provider.list.groups.response", context={"a": 1})
+        # resumed in another thread, eg. the bus thread delivering the response
+        thread = threading.Thread(target=lambda: (self.tracer.resume((request.msg_type, None), response),
+                                                  self.tracer.end("settings/configuration_groups_display")))
+        thread.start()
+        thread.join(1)
+        self.assertEqual(response.context, {"a": 1})
+        marks = self.tracer.report()["settings/configuration_groups_display"]["last"]["marks"]
+        self.assertEqual([m["name"] for m in marks],
+                         [request.msg_type, "waiting", response.msg_type, "shown"])
+
+    def test_resume_unknown_key(self):
+        self.tracer.resume(("unknown", None), Message("unknown.response"))
+        self.assertIsNone(self.tracer.current)
+        self.assertEqual(self.tracer.report(), {})
+
+    def test_percentiles_over_history(self):
+        for delay in (0.001, 0.002, 0.02):
+            self.tracer.begin("settings", Message("mycroft.device.settings"))
+            time.sleep(delay)
+            self.tracer.end("settings/settingspage")
+        report = self.tracer.report()["settings/settingspage"]
+        self.assertEqual(report["count"], 3)
+        self.assertLess(report["p50_ms"], report["p95_ms"])
+        self.assertEqual(report["p95_ms"], report["max_ms"])
+        self.assertGreaterEqual(report["max_ms"], 20)
+        for _ in range(20):
+            self.navigate("settings/settingspage")
+        self.assertEqual(self.tracer.report()["settings/settingspage"]["count"], 10)
+        self.tracer.reset()
+        self.assertEqual(self.tracer.report(), {})
+
+    def test_disabled(self):
+        tracer = NavigationTracer(enabled=False)
+        self.assertIsNone(tracer.begin("settings", Message("mycroft.device.settings")))
+        tracer.end("settings/settingspage")
+        self.assertEqual(tracer.report(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import time
+import unittest
+
+from ovos_gui_plugin_shell_companion.scheduler import TimerQueue, UpdateThrottle
+
+
+class TestUpdateThrottle(unittest.TestCase):
+    def setUp(self):
+        self.timers = TimerQueue("test.timers")
+        self.delivered = []
+        self.throttle = UpdateThrottle(lambda key, value: self.delivered.append((key, value, time.monotonic())),
+                                       self.timers, max_rate=10)
+
+    def tearDown(self):
+        self.timers.shutdown()
+
+    def values(self):
+        return [(key, value) for key, value, _ in self.delivered]
+
+    def test_first_update_delivered_right_away(self):
+        self.throttle.submit("timer", 1)
+        self.assertEqual(self.values(), [("timer", 1)])
+        self.assertEqual(len(self.timers), 0)
+
+    def test_burst_collapses_to_latest(self):
+        for n in range(10):
+            self.throttle.submit("timer", n)
+        self.assertEqual(self.values(), [("timer", 0)])
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.values(), [("timer", 0), ("timer", 9)])
+        # the deferred update waited for the interval
+        self.assertGreaterEqual(self.delivered[1][2] - self.delivered[0][2], 0.09)
+
+    def test_keys_throttled_separately(self):
+        self.throttle.submit("timer", 1)
+        self.throttle.submit("audio", 1)
+        self.throttle.submit("timer", 2)
+        self.assertEqual(self.values(), [("timer", 1), ("audio", 1)])
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.values()[-1], ("timer", 2))
+
+    def test_update_after_interval_not_deferred(self):
+        self.throttle.submit("timer", 1)
+        time.sleep(0.11)
+        self.throttle.submit("timer", 2)
+        self.assertEqual(self.values(), [("timer", 1), ("timer", 2)])
+
+    def test_per_key_rates(self):
+        self.throttle.rates = {"audio": 0}
+        for n in range(3):
+            self.throttle.submit("audio", n)
+        self.assertEqual(self.values(), [("audio", 0), ("audio", 1), ("audio", 2)])
+        self.assertEqual(self.throttle.interval("audio"), 0)
+        self.assertEqual(self.throttle.interval("timer"), 0.1)
+
+    def test_cancel_drops_pending_update(self):
+        self.throttle.submit("timer", 1)
+        self.throttle.submit("timer", 2)
+        self.throttle.cancel("timer")
+        self.assertTrue(self.timers.wait_idle(1))
+        self.assertEqual(self.values(), [("timer", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
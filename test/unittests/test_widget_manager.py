@@ -0,0 +1,289 @@
+import json
+import time
+import unittest
+
+from ovos_bus_client import Message
+from ovos_utils.fakebus import FakeBus
+
+from ovos_gui_plugin_shell_companion.sessions import SessionRegistry
+from ovos_gui_plugin_shell_companion.wigets import WidgetManager
+
+
+class TestNotifications(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.emitted = []
+        self.bus.on("message", lambda m: self.emitted.append(json.loads(m)))
+        self.widgets = WidgetManager(self.bus, {"notifications": {"group_window": 0,
+                                                                  "storage_model_max_rate": 0,
+                                                                  "persist_storage": False}})
+
+    def emitted_data(self, msg_type):
+        return [m["data"] for m in self.emitted if m["type"] == msg_type]
+
+    def display(self, sender, text):
+        self.bus.emit(Message("ovos.notification.api.set", {"sender": sender, "text": text}))
+        return self.emitted_data("ovos.notification.notification_data")[-1]["notification"]
+
+    def test_repeated_identical_notification(self):
+        for i in range(3):
+            shown = self.display("timer", "Timer done")
+            self.assertEqual(shown["text"], "Timer done")
+            self.emitted.clear()
+            self.bus.emit(Message("ovos.notification.api.pop.clear", {"notification": shown}))
+            # popup reset and storage updated every time
+            self.assertEqual(self.emitted_data("ovos.notification.notification_data"), [{"notification": {}}])
+            model = self.emitted_data("ovos.notification.update_storage_model")[-1]["notification_model"]
+            self.assertEqual(model["count"], i + 1)
+            self.assertEqual(self.widgets.get_notifications()["notification_counter"], 0)
+
+    def test_clear_already_stored_notification(self):
+        shown = self.display("timer", "Timer done")
+        self.bus.emit(Message("ovos.notification.api.pop.clear", {"notification": shown}))
+        self.emitted.clear()
+        # cleared twice, eg. from two shells
+        self.bus.emit(Message("ovos.notification.api.pop.clear", {"notification": shown}))
+        self.assertEqual(self.emitted_data("ovos.notification.update_storage_model"), [])
+        self.assertEqual(len(self.widgets.get_notifications()["storedmodel"]), 1)
+
+    def test_clear_without_id(self):
+        shown = self.display("timer", "Timer done")
+        data = {k: v for k, v in shown.items() if k != "id"}
+        self.bus.emit(Message("ovos.notification.api.pop.clear.delete", {"notification": data}))
+        self.assertEqual(self.widgets.get_notifications()["notification_counter"], 0)
+
+    def test_storage_query_pages(self):
+        for n in range(5):
+            self.bus.emit(Message("ovos.notification.api.pop.clear",
+                                  {"notification": {"sender": "skill", "text": f"n{n}", "timestamp": float(n)}}))
+        self.bus.emit(Message("ovos.notification.api.storage.query", {"limit": 3}))
+        page = self.emitted_data("ovos.notification.api.storage.query.response")[-1]
+        self.assertEqual([n["text"] for n in page["notifications"]], ["n4", "n3", "n2"])
+        # cursors sent back as strings, eg. from QML
+        self.bus.emit(Message("ovos.notification.api.storage.query", {"limit": 3, "cursor": str(page["cursor"])}))
+        page = self.emitted_data("ovos.notification.api.storage.query.response")[-1]
+        self.assertEqual([n["text"] for n in page["notifications"]], ["n1", "n0"])
+        self.assertIsNone(page["cursor"])
+        self.bus.emit(Message("ovos.notification.api.storage.query", {"cursor": "next"}))
+        self.assertIn("error", self.emitted_data("ovos.notification.api.storage.query.response")[-1])
+
+
+class TestNotificationExpiry(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.emitted = []
+        self.bus.on("message", lambda m: self.emitted.append(json.loads(m)))
+        self.config = {"notifications": {"group_window": 0,
+                                          "storage_model_max_rate": 0,
+                                          "persist_storage": False}}
+        self.widgets = WidgetManager(self.bus, self.config)
+
+    def emitted_data(self, msg_type):
+        return [m["data"] for m in self.emitted if m["type"] == msg_type]
+
+    def display(self, text, duration=0.05):
+        self.bus.emit(Message("ovos.notification.api.set", {"sender": "timer", "text": text, "duration": duration}))
+        return self.emitted_data("ovos.notification.notification_data")[-1]["notification"]
+
+    def stored_texts(self):
+        return [n["text"] for n in self.widgets.get_notifications()["storedmodel"]]
+
+    def test_expired_notification_stored(self):
+        self.display("Timer done")
+        self.assertEqual(self.widgets.get_notifications()["notification_counter"], 1)
+        self.assertTrue(self.widgets.wait_timers(1))
+        notifications = self.widgets.get_notifications()
+        self.assertEqual(notifications["notification_counter"], 0)
+        self.assertEqual(self.stored_texts(), ["Timer done"])
+        self.assertEqual(self.emitted_data("ovos.notification.update_counter")[-1], {"notification_counter": 0})
+
+    def test_burst_of_expirations_synced_once(self):
+        # keep the timer thread busy until every expiry is due
+        self.widgets._WidgetManager__timers.schedule(0, time.sleep, 0.1)
+        for n in range(3):
+            self.display(f"Timer {n} done", duration=0.05)
+        self.emitted.clear()
+        self.assertTrue(self.widgets.wait_timers(1))
+        self.assertEqual(len(self.emitted_data("ovos.notification.update_storage_model")), 1)
+        self.assertEqual(len(self.stored_texts()), 3)
+
+    def test_no_duration_never_expires(self):
+        self.display("Timer done", duration=0)
+        self.assertTrue(self.widgets.wait_timers(1))
+        self.assertEqual(self.widgets.get_notifications()["notification_counter"], 1)
+        self.assertEqual(self.stored_texts(), [])
+
+    def test_expired_not_stored(self):
+        self.config["notifications"]["store_expired"] = False
+        self.display("Timer done")
+        self.assertTrue(self.widgets.wait_timers(1))
+        self.assertEqual(self.widgets.get_notifications()["notification_counter"], 0)
+        self.assertEqual(self.stored_texts(), [])
+
+    def test_cleared_before_expiry(self):
+        shown = self.display("Timer done", duration=0.1)
+        self.bus.emit(Message("ovos.notification.api.pop.clear", {"notification": shown}))
+        self.assertTrue(self.widgets.wait_timers(1))
+        self.assertEqual(self.stored_texts(), ["Timer done"])
+
+    def test_cleared_after_expiry_not_stored_twice(self):
+        shown = self.display("Timer done")
+        self.assertTrue(self.widgets.wait_timers(1))
+        self.emitted.clear()
+        # the shell still shows the popup and clears it later
+        self.bus.emit(Message("ovos.notification.api.pop.clear", {"notification": shown}))
+        self.assertEqual(self.stored_texts(), ["Timer done"])
+        self.assertEqual(self.emitted_data("ovos.notification.update_storage_model"), [])
+
+
+class TestStorageUpdates(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.emitted = []
+        self.bus.on("message", lambda m: self.emitted.append(json.loads(m)))
+        self.sessions = SessionRegistry(enabled=True)
+        self.widgets = WidgetManager(self.bus, {"notifications": {"group_window": 0,
+                                                                  "storage_model_max_rate": 0,
+                                                                  "persist_storage": False}},
+                                     self.sessions)
+
+    def messages(self, msg_type):
+        return [m for m in self.emitted if m["type"] == msg_type]
+
+    @staticmethod
+    def context(session_id):
+        return {"session": {"session_id": session_id}}
+
+    def store(self, text, session_id="shell-a"):
+        self.bus.emit(Message("ovos.notification.api.pop.clear",
+                              {"notification": {"sender": "skill", "text": text, "timestamp": 1.0}},
+                              self.context(session_id)))
+
+    def request_delta(self, session_id, revision):
+        self.bus.emit(Message("ovos.notification.api.request.storage.delta", {"revision": revision},
+                              self.context(session_id)))
+
+    def test_full_model_without_request(self):
+        self.store("a")
+        self.store("b")
+        self.assertEqual(len(self.messages("ovos.notification.update_storage_model")), 2)
+        self.assertEqual(self.messages("ovos.notification.update_storage_model.delta"), [])
+
+    def test_delta_only_for_requesting_shell(self):
+        self.store("a", "shell-b")
+        revision = self.widgets.get_notifications()["revision"]
+        self.request_delta("shell-a", revision)
+        self.emitted.clear()
+        self.store("b", "shell-b")
+        deltas = self.messages("ovos.notification.update_storage_model.delta")
+        self.assertEqual(len(deltas), 1)
+        self.assertEqual(deltas[0]["context"]["session"]["session_id"], "shell-a")
+        self.assertEqual([n["text"] for n in deltas[0]["data"]["notification_delta"]["added"]], ["b"])
+        # shell-b never asked for deltas
+        self.assertEqual(len(self.messages("ovos.notification.update_storage_model")), 1)
+
+    def test_no_full_model_when_every_shell_uses_deltas(self):
+        self.request_delta("shell-a", 0)
+        self.emitted.clear()
+        self.store("a")
+        self.assertEqual(self.messages("ovos.notification.update_storage_model"), [])
+        self.assertEqual(len(self.messages("ovos.notification.update_storage_model.delta")), 1)
+
+    def test_full_model_request_keeps_deltas(self):
+        self.request_delta("shell-a", 0)
+        storage = self.widgets._WidgetManager__notificationAPI_notifications_storage_model
+        storage.add({"sender": "skill", "text": "a", "timestamp": 1.0})
+        self.emitted.clear()
+        # another client asking for the full model must not drop the pending change
+        self.bus.emit(Message("ovos.notification.api.request.storage.model", {}, self.context("shell-b")))
+        deltas = self.messages("ovos.notification.update_storage_model.delta")
+        self.assertEqual(len(deltas), 1)
+        self.assertEqual(deltas[0]["data"]["notification_delta"]["revision"], storage.revision)
+        self.assertEqual(len(self.messages("ovos.notification.update_storage_model")), 1)
+
+    def test_full_model_coalesced(self):
+        self.widgets = WidgetManager(FakeBus(), {"notifications": {"group_window": 0,
+                                                                   "storage_model_max_rate": 2,
+                                                                   "persist_storage": False}})
+        models = []
+        self.widgets.bus.on("ovos.notification.update_storage_model", models.append)
+        for i in range(10):
+            self.widgets.bus.emit(Message("ovos.notification.api.pop.clear",
+                                          {"notification": {"sender": "skill", "text": str(i)}}))
+        self.assertEqual(len(models), 1)
+        time.sleep(0.7)
+        self.assertEqual(len(models), 2)
+        self.assertEqual(models[-1].data["notification_model"]["count"], 10)
+
+
+class TestStorageUpdatesWithoutSessions(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus()
+        self.emitted = []
+        self.bus.on("message", lambda m: self.emitted.append(json.loads(m)))
+        # sessions disabled, every client maps to the default shell
+        self.widgets = WidgetManager(self.bus, {"notifications": {"group_window": 0,
+                                                                  "storage_model_max_rate": 0,
+                                                                  "persist_storage": False}})
+
+    def messages(self, msg_type):
+        return [m for m in self.emitted if m["type"] == msg_type]
+
+    def store(self, text, source):
+        self.bus.emit(Message("ovos.notification.api.pop.clear",
+                              {"notification": {"sender": "skill", "text": text, "timestamp": 1.0}},
+                              {"source": source}))
+
+    def test_delta_request_keeps_full_models_for_other_clients(self):
+        self.store("a", "ovos-shell")
+        revision = self.widgets.get_notifications()["revision"]
+        self.bus.emit(Message("ovos.notification.api.request.storage.delta", {"revision": revision},
+                              {"source": "delta-client"}))
+        self.emitted.clear()
+        self.store("b", "ovos-shell")
+        # plain ovos-shell never asked for deltas, it still gets the full model
+        models = self.messages("ovos.notification.update_storage_model")
+        self.assertEqual(len(models), 1)
+        self.assertEqual(models[0]["data"]["notification_model"]["count"], 2)
+        deltas = self.messages("ovos.notification.update_storage_model.delta")
+        self.assertEqual(len(deltas), 1)
+        self.assertEqual(deltas[0]["context"]["destination"], "delta-client")
+        self.assertEqual([n["text"] for n in deltas[0]["data"]["notification_delta"]["added"]], ["b"])
+
+    def test_deltas_per_client(self):
+        for source in ("client-a", "client-b"):
+            self.bus.emit(Message("ovos.notification.api.request.storage.delta", {"revision": 0},
+                                  {"source": source}))
+        self.emitted.clear()
+        self.store("a", "ovos-shell")
+        deltas = self.messages("ovos.notification.update_storage_model.delta")
+        self.assertEqual(sorted(d["context"]["destination"] for d in deltas), ["client-a", "client-b"])
+        self.assertEqual(len(self.messages("ovos.notification.update_storage_model")), 1)
+
+
+class TestWidgetUpdates(unittest.TestCase):
+    def widgets(self, **widget_config):
+        bus = FakeBus()
+        updates = []
+        bus.on("ovos.widgets.timer.update", lambda message: updates.append(message.data))
+        WidgetManager(bus, {"widgets": {"max_update_rate": 0, **widget_config},
+                            "notifications": {"persist_storage": False}})
+        bus.emit(Message("ovos.widgets.display", {"type": "timer", "data": {"name": "eggs", "remaining": 10}}))
+        for remaining in (9, 9, 8):
+            bus.emit(Message("ovos.widgets.update", {"type": "timer",
+                                                     "data": {"name": "eggs", "remaining": remaining}}))
+        return updates
+
+    def test_full_updates_by_default(self):
+        # unchanged updates are skipped, the others carry the whole widget
+        self.assertEqual(self.widgets(), [{"widget": {"name": "eggs", "remaining": 9}},
+                                          {"widget": {"name": "eggs", "remaining": 8}}])
+
+    def test_partial_updates(self):
+        self.assertEqual(self.widgets(partial_updates=True),
+                         [{"widget": {"remaining": 9}, "partial": True},
+                          {"widget": {"remaining": 8}, "partial": True}])
+
+
+if __name__ == "__main__":
+    unittest.main()